@@ -0,0 +1,149 @@
+# Graph, flow, transportation and scheduling algorithms used by the interface.
+# This module is importable without a display: it never touches tkinter, and
+# the report-only dependency (tabulate) is imported lazily by the function
+# that needs it.
+import numpy as np
+
+from coloring import color_graph
+from generators import (
+    flow_network_edges, make_rng, random_edges, random_task_network, random_weighted_edges, to_networkx,
+    vertex_labels,
+)
+from maxflow import ResidualGraph, max_flow
+from mst import minimum_spanning_forest
+from scheduling import cpm_network
+from shortest_paths import ShortestPathService, shortest_path_tree
+from transport import basis_to_allocation, least_cost_basis, modi
+
+# Welsh-Powell algorithm
+def generate_random_graph(num_vertices, probability, seed=None):
+    return to_networkx(random_edges(num_vertices, probability, seed=seed))
+
+def welsh_powell(graph, ordering="welsh_powell"):
+    # ordering: "welsh_powell" (decreasing degree), "dsatur" or "smallest_last"
+    return color_graph(graph, ordering)
+
+# Dijkstra algorithm
+def generate_weighted_graph(num_vertices, probability, seed=None):
+    return to_networkx(random_weighted_edges(num_vertices, probability, seed=seed))
+
+def dijkstra(graph, start, end):
+    # one-off query; keep a shortest_paths.ShortestPathService around to
+    # answer many queries on the same graph
+    _, path = ShortestPathService(graph).bidirectional(start, end)
+    if path is None:
+        raise ValueError(f"Aucun chemin de {start} à {end}")
+    return path
+
+# Kruskal algorithm
+def generate_labeled_weighted_graph(num_vertices, probability, seed=None):
+    # vertices are named A, B, ..., Z, AA, AB, ... so any size works
+    edges = random_weighted_edges(num_vertices, probability, seed=seed)
+    return to_networkx(edges, labels=vertex_labels(num_vertices))
+
+def kruskal(graph, algorithm="kruskal", workers=1):
+    # algorithm: "kruskal" or "boruvka" (whose rounds can use worker
+    # processes on very large graphs); see mst.py
+    return minimum_spanning_forest(graph, algorithm, workers=workers)
+
+# Bellman-Ford algorithm
+def generate_random_weighted_digraph(num_nodes, prob_edge=0.3, min_weight=-10, max_weight=10, seed=None):
+    edges = random_weighted_edges(num_nodes, prob_edge, min_weight, max_weight, directed=True, seed=seed)
+    return to_networkx(edges, directed=True)
+
+def bellman_ford(graph, source, method="bellman_ford"):
+    # one solve gives both the paths and the distances; on a negative cycle
+    # there are no paths and the second value is the cycle, a closed list
+    # of vertices [v0, v1, ..., v0]
+    tree = shortest_path_tree(graph, source, method)
+    if tree.negative_cycle is not None:
+        return None, tree.cycle_labels()
+    return tree.paths(), tree.distances()
+
+# Potentiel-Metra algorithm (potential-task method, see scheduling.py)
+def generer_taches(nb_taches, max_predecessors=3, seed=None):
+    # random project: task durations and a precedence DAG (TaskNetwork)
+    return random_task_network(nb_taches, max_predecessors, seed=seed)
+
+def appliquer_methode_potentiel(taches):
+    # earliest / latest dates, total and free floats and a critical path
+    return cpm_network(taches)
+
+# Ford-Fulkerson algorithm
+def generate_flow_network(num_vertices, max_capacity=10, topology="complete", density=None, seed=None):
+    # see generators.flow_network_edges for the topologies; solvers should
+    # use those arrays directly, this graph is for drawing and compatibility
+    edges = flow_network_edges(num_vertices, max_capacity, topology, density, seed)
+    return to_networkx(edges, directed=True, attr="capacity")
+
+def ford_fulkerson(capacity, source, sink, method="dinic"):
+    # capacity is a dense V x V matrix; the solver itself only stores the
+    # non-zero arcs (see maxflow.py). method: one of maxflow.METHODS.
+    network = ResidualGraph.from_dense(capacity)
+    result = max_flow(network, source, sink, method)
+    return result.value, network.dense_flow().tolist()
+
+def find_min_cut(capacity, flow, source):
+    residual = np.asarray(capacity) - np.asarray(flow) > 0
+    visited = np.zeros(len(residual), dtype=bool)
+    visited[source] = True
+    frontier = visited.copy()
+    while frontier.any():
+        frontier = residual[frontier].any(axis=0) & ~visited
+        visited |= frontier
+    return visited.tolist()
+
+# Stepping Stone algorithm
+def generate_data(nb_usines, nb_magasins, min_cost=1, max_cost=20, min_cap=10, max_cap=50, seed=None):
+    rng = make_rng(seed)
+    couts = rng.integers(min_cost, max_cost, size=(nb_usines, nb_magasins))
+    capacites = rng.integers(min_cap, max_cap, size=nb_usines)
+    demandes = rng.integers(min_cap, max_cap, size=nb_magasins)
+
+    total_capacite = sum(capacites)
+    total_demande = sum(demandes)
+    if total_capacite > total_demande:
+        demandes[-1] += total_capacite - total_demande
+    else:
+        capacites[-1] += total_demande - total_capacite
+
+    return couts, capacites, demandes
+
+def calculer_cout_total(couts, allocation):
+    return np.sum(couts * allocation)
+
+def nord_ouest(capacites, demandes):
+    allocation = np.zeros((len(capacites), len(demandes)), dtype=int)
+    i, j = 0, 0
+    while i < len(capacites) and j < len(demandes):
+        alloc = min(capacites[i], demandes[j])
+        allocation[i, j] = alloc
+        capacites[i] -= alloc
+        demandes[j] -= alloc
+        if capacites[i] == 0:
+            i += 1
+        if demandes[j] == 0:
+            j += 1
+    return allocation
+
+def moindre_cout(couts, capacites, demandes):
+    # least-cost initial solution from one sorted pass over the cells; see
+    # transport.py for the Vogel and Russell variants
+    return basis_to_allocation(least_cost_basis(couts, capacites, demandes))
+
+def stepping_stone(couts, allocation, max_pivots=None, progress=None):
+    # MODI optimization (u-v potentials on a spanning-tree basis, see
+    # transport.py) of a basic allocation such as the result of nord_ouest or
+    # moindre_cout; the allocation passed in is left untouched
+    return modi(couts, allocation, max_pivots, progress).allocation
+
+def afficher_tableau(data, row_labels=None, col_labels=None, title=None):
+    from tabulate import tabulate
+
+    if row_labels is not None and col_labels is not None:
+        table = tabulate(data, headers=col_labels, showindex=row_labels, tablefmt="fancy_grid")
+    else:
+        table = tabulate(data, tablefmt="fancy_grid")
+    if title:
+        print(f"\n{title}\n{'=' * len(title)}")
+    print(table)
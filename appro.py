@@ -1,365 +1,240 @@
 import tkinter as tk
-import networkx as nx
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-import random
-from collections import deque
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import string
-import pandas as pd
+from tkinter import filedialog
 import numpy as np
-from tabulate import tabulate
+
+from algorithms import (
+    generate_random_graph, welsh_powell,
+    generate_weighted_graph,
+    generate_labeled_weighted_graph, kruskal,
+    generate_random_weighted_digraph,
+    generer_taches, appliquer_methode_potentiel,
+    generate_data, calculer_cout_total, nord_ouest, moindre_cout,
+)
+from coloring import ORDERINGS
+from figures import FigureManager
+from generators import FLOW_TOPOLOGIES, flow_network_edges, to_networkx
+from graph_arrays import build_csr
+from instrument import RunTrace, log_trace
+from jobs import JobCancelled, JobScheduler
+from layout import graph_layout
+from loaders import load_edge_list, load_graph, load_task_network, load_transport
+from maxflow import METHODS as FLOW_METHODS, ResidualGraph, max_flow
+from mst import ALGORITHMS as MST_ALGORITHMS
+from resultcache import ResultCache, result_key
+from resulttable import LazyColumn, ResultTable
+from rendering import (
+    ALLOCATION_VIEWS, DEFAULT_LOD_EDGES, allocation_figure, flow_figure, gantt_figure, graph_figure_3d,
+    sweep_figure,
+)
+from shortest_paths import SOLVERS as SHORTEST_PATH_SOLVERS, ShortestPathService, shortest_path_tree
+from sweep import SWEEP_METRICS, parse_values, run_sweep, sweep_points
+from transport import INITIAL_METHODS, basis_to_allocation, modi
+
+# matplotlib is imported inside the functions that draw results, so opening
+# the main window does not pay for it.
 
 # Constants for styling
 EMSI_GREEN = "#006838"
 DARK_GRAY = "#333333"
 WINDOW_BG = "#FFFFFF"
 
-# Function to show graph in 3D in a new window (with Tkinter integration)
-def show_graph_in_new_window_3d(graph, title, path=None, mst_edges=None, bellman_ford_paths=None):
-    fig = plt.figure(figsize=(8, 8))
-    ax = fig.add_subplot(111, projection='3d')
-
-    pos = nx.spring_layout(graph, dim=3)
-    x, y, z = zip(*[pos[node] for node in graph.nodes()])
-
-    node_colors = ['lightblue' if node not in path else 'green' for node in graph.nodes()] if path else 'lightblue'
-    ax.scatter(x, y, z, s=700, c=node_colors, marker='o')
-
-    for edge in graph.edges():
-        edge_color = 'gray'
-        if mst_edges and edge in mst_edges:
-            edge_color = 'red'
-        elif path and (edge[0] in path and edge[1] in path):
-            edge_color = 'red'
-        elif bellman_ford_paths:
-            for p in bellman_ford_paths.values():
-                if edge[0] in p and edge[1] in p and p.index(edge[1]) == p.index(edge[0]) + 1:
-                    edge_color = 'red'
-                    break
-        ax.plot(*zip(pos[edge[0]], pos[edge[1]]), color=edge_color)
+SWEEP_ALGORITHMS = list(SWEEP_METRICS)
+
+def layout_text(layout):
+    return f"Disposition : {layout.seconds * 1000:.0f} ms ({layout.method})"
+
+# Generation, solving and layout run on worker threads; SCHEDULER.poll is
+# driven by the Tk loop (see main) and hands results back to the UI thread,
+# where all the drawing happens.
+SCHEDULER = JobScheduler()
+
+# solved instances, keyed by algorithm, parameters, seed or input file and
+# code version; shared with batch.py through the same directory
+RESULTS = ResultCache.from_env()
+
+# result windows: one per algorithm window and kind of figure, reused by the
+# next run and released when closed (see figures.py)
+FIGURES = FigureManager()
+
+def _traced(job, compute, trace, *args):
+    with trace.capture():
+        return compute(job, trace, *args)
+
+class BackgroundRunner:
+    """The background job of one algorithm window.
+
+    start() cancels the previous job of the window if it is still running and
+    only the latest job's result is shown. Progress reported by the job as
+    job.report(text) goes to status_label. Closing the window cancels its job.
+
+    Every run gets a RunTrace: compute(job, trace, *args) times its stages in
+    the worker, show(result, trace) times the drawing on the UI thread, and
+    the breakdown then goes to timing_label (and to the run log, see
+    instrument.py). With profile_var set, the compute part also runs under
+    cProfile and tracemalloc and the profile opens in its own window.
+    """
+
+    def __init__(self, window, status_label):
+        self.window = window
+        self.status_label = status_label
+        self.timing_label = None
+        self.seed_entry = None
+        self.profile_var = tk.BooleanVar(window, value=False)
+        self.job = None
+        self.closed = False
+        window.bind("<Destroy>", self._on_destroy, add="+")
+
+    def _on_destroy(self, event):
+        if event.widget is self.window:
+            self.closed = True
+            self.cancel()
+
+    def _current(self, job):
+        return job is self.job and not self.closed
+
+    def start(self, compute, show, *args):
+        self.cancel()
+        self.status_label.config(text="Calcul en cours...")
+        trace = RunTrace(self.window.title(), profile=self.profile_var.get())
+        if self.entered_seed() is None:
+            # only files and typed seeds go through the result cache
+            trace.note("cache", UNSEEDED)
+        job = SCHEDULER.submit(
+            _traced, compute, trace, *args, name=self.window.title(),
+            on_done=lambda result: self._done(job, show, result, trace),
+            on_error=lambda error: self._error(job, error),
+            on_progress=lambda text: self._progress(job, text),
+        )
+        self.job = job
 
-    if path:
-        path_edges = list(zip(path, path[1:]))
-        for edge in path_edges:
-            ax.plot(*zip(pos[edge[0]], pos[edge[1]]), color='red', linewidth=2)
-
-    ax.set_title(title)
-
-    # Creating a Tkinter window to embed the plot
-    plot_window = tk.Toplevel()
-    plot_window.title(title)
-
-    # Embed the matplotlib plot into Tkinter window
-    canvas = FigureCanvasTkAgg(fig, master=plot_window)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-# Welsh-Powell algorithm
-def generate_random_graph(num_vertices, probability):
-    graph = nx.Graph()
-    graph.add_nodes_from(range(num_vertices))
-    for i in range(num_vertices):
-        for j in range(i + 1, num_vertices):
-            if random.random() < probability:
-                graph.add_edge(i, j)
-    return graph
-
-def welsh_powell(graph):
-    sorted_nodes = sorted(graph.degree, key=lambda x: x[1], reverse=True)
-    sorted_nodes = [node for node, degree in sorted_nodes]
-    colors = {}
-    current_color = 0
-    for node in sorted_nodes:
-        if node not in colors:
-            colors[node] = current_color
-            for other_node in sorted_nodes:
-                if other_node not in colors and not any(graph.has_edge(other_node, n) for n in colors if colors[n] == current_color):
-                    colors[other_node] = current_color
-            current_color += 1
-    return colors
-
-# Dijkstra algorithm
-def generate_weighted_graph(num_vertices, probability):
-    graph = nx.Graph()
-    graph.add_nodes_from(range(num_vertices))
-    for i in range(num_vertices):
-        for j in range(i + 1, num_vertices):
-            if random.random() < probability:
-                weight = random.randint(1, 100)
-                graph.add_edge(i, j, weight=weight)
-    return graph
-
-def dijkstra(graph, start, end):
-    path = nx.dijkstra_path(graph, start, end, weight='weight')
-    return path
-
-# Kruskal algorithm
-def generate_labeled_weighted_graph(num_vertices, probability):
-    graph = nx.Graph()
-    labels = [c for c in string.ascii_uppercase[:num_vertices]]
-    graph.add_nodes_from(labels)
-    for i in range(num_vertices):
-        for j in range(i + 1, num_vertices):
-            if random.random() < probability:
-                weight = random.randint(1, 100)
-                graph.add_edge(labels[i], labels[j], weight=weight)
-    return graph
-
-def kruskal(graph):
-    edges = sorted(graph.edges(data=True), key=lambda x: x[2]['weight'])
-    mst = nx.Graph()
-    mst.add_nodes_from(graph.nodes())
-    union_find = {node: node for node in graph.nodes()}
-
-    def find(node):
-        if union_find[node] != node:
-            union_find[node] = find(union_find[node])
-        return union_find[node]
-
-    def union(node1, node2):
-        root1, root2 = find(node1), find(node2)
-        union_find[root1] = root2
-
-    for edge in edges:
-        node1, node2, data = edge
-        if find(node1) != find(node2):
-            mst.add_edge(node1, node2, weight=data['weight'])
-            union(node1, node2)
-
-    return mst
-
-# Bellman-Ford algorithm
-def generate_random_weighted_digraph(num_nodes, prob_edge=0.3, min_weight=-10, max_weight=10):
-    graph = nx.DiGraph()
-    graph.add_nodes_from(range(num_nodes))
-    
-    for u in range(num_nodes):
-        for v in range(num_nodes):
-            if u != v and random.random() < prob_edge:
-                weight = random.randint(min_weight, max_weight)
-                graph.add_edge(u, v, weight=weight)
-    
-    return graph
-
-def bellman_ford(graph, source):
-    try:
-        shortest_paths = nx.single_source_bellman_ford_path(graph, source)
-        shortest_distances = nx.single_source_bellman_ford_path_length(graph, source)
-        return shortest_paths, shortest_distances
-    except nx.NetworkXUnbounded:
-        return None, None
-
-# Potentiel-Metra algorithm
-def generer_taches(nb_taches):
-    taches = []
-    for i in range(nb_taches):
-        duree = random.randint(1, 10)
-        jour_debut = random.randint(1, 30)
-        taches.append({
-            'Tache': f'Tâche {i+1}',
-            'Durée': duree,
-            'Jour Début': jour_debut
-        })
-    return taches
-
-def appliquer_methode_potentiel(taches):
-    taches_sorted = sorted(taches, key=lambda x: x['Jour Début'])
-    
-    for tache in taches_sorted:
-        tache['Jour Fin'] = tache['Jour Début'] + tache['Durée'] - 1
-    
-    for i, tache in enumerate(taches_sorted):
-        if i == 0:
-            tache['Marge Plus Tôt'] = 0
-            tache['Marge Plus Tard'] = tache['Jour Fin']
+    def entered_seed(self):
+        text = self.seed_entry.get().strip() if self.seed_entry is not None else ""
+        return int(text) if text else None
+
+    def seed(self):
+        """The seed typed in the window, or a fresh one (shown in the run breakdown)."""
+        seed = self.entered_seed()
+        return int(np.random.default_rng().integers(2**31)) if seed is None else seed
+
+    def _progress(self, job, text):
+        if self._current(job):
+            self.status_label.config(text=text)
+
+    def cancel(self):
+        if self.job is not None and not self.job.done():
+            self.job.cancel()
+
+    def _done(self, job, show, result, trace):
+        if not self._current(job):
+            return
+        self.job = None
+        try:
+            show(result, trace)
+        except Exception as e:
+            self.status_label.config(text=f"Erreur : {str(e)}")
+        if self.timing_label is not None:
+            self.timing_label.config(text=trace.summary())
+        log_trace(trace)
+        if trace.profile_rows:
+            show_profile(trace)
+
+    def _error(self, job, error):
+        if not self._current(job):
+            return
+        self.job = None
+        if isinstance(error, JobCancelled):
+            self.status_label.config(text="Calcul annulé")
         else:
-            prev_tache = taches_sorted[i - 1]
-            tache['Marge Plus Tôt'] = prev_tache['Jour Fin']
-            tache['Marge Plus Tard'] = tache['Jour Fin'] + tache['Durée'] - 1
-
-    return taches_sorted
-
-# Ford-Fulkerson algorithm
-def generate_flow_network(num_vertices, max_capacity=10):
-    G = nx.DiGraph()
-    for i in range(num_vertices):
-        for j in range(num_vertices):
-            if i != j:
-                capacity = random.randint(1, max_capacity)
-                G.add_edge(i, j, capacity=capacity)
-    return G
-
-def bfs(capacity, flow, source, sink):
-    parent = [-1] * len(capacity)
-    parent[source] = -2
-    queue = deque([(source, float('inf'))])
-    while queue:
-        u, min_cap = queue.popleft()
-        
-        for v in range(len(capacity)):
-            if parent[v] == -1 and capacity[u][v] - flow[u][v] > 0:
-                parent[v] = u
-                new_flow = min(min_cap, capacity[u][v] - flow[u][v])
-                if v == sink:
-                    return new_flow, parent
-                queue.append((v, new_flow))
-    return 0, parent
-
-def ford_fulkerson(capacity, source, sink):
-    n = len(capacity)
-    flow = [[0] * n for _ in range(n)]
-    max_flow = 0
-    
-    while True:
-        path_flow, parent = bfs(capacity, flow, source, sink)
-        if path_flow == 0:
-            break
-        max_flow += path_flow
-        
-        v = sink
-        while v != source:
-            u = parent[v]
-            flow[u][v] += path_flow
-            flow[v][u] -= path_flow
-            v = u
-    return max_flow, flow
-
-def find_min_cut(capacity, flow, source):
-    visited = [False] * len(capacity)
-    queue = deque([source])
-    visited[source] = True
-    
-    while queue:
-        u = queue.popleft()
-        for v in range(len(capacity)):
-            if capacity[u][v] - flow[u][v] > 0 and not visited[v]:
-                visited[v] = True
-                queue.append(v)
-    return visited
-
-# Stepping Stone algorithm
-def generate_data(nb_usines, nb_magasins, min_cost=1, max_cost=20, min_cap=10, max_cap=50):
-    couts = np.random.randint(min_cost, max_cost, size=(nb_usines, nb_magasins))
-    capacites = np.random.randint(min_cap, max_cap, size=nb_usines)
-    demandes = np.random.randint(min_cap, max_cap, size=nb_magasins)
-
-    total_capacite = sum(capacites)
-    total_demande = sum(demandes)
-    if total_capacite > total_demande:
-        demandes[-1] += total_capacite - total_demande
-    else:
-        capacites[-1] += total_demande - total_capacite
-
-    return couts, capacites, demandes
-
-def calculer_cout_total(couts, allocation):
-    return np.sum(couts * allocation)
-
-def nord_ouest(capacites, demandes):
-    allocation = np.zeros((len(capacites), len(demandes)), dtype=int)
-    i, j = 0, 0
-    while i < len(capacites) and j < len(demandes):
-        alloc = min(capacites[i], demandes[j])
-        allocation[i, j] = alloc
-        capacites[i] -= alloc
-        demandes[j] -= alloc
-        if capacites[i] == 0:
-            i += 1
-        if demandes[j] == 0:
-            j += 1
-    return allocation
-
-def moindre_cout(couts, capacites, demandes):
-    allocation = np.zeros_like(couts, dtype=int)
-    couts_temp = couts.astype(float)
-    while np.any(capacites) and np.any(demandes):
-        i, j = np.unravel_index(np.argmin(couts_temp, axis=None), couts_temp.shape)
-        alloc = min(capacites[i], demandes[j])
-        allocation[i, j] = alloc
-        capacites[i] -= alloc
-        demandes[j] -= alloc
-        if capacites[i] == 0:
-            couts_temp[i, :] = np.inf
-        if demandes[j] == 0:
-            couts_temp[:, j] = np.inf
-    return allocation
-
-def stepping_stone(couts, allocation):
-    rows, cols = allocation.shape
-    couts = couts.astype(float)
-    while True:
-        empty_cells = [(i, j) for i in range(rows) for j in range(cols) if allocation[i, j] == 0]
-        best_improvement = 0
-        best_allocation = allocation.copy()
-        
-        for cell in empty_cells:
-            cycle, gain = find_cycle_and_gain(couts, allocation, cell)
-            if cycle and gain < best_improvement:
-                best_improvement = gain
-                best_allocation = adjust_allocation(allocation, cycle)
-
-        if best_improvement >= 0:
-            break
-        allocation = best_allocation
-
-    return allocation
-
-def find_cycle_and_gain(couts, allocation, start_cell):
-    rows, cols = allocation.shape
-    visited = set()
-    cycle = []
-
-    def dfs(cell, path):
-        if cell in visited:
-            if cell == start_cell and len(path) >= 4:
-                return path
-            return None
-
-        visited.add(cell)
-        row, col = cell
-
-        for next_cell in [(row, c) for c in range(cols)] + [(r, col) for r in range(rows)]:
-            if next_cell != cell and allocation[next_cell] > 0 or next_cell == start_cell:
-                new_path = dfs(next_cell, path + [cell])
-                if new_path:
-                    return new_path
-
-        visited.remove(cell)
-        return None
-
-    cycle = dfs(start_cell, [])
-
-    if not cycle:
-        return None, 0
-
-    gain = calculate_cycle_gain(couts, allocation, cycle)
-    return cycle, gain
-
-def calculate_cycle_gain(couts, allocation, cycle):
-    gain = 0
-    for k, (i, j) in enumerate(cycle):
-        sign = 1 if k % 2 == 0 else -1
-        gain += sign * couts[i, j]
-    return gain
-
-def adjust_allocation(allocation, cycle):
-    min_alloc = min(allocation[i, j] for k, (i, j) in enumerate(cycle) if k % 2 == 1)
-
-    for k, (i, j) in enumerate(cycle):
-        sign = 1 if k % 2 == 0 else -1
-        allocation[i, j] += sign * min_alloc
-
-    return allocation
-
-def afficher_tableau(data, row_labels=None, col_labels=None, title=None):
-    if row_labels is not None and col_labels is not None:
-        table = tabulate(data, headers=col_labels, showindex=row_labels, tablefmt="fancy_grid")
-    else:
-        table = tabulate(data, tablefmt="fancy_grid")
-    if title:
-        print(f"\n{title}\n{'=' * len(title)}")
-    print(table)
+            self.status_label.config(text=f"Erreur : {str(error)}")
+
+def add_run_buttons(frame, run_algorithm, runner):
+    buttons = tk.Frame(frame, bg=WINDOW_BG)
+    buttons.pack(pady=10)
+    ModernButton(buttons, text="Exécuter", command=run_algorithm).pack(side=tk.LEFT, padx=5)
+    ModernButton(buttons, text="Annuler", command=runner.cancel).pack(side=tk.LEFT, padx=5)
+    options = tk.Frame(frame, bg=WINDOW_BG)
+    options.pack()
+    tk.Label(options, text="Graine :", bg=WINDOW_BG).pack(side=tk.LEFT)
+    runner.seed_entry = tk.Entry(options, width=12)
+    runner.seed_entry.pack(side=tk.LEFT, padx=5)
+    tk.Checkbutton(options, text="Profilage (cProfile, tracemalloc)", variable=runner.profile_var,
+                   bg=WINDOW_BG).pack(side=tk.LEFT)
+    runner.timing_label = tk.Label(frame, text="", bg=WINDOW_BG, fg=DARK_GRAY, font=("Helvetica", 9),
+                                   justify=tk.LEFT)
+    runner.timing_label.pack(pady=5)
+    return buttons
+
+EDGE_LIST_FILES = [("Listes d'arêtes", "*.csv *.tsv *.txt *.npy *.npz"), ("Tous les fichiers", "*")]
+TRANSPORT_FILES = [("Tableaux de transport", "*.csv *.tsv *.txt *.npy *.npz"), ("Tous les fichiers", "*")]
+TASK_FILES = [("Réseaux de tâches", "*.npz"), ("Tous les fichiers", "*")]
+
+def add_file_input(frame, text, filetypes):
+    """Optional input file; when one is chosen it replaces the random instance."""
+    tk.Label(frame, text=text, bg=WINDOW_BG).pack(pady=5)
+    row = tk.Frame(frame, bg=WINDOW_BG)
+    row.pack(pady=5)
+    path_var = tk.StringVar()
+    tk.Entry(row, textvariable=path_var, width=32).pack(side=tk.LEFT)
+
+    def browse():
+        path = filedialog.askopenfilename(parent=frame, filetypes=filetypes)
+        if path:
+            path_var.set(path)
+
+    tk.Button(row, text="Parcourir...", command=browse).pack(side=tk.LEFT, padx=5)
+    return path_var
+
+def load_or_generate(trace, path, load, generate, *args, seed=None):
+    # stage "chargement" for a file, "génération" for a random instance
+    if path:
+        with trace.stage("chargement"):
+            return load(path)
+    with trace.stage("génération"):
+        return generate(*args, seed=seed)
+
+# cache note of the runs whose seed was drawn at random (see BackgroundRunner.start)
+UNSEEDED = "non (graine tirée au hasard)"
+
+def solve_cached(trace, algorithm, params, seed, path, solve):
+    # a run on a file is identified by the file's content, otherwise by its
+    # seed; a seed drawn at random is never asked for again, so those runs
+    # are not stored
+    if not path:
+        trace.note("graine", seed)
+        if trace.info.get("cache") == UNSEEDED:
+            return solve()
+    return RESULTS.lookup_or_run(trace, result_key(algorithm, params, None if path else seed, path or None), solve)
+
+def add_result_table(frame):
+    table = ResultTable(frame, bg=WINDOW_BG)
+    table.pack(fill=tk.BOTH, expand=True, pady=5)
+    return table
+
+def show_profile(trace):
+    window = tk.Toplevel()
+    window.title(f"Profil - {trace.name}")
+    text = tk.Text(window, width=110, height=30, font=("Courier", 9))
+    text.insert(tk.END, trace.profile_text())
+    text.config(state=tk.DISABLED)
+    text.pack(fill=tk.BOTH, expand=True)
+
+# Function to show graph in 3D in a result window (with Tkinter integration)
+def show_graph_in_new_window_3d(graph, title, path=None, mst_edges=None, bellman_ford_paths=None,
+                                lod_threshold=DEFAULT_LOD_EDGES, layout=None, trace=None, parent=None):
+    trace = trace or RunTrace(title)
+    if layout is None:
+        with trace.stage("disposition"):
+            layout = graph_layout(graph, dim=3)
+    trace.note("disposition", layout.method)
+
+    # the graph window of parent, reused from one run to the next
+    slot = FIGURES.slot(parent, "graphe", title, figsize=(8, 8))
+    tk.Label(slot.footer, text=layout_text(layout)).pack()
+    with trace.stage("figure"):
+        graph_figure_3d(graph, title, path, mst_edges, bellman_ford_paths, pos=layout.pos,
+                        lod_threshold=lod_threshold, figure=slot.figure)
+    with trace.stage("canvas"):
+        slot.canvas.draw()
 
 # Main interface functions
 class ModernButton(tk.Button):
@@ -390,7 +265,7 @@ def create_modern_window(title, geometry):
     return window
 
 def execute_welsh_powell_algorithm():
-    window = create_modern_window("Welsh-Powell", "400x300")
+    window = create_modern_window("Welsh-Powell", "500x800")
     main_frame = tk.Frame(window, bg=WINDOW_BG, padx=20, pady=20)
     main_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -402,25 +277,52 @@ def execute_welsh_powell_algorithm():
     probability_entry = tk.Entry(main_frame)
     probability_entry.pack(pady=5)
 
+    file_var = add_file_input(main_frame, "Ou liste d'arêtes :", EDGE_LIST_FILES)
+
+    tk.Label(main_frame, text="Ordre des sommets :", bg=WINDOW_BG).pack(pady=5)
+    ordering_var = tk.StringVar(value=ORDERINGS[0])
+    tk.OptionMenu(main_frame, ordering_var, *ORDERINGS).pack(pady=5)
+
     result_label = tk.Label(main_frame, text="", bg=WINDOW_BG)
     result_label.pack(pady=10)
+    runner = BackgroundRunner(window, result_label)
+
+    def compute(job, trace, num_vertices, probability, ordering, path, seed):
+        def solve():
+            graph = load_or_generate(trace, path, lambda p: load_graph(p, weighted=False),
+                                     generate_random_graph, num_vertices, probability, seed=seed)
+            job.check()
+            with trace.stage("résolution"):
+                colors = welsh_powell(graph, ordering)
+            trace.count("couleurs", len(set(colors.values())))
+            job.check()
+            with trace.stage("disposition"):
+                layout = graph_layout(graph, dim=3)
+            return graph, colors, layout
+
+        params = {"num_vertices": num_vertices, "probability": probability, "ordering": ordering}
+        return solve_cached(trace, "welsh_powell", params, seed, path, solve)
+
+    def show(result, trace):
+        graph, colors, layout = result
+        result_label.config(text=f"Nombre chromatique : {len(set(colors.values()))}")
+        table.set_data(["Sommet", "Couleur"], [list(colors), list(colors.values())])
+        show_graph_in_new_window_3d(graph, "Welsh-Powell Graph", layout=layout, trace=trace, parent=window)
 
     def run_algorithm():
         try:
-            num_vertices = int(vertices_entry.get())
-            probability = float(probability_entry.get())
-            graph = generate_random_graph(num_vertices, probability)
-            colors = welsh_powell(graph)
-            chromatic_number = len(set(colors.values()))
-            result_label.config(text=f"Nombre chromatique : {chromatic_number}")
-            show_graph_in_new_window_3d(graph, "Welsh-Powell Graph")
+            path = file_var.get().strip()
+            num_vertices = None if path else int(vertices_entry.get())
+            probability = None if path else float(probability_entry.get())
+            runner.start(compute, show, num_vertices, probability, ordering_var.get(), path, runner.seed())
         except Exception as e:
             result_label.config(text=f"Erreur : {str(e)}")
 
-    ModernButton(main_frame, text="Exécuter", command=run_algorithm).pack(pady=15)
+    add_run_buttons(main_frame, run_algorithm, runner)
+    table = add_result_table(main_frame)
 
 def execute_dijkstra_algorithm():
-    window = create_modern_window("Dijkstra", "400x400")
+    window = create_modern_window("Dijkstra", "500x900")
     main_frame = tk.Frame(window, bg=WINDOW_BG, padx=20, pady=20)
     main_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -432,6 +334,8 @@ def execute_dijkstra_algorithm():
     probability_entry = tk.Entry(main_frame)
     probability_entry.pack(pady=5)
 
+    file_var = add_file_input(main_frame, "Ou liste d'arêtes (poids >= 0) :", EDGE_LIST_FILES)
+
     tk.Label(main_frame, text="Sommet de départ :", bg=WINDOW_BG).pack(pady=5)
     start_entry = tk.Entry(main_frame)
     start_entry.pack(pady=5)
@@ -442,24 +346,97 @@ def execute_dijkstra_algorithm():
 
     result_label = tk.Label(main_frame, text="", bg=WINDOW_BG)
     result_label.pack(pady=10)
+    runner = BackgroundRunner(window, result_label)
+
+    # the graph and its query service are kept while the parameters do not
+    # change, so repeated queries reuse the cached shortest-path trees; the
+    # state is only updated on the UI thread, when a job's result is shown
+    state = {"key": None, "graph": None, "service": None}
+
+    def compute(job, trace, key, graph, service, start, end):
+        # key: ("fichier", path) or (num_vertices, probability, seed)
+        file_path = key[1] if key[0] == "fichier" else None
+        seed = key[2] if file_path is None else None
+        graph_params = {} if file_path else {"num_vertices": key[0], "probability": key[1]}
+
+        # the graph and each query are cached apart: a new query on the same
+        # graph only stores its distance and path
+        if graph is None:
+            def build():
+                return load_or_generate(trace, file_path, lambda p: load_graph(p, non_negative=True),
+                                        generate_weighted_graph, *key[:2], seed=seed)
+
+            graph = solve_cached(trace, "dijkstra/graphe", graph_params, seed, file_path, build)
+        job.check()
+
+        def query():
+            nonlocal service
+            if service is None:
+                service = ShortestPathService(graph)
+            misses = service.misses
+            with trace.stage("résolution"):
+                distance, path = service.query(start, end)
+            trace.count("arbres calculés", service.misses - misses)
+            return distance, path
+
+        distance, path = solve_cached(trace, "dijkstra", {**graph_params, "start": start, "end": end}, seed,
+                                      file_path, query)
+        job.check()
+        layout = None
+        if path is not None:
+            with trace.stage("disposition"):
+                layout = graph_layout(graph, dim=3)
+        return key, graph, service, start, end, distance, path, layout
+
+    def show(result, trace):
+        key, graph, service, start, end, distance, path, layout = result
+        state.update(key=key, graph=graph, service=service)
+        if path is None:
+            result_label.config(text=f"Aucun chemin de {start} à {end}")
+            table.clear()
+            return
+        info = service.cache_info() if service is not None else {"hits": 0, "misses": 0}
+        result_label.config(text=f"Distance de {start} à {end} : {distance} ({len(path)} sommets)\n"
+                                 f"Cache : {info['hits']} succès, {info['misses']} calculs")
+        # unweighted edges count 1, as for the solver (graph_arrays.edge_arrays)
+        steps = np.cumsum([0] + [graph[u][v].get('weight', 1) for u, v in zip(path, path[1:])])
+        table.set_data(["Étape", "Sommet", "Distance cumulée"], [np.arange(len(path)), path, steps])
+        show_graph_in_new_window_3d(graph, "Graphe Dijkstra", path, layout=layout, trace=trace, parent=window)
 
     def run_algorithm():
         try:
-            num_vertices = int(vertices_entry.get())
-            probability = float(probability_entry.get())
+            path = file_var.get().strip()
             start = int(start_entry.get())
             end = int(end_entry.get())
-            graph = generate_weighted_graph(num_vertices, probability)
-            path = dijkstra(graph, start, end)
-            result_label.config(text=f"Chemin le plus court : {' -> '.join(map(str, path))}")
-            show_graph_in_new_window_3d(graph, "Graphe Dijkstra", path)
+            if path:
+                key = ("fichier", path)
+            else:
+                num_vertices, probability = int(vertices_entry.get()), float(probability_entry.get())
+                seed = runner.entered_seed()
+                if seed is None and state["key"] is not None and state["key"][:2] == (num_vertices, probability):
+                    # same parameters and no seed typed in: keep querying the same graph
+                    seed = state["key"][2]
+                elif seed is None:
+                    seed = runner.seed()
+                key = (num_vertices, probability, seed)
+            if state["key"] == key:
+                runner.start(compute, show, key, state["graph"], state["service"], start, end)
+            else:
+                runner.start(compute, show, key, None, None, start, end)
         except Exception as e:
             result_label.config(text=f"Erreur : {str(e)}")
 
-    ModernButton(main_frame, text="Exécuter", command=run_algorithm).pack(pady=15)
+    def new_graph():
+        state.update(key=None, graph=None, service=None)
+        runner.seed_entry.delete(0, tk.END)
+        run_algorithm()
+
+    buttons = add_run_buttons(main_frame, run_algorithm, runner)
+    ModernButton(buttons, text="Nouveau graphe", command=new_graph).pack(side=tk.LEFT, padx=5)
+    table = add_result_table(main_frame)
 
 def execute_kruskal_algorithm():
-    window = create_modern_window("Kruskal", "400x300")
+    window = create_modern_window("Kruskal", "500x800")
     main_frame = tk.Frame(window, bg=WINDOW_BG, padx=20, pady=20)
     main_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -471,25 +448,55 @@ def execute_kruskal_algorithm():
     probability_entry = tk.Entry(main_frame)
     probability_entry.pack(pady=5)
 
+    file_var = add_file_input(main_frame, "Ou liste d'arêtes :", EDGE_LIST_FILES)
+
+    tk.Label(main_frame, text="Algorithme :", bg=WINDOW_BG).pack(pady=5)
+    algorithm_var = tk.StringVar(value=MST_ALGORITHMS[0])
+    tk.OptionMenu(main_frame, algorithm_var, *MST_ALGORITHMS).pack(pady=5)
+
     result_label = tk.Label(main_frame, text="", bg=WINDOW_BG)
     result_label.pack(pady=10)
+    runner = BackgroundRunner(window, result_label)
+
+    def compute(job, trace, num_vertices, probability, algorithm, path, seed):
+        def solve():
+            graph = load_or_generate(trace, path, load_graph, generate_labeled_weighted_graph, num_vertices,
+                                     probability, seed=seed)
+            job.check()
+            with trace.stage("résolution"):
+                mst = kruskal(graph, algorithm)
+                total_weight = sum(mst[u][v]['weight'] for u, v in mst.edges())
+            trace.count("arêtes de l'arbre", mst.number_of_edges())
+            job.check()
+            with trace.stage("disposition"):
+                layout = graph_layout(graph, dim=3)
+            return graph, mst, total_weight, layout
+
+        params = {"num_vertices": num_vertices, "probability": probability, "algorithm": algorithm}
+        return solve_cached(trace, "kruskal", params, seed, path, solve)
+
+    def show(result, trace):
+        graph, mst, total_weight, layout = result
+        result_label.config(text=f"Poids total de l'arbre couvrant minimal : {total_weight}")
+        edges = list(mst.edges(data='weight'))
+        table.set_data(["Sommet 1", "Sommet 2", "Poids"], [[u for u, _, _ in edges], [v for _, v, _ in edges],
+                                                          [w for _, _, w in edges]])
+        show_graph_in_new_window_3d(graph, "Graphe Kruskal", mst_edges=mst.edges(), layout=layout, trace=trace, parent=window)
 
     def run_algorithm():
         try:
-            num_vertices = int(vertices_entry.get())
-            probability = float(probability_entry.get())
-            graph = generate_labeled_weighted_graph(num_vertices, probability)
-            mst = kruskal(graph)
-            total_weight = sum(mst[u][v]['weight'] for u, v in mst.edges())
-            result_label.config(text=f"Poids total de l'arbre couvrant minimal : {total_weight}")
-            show_graph_in_new_window_3d(graph, "Graphe Kruskal", mst_edges=mst.edges())
+            path = file_var.get().strip()
+            num_vertices = None if path else int(vertices_entry.get())
+            probability = None if path else float(probability_entry.get())
+            runner.start(compute, show, num_vertices, probability, algorithm_var.get(), path, runner.seed())
         except Exception as e:
             result_label.config(text=f"Erreur : {str(e)}")
 
-    ModernButton(main_frame, text="Exécuter", command=run_algorithm).pack(pady=15)
+    add_run_buttons(main_frame, run_algorithm, runner)
+    table = add_result_table(main_frame)
 
 def execute_bellman_ford_algorithm():
-    window = create_modern_window("Bellman-Ford", "400x400")
+    window = create_modern_window("Bellman-Ford", "600x880")
     main_frame = tk.Frame(window, bg=WINDOW_BG, padx=20, pady=20)
     main_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -501,37 +508,75 @@ def execute_bellman_ford_algorithm():
     probability_entry = tk.Entry(main_frame)
     probability_entry.pack(pady=5)
 
+    file_var = add_file_input(main_frame, "Ou liste d'arcs :", EDGE_LIST_FILES)
+
     tk.Label(main_frame, text="Sommet source :", bg=WINDOW_BG).pack(pady=5)
     source_entry = tk.Entry(main_frame)
     source_entry.pack(pady=5)
 
+    tk.Label(main_frame, text="Méthode :", bg=WINDOW_BG).pack(pady=5)
+    method_var = tk.StringVar(value="bellman_ford")
+    tk.OptionMenu(main_frame, method_var, *SHORTEST_PATH_SOLVERS).pack(pady=5)
+
     result_label = tk.Label(main_frame, text="", bg=WINDOW_BG)
     result_label.pack(pady=10)
+    runner = BackgroundRunner(window, result_label)
+
+    def compute(job, trace, num_vertices, probability, source, method, path, seed):
+        def solve():
+            graph = load_or_generate(trace, path, lambda p: load_graph(p, directed=True),
+                                     generate_random_weighted_digraph, num_vertices, probability, seed=seed)
+            job.check()
+            with trace.stage("résolution"):
+                tree = shortest_path_tree(graph, source, method)
+            trace.count("relaxations", tree.operations)
+            job.check()
+            layout = None
+            if tree.negative_cycle is None:
+                with trace.stage("disposition"):
+                    layout = graph_layout(graph, dim=3)
+            return graph, tree, layout
+
+        params = {"num_vertices": num_vertices, "probability": probability, "source": source, "method": method}
+        graph, tree, layout = solve_cached(trace, "bellman_ford", params, seed, path, solve)
+
+        if tree.negative_cycle is not None:
+            cycle = tree.cycle_labels()
+            weights = [graph[u][v]['weight'] for u, v in zip(cycle, cycle[1:])]
+            text = f"Le graphe contient un cycle de poids négatif ({len(weights)} arcs, poids : {sum(weights)})"
+            table = (["De", "À", "Poids"], [cycle[:-1], cycle[1:], weights])
+            return text, table, graph, None, None
+        shortest_paths, shortest_distances = tree.paths(), tree.distances()
+        text = f"Résultats de Bellman-Ford depuis le sommet {source} : {len(shortest_paths)} sommets atteints"
+        targets = list(shortest_paths)
+        # the path strings are only built for the rows that get displayed
+        paths = LazyColumn(len(targets), lambda k: ' -> '.join(map(str, shortest_paths[targets[k]])))
+        table = (["Sommet", "Distance", "Chemin"], [targets, [shortest_distances[t] for t in targets], paths])
+        return text, table, graph, shortest_paths, layout
+
+    def show(result, trace):
+        text, (headings, columns), graph, shortest_paths, layout = result
+        result_label.config(text=text)
+        table.set_data(headings, columns)
+        if shortest_paths is not None:
+            show_graph_in_new_window_3d(graph, "Graphe Bellman-Ford", bellman_ford_paths=shortest_paths,
+                                        layout=layout, trace=trace, parent=window)
 
     def run_algorithm():
         try:
-            num_vertices = int(vertices_entry.get())
-            probability = float(probability_entry.get())
+            path = file_var.get().strip()
+            num_vertices = None if path else int(vertices_entry.get())
+            probability = None if path else float(probability_entry.get())
             source = int(source_entry.get())
-            graph = generate_random_weighted_digraph(num_vertices, probability)
-            shortest_paths, shortest_distances = bellman_ford(graph, source)
-            
-            if shortest_paths is None:
-                result_label.config(text="Le graphe contient un cycle de poids négatif.")
-            else:
-                result_text = f"Résultats de Bellman-Ford depuis le sommet {source}:\n"
-                for target, path in shortest_paths.items():
-                    distance = shortest_distances[target]
-                    result_text += f"Vers {target}: {' -> '.join(map(str, path))} (distance: {distance})\n"
-                result_label.config(text=result_text)
-                show_graph_in_new_window_3d(graph, "Graphe Bellman-Ford", bellman_ford_paths=shortest_paths)
+            runner.start(compute, show, num_vertices, probability, source, method_var.get(), path, runner.seed())
         except Exception as e:
             result_label.config(text=f"Erreur : {str(e)}")
 
-    ModernButton(main_frame, text="Exécuter", command=run_algorithm).pack(pady=15)
+    add_run_buttons(main_frame, run_algorithm, runner)
+    table = add_result_table(main_frame)
 
 def execute_potentiel_metra_algorithm():
-    window = create_modern_window("Potentiel-Metra", "400x400")
+    window = create_modern_window("Potentiel-Metra", "800x720")
     main_frame = tk.Frame(window, bg=WINDOW_BG, padx=20, pady=20)
     main_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -539,45 +584,72 @@ def execute_potentiel_metra_algorithm():
     tasks_entry = tk.Entry(main_frame)
     tasks_entry.pack(pady=5)
 
+    file_var = add_file_input(main_frame, "Ou réseau de tâches (.npz : duration, src, dst) :", TASK_FILES)
+
     result_label = tk.Label(main_frame, text="", bg=WINDOW_BG)
     result_label.pack(pady=10)
+    runner = BackgroundRunner(window, result_label)
+
+    def compute(job, trace, nb_taches, path, seed):
+        def solve():
+            taches = load_or_generate(trace, path, load_task_network, generer_taches, nb_taches, seed=seed)
+            job.check()
+            with trace.stage("résolution"):
+                schedule = appliquer_methode_potentiel(taches)
+            trace.count("niveaux", schedule.levels)
+            return taches, schedule
+
+        return solve_cached(trace, "potentiel_metra", {"nb_taches": nb_taches}, seed, path, solve)
+
+    def show(result, trace):
+        taches, schedule = result
+        result_label.config(text=f"Durée du projet : {schedule.duration} jours "
+                                 f"({len(taches.src)} précédences, {schedule.levels} niveaux)\n"
+                                 f"Chemin critique : {len(schedule.critical_path)} tâches, "
+                                 f"{int(schedule.critical.sum())} tâches critiques")
+
+        # rows in topological order; names and predecessor lists are built
+        # only for the displayed rows
+        order = schedule.order
+        indptr, preds, _, _ = build_csr(taches.num_tasks, taches.dst, taches.src, drop_loops=False)
+        table.set_data(
+            ["Tâche", "Durée", "Prédécesseurs", "Début tôt", "Fin tôt", "Début tard", "Fin tard",
+             "Marge totale", "Marge libre", "Critique"],
+            [LazyColumn(len(order), lambda k: f"T{order[k] + 1}"),
+             taches.duration[order],
+             LazyColumn(len(order), lambda k: " ".join(f"T{p + 1}" for p in preds[indptr[order[k]]:indptr[order[k] + 1]])),
+             schedule.earliest_start[order], schedule.earliest_finish[order],
+             schedule.latest_start[order], schedule.latest_finish[order],
+             schedule.total_float[order], schedule.free_float[order],
+             np.where(schedule.critical[order], "oui", "")],
+        )
+
+        # Gantt chart in the window's chart window: critical tasks in red,
+        # bars and labels thinned out to what the current zoom level can show
+        slot = FIGURES.slot(window, "gantt", "Diagramme de Gantt", figsize=(10, 6))
+        with trace.stage("figure"):
+            _, gantt = gantt_figure(schedule.earliest_start[order], taches.duration[order],
+                                    schedule.critical[order], names=lambda row: f"T{order[row] + 1}",
+                                    figure=slot.figure)
+        slot.track(gantt.connect(slot.canvas))
+        critical_var = tk.BooleanVar(slot.footer, value=True)
+        tk.Checkbutton(slot.footer, text="Tâches critiques", variable=critical_var,
+                       command=lambda: gantt.set_critical_visible(critical_var.get())).pack()
+        with trace.stage("canvas"):
+            slot.canvas.draw()
 
     def run_algorithm():
         try:
-            nb_taches = int(tasks_entry.get())
-            taches = generer_taches(nb_taches)
-            taches_calculees = appliquer_methode_potentiel(taches)
-            
-            df = pd.DataFrame(taches_calculees)
-            result_text = "Tableau des tâches avec dates de début, fin et marges :\n"
-            result_text += df.to_string(index=False)
-            result_label.config(text=result_text)
-
-            # Create a Gantt chart
-            fig, ax = plt.subplots(figsize=(10, 6))
-            for i, task in enumerate(taches_calculees):
-                ax.barh(i, task['Durée'], left=task['Jour Début'], height=0.5)
-                ax.text(task['Jour Début'], i, task['Tache'], va='center', ha='right', fontweight='bold')
-            
-            ax.set_yticks(range(len(taches_calculees)))
-            ax.set_yticklabels([task['Tache'] for task in taches_calculees])
-            ax.set_xlabel('Jours')
-            ax.set_title('Diagramme de Gantt des tâches')
-            
-            # Show the Gantt chart in a new window
-            chart_window = tk.Toplevel()
-            chart_window.title("Diagramme de Gantt")
-            canvas = FigureCanvasTkAgg(fig, master=chart_window)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
+            path = file_var.get().strip()
+            runner.start(compute, show, None if path else int(tasks_entry.get()), path, runner.seed())
         except Exception as e:
             result_label.config(text=f"Erreur : {str(e)}")
 
-    ModernButton(main_frame, text="Exécuter", command=run_algorithm).pack(pady=15)
+    add_run_buttons(main_frame, run_algorithm, runner)
+    table = add_result_table(main_frame)
 
 def execute_ford_fulkerson_algorithm():
-    window = create_modern_window("Ford-Fulkerson", "400x400")
+    window = create_modern_window("Ford-Fulkerson", "500x980")
     main_frame = tk.Frame(window, bg=WINDOW_BG, padx=20, pady=20)
     main_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -589,57 +661,85 @@ def execute_ford_fulkerson_algorithm():
     max_capacity_entry = tk.Entry(main_frame)
     max_capacity_entry.pack(pady=5)
 
+    tk.Label(main_frame, text="Topologie :", bg=WINDOW_BG).pack(pady=5)
+    topology_var = tk.StringVar(value=FLOW_TOPOLOGIES[0])
+    tk.OptionMenu(main_frame, topology_var, *FLOW_TOPOLOGIES).pack(pady=5)
+
+    tk.Label(main_frame, text="Densité (0-1, optionnelle) :", bg=WINDOW_BG).pack(pady=5)
+    density_entry = tk.Entry(main_frame)
+    density_entry.pack(pady=5)
+
+    file_var = add_file_input(main_frame, "Ou liste d'arcs avec capacités (source 0, puits : dernier sommet) :",
+                              EDGE_LIST_FILES)
+
+    tk.Label(main_frame, text="Méthode :", bg=WINDOW_BG).pack(pady=5)
+    method_var = tk.StringVar(value="dinic")
+    tk.OptionMenu(main_frame, method_var, *FLOW_METHODS).pack(pady=5)
+
     result_label = tk.Label(main_frame, text="", bg=WINDOW_BG)
     result_label.pack(pady=10)
+    runner = BackgroundRunner(window, result_label)
 
-    def run_algorithm():
-        try:
-            num_vertices = int(vertices_entry.get())
-            max_capacity = int(max_capacity_entry.get())
-            graph = generate_flow_network(num_vertices, max_capacity)
-            
+    def compute(job, trace, num_vertices, max_capacity, topology, density, method, path, seed):
+        def solve():
+            edges = load_or_generate(trace, path, lambda p: load_edge_list(p, non_negative=True),
+                                     flow_network_edges, num_vertices, max_capacity, topology, density, seed=seed)
             source = 0
-            sink = num_vertices - 1
-            
-            capacity = [[0] * num_vertices for _ in range(num_vertices)]
-            for u, v, data in graph.edges(data=True):
-                capacity[u][v] = data['capacity']
-            
-            max_flow, flow = ford_fulkerson(capacity, source, sink)
-            
-            result_text = f"Flot maximal : {max_flow}\n\n"
-            result_text += "Flots sur les arcs :\n"
-            for u in range(num_vertices):
-                for v in range(num_vertices):
-                    if flow[u][v] > 0:
-                        result_text += f"De {u} à {v}: {flow[u][v]}/{capacity[u][v]}\n"
-            
-            result_label.config(text=result_text)
-            
-            # Visualize the flow network
-            pos = nx.spring_layout(graph)
-            plt.figure(figsize=(10, 8))
-            nx.draw(graph, pos, with_labels=True, node_color='lightblue', node_size=500, font_size=10, font_weight='bold')
-            
-            edge_labels = {(u, v): f"{flow[u][v]}/{data['capacity']}" for u, v, data in graph.edges(data=True)}
-            nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, font_size=8)
-            
-            plt.title("Réseau de flot avec flots/capacités")
-            
-            # Show the flow network in a new window
-            chart_window = tk.Toplevel()
-            chart_window.title("Réseau de flot")
-            canvas = FigureCanvasTkAgg(plt.gcf(), master=chart_window)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            sink = edges.num_nodes - 1
+
+            # the solver works on the capacity arrays directly
+            with trace.stage("résolution"):
+                network = ResidualGraph(edges.num_nodes, edges.src, edges.dst, edges.weight)
+                result = max_flow(network, source, sink, method,
+                                  progress=lambda operations, value: job.report(f"Flot courant : {value} ({operations} opérations)"))
+            # augmenting paths, or pushes for the preflow methods
+            trace.count("augmentations" if method in ("edmonds_karp", "dinic") else "poussées", result.operations)
+            job.check()
+
+            # networkx is only needed for the layout
+            with trace.stage("disposition"):
+                layout = graph_layout(to_networkx(edges, directed=True, attr='capacity'))
+            return edges, result.value, result.flow, layout
+
+        params = {"num_vertices": num_vertices, "max_capacity": max_capacity, "topology": topology,
+                  "density": density, "method": method}
+        edges, value, flow, layout = solve_cached(trace, "ford_fulkerson", params, seed, path, solve)
+        trace.note("disposition", layout.method)
+
+        result_text = f"Flot maximal : {value}\nFlots sur les arcs :"
+        used = np.nonzero(flow > 0)[0]
+        table = (["De", "À", "Flot", "Capacité"], [edges.src[used], edges.dst[used], flow[used], edges.weight[used]])
+        return result_text, table, edges, flow, layout
+
+    def show(result, trace):
+        result_text, (headings, columns), edges, flow, layout = result
+        result_label.config(text=result_text)
+        table.set_data(headings, columns)
+
+        # Visualize the flow network in the window's own figure (no pyplot state)
+        slot = FIGURES.slot(window, "flot", "Réseau de flot")
+        tk.Label(slot.footer, text=layout_text(layout)).pack()
+        with trace.stage("figure"):
+            flow_figure(edges, layout.pos, flow, figure=slot.figure)
+        with trace.stage("canvas"):
+            slot.canvas.draw()
 
+    def run_algorithm():
+        try:
+            path = file_var.get().strip()
+            num_vertices = None if path else int(vertices_entry.get())
+            max_capacity = None if path else int(max_capacity_entry.get())
+            density = float(density_entry.get()) if density_entry.get().strip() else None
+            runner.start(compute, show, num_vertices, max_capacity, topology_var.get(), density, method_var.get(),
+                         path, runner.seed())
         except Exception as e:
             result_label.config(text=f"Erreur : {str(e)}")
 
-    ModernButton(main_frame, text="Exécuter", command=run_algorithm).pack(pady=15)
+    add_run_buttons(main_frame, run_algorithm, runner)
+    table = add_result_table(main_frame)
 
 def execute_stepping_stone_algorithm():
-    window = create_modern_window("Stepping Stone", "400x400")
+    window = create_modern_window("Stepping Stone", "600x960")
     main_frame = tk.Frame(window, bg=WINDOW_BG, padx=20, pady=20)
     main_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -651,67 +751,159 @@ def execute_stepping_stone_algorithm():
     nb_magasins_entry = tk.Entry(main_frame)
     nb_magasins_entry.pack(pady=5)
 
+    file_var = add_file_input(main_frame, "Ou tableau de transport (coûts, capacités en dernière colonne, "
+                                          "demandes en dernière ligne) :", TRANSPORT_FILES)
+
+    tk.Label(main_frame, text="Solution initiale :", bg=WINDOW_BG).pack(pady=5)
+    initial_var = tk.StringVar(value="least_cost")
+    tk.OptionMenu(main_frame, initial_var, *INITIAL_METHODS).pack(pady=5)
+
+    tk.Label(main_frame, text="Affichage :", bg=WINDOW_BG).pack(pady=5)
+    view_var = tk.StringVar(value=ALLOCATION_VIEWS[0])
+    tk.OptionMenu(main_frame, view_var, *ALLOCATION_VIEWS).pack(pady=5)
+
     result_label = tk.Label(main_frame, text="", bg=WINDOW_BG)
     result_label.pack(pady=10)
+    runner = BackgroundRunner(window, result_label)
+
+    def compute(job, trace, nb_usines, nb_magasins, initial_method, path, seed):
+        def solve():
+            couts, capacites, demandes = load_or_generate(trace, path, load_transport, generate_data, nb_usines,
+                                                          nb_magasins, seed=seed)
+
+            with trace.stage("solutions initiales"):
+                # Nord-Ouest
+                allocation_nord_ouest = nord_ouest(capacites.copy(), demandes.copy())
+                cout_nord_ouest = calculer_cout_total(couts, allocation_nord_ouest)
+
+                # Moindres Coûts
+                allocation_moindre_cout = moindre_cout(couts, capacites.copy(), demandes.copy())
+                cout_moindre_cout = calculer_cout_total(couts, allocation_moindre_cout)
+            job.check()
+
+            # Stepping Stone (MODI), from the selected initial basis; a
+            # cancelled job stops at the next pivot
+            with trace.stage("résolution"):
+                basis = INITIAL_METHODS[initial_method](couts, capacites, demandes)
+                cout_initial = calculer_cout_total(couts, basis_to_allocation(basis))
+                optimum = modi(couts, basis,
+                               progress=lambda pivots, reduced: job.report(f"Pivot {pivots} (coût réduit : {reduced:.2f})"))
+            trace.count("pivots", optimum.pivots)
+            allocation_optimisee = optimum.allocation
+            cout_optimise = calculer_cout_total(couts, allocation_optimisee)
+            # only the costs of the used cells are kept, not the cost matrix
+            unit_costs = np.asarray(couts)[np.nonzero(allocation_optimisee)]
+            return (cout_nord_ouest, cout_moindre_cout, cout_initial, cout_optimise), allocation_optimisee, unit_costs
+
+        params = {"nb_usines": nb_usines, "nb_magasins": nb_magasins, "initial_method": initial_method}
+        totals, allocation_optimisee, unit_costs = solve_cached(trace, "stepping_stone", params, seed, path, solve)
+        cout_nord_ouest, cout_moindre_cout, cout_initial, cout_optimise = totals
+
+        result_text = f"Coût total (Nord-Ouest): {cout_nord_ouest}\n"
+        result_text += f"Coût total (Moindres Coûts): {cout_moindre_cout}\n"
+        result_text += f"Coût total (solution initiale {initial_method}): {cout_initial}\n"
+        result_text += f"Coût total optimisé (Stepping Stone): {cout_optimise}\n\n"
+        result_text += "Allocation optimisée (cases non nulles) :"
+
+        rows, cols = np.nonzero(allocation_optimisee)
+        quantities = allocation_optimisee[rows, cols]
+        table = (["Usine", "Magasin", "Quantité", "Coût unitaire", "Coût"],
+                 [rows + 1, cols + 1, quantities, unit_costs, quantities * unit_costs])
+        return result_text, table, allocation_optimisee
+
+    def show(result, trace):
+        result_text, (headings, columns), allocation_optimisee = result
+        result_label.config(text=result_text)
+        table.set_data(headings, columns)
+
+        # Visualize the optimized allocation in the window's allocation window
+        slot = FIGURES.slot(window, "allocation", "Allocation optimisée", figsize=(10, 6), toolbar=False)
+        with trace.stage("figure"):
+            allocation_figure(allocation_optimisee, view_var.get(), figure=slot.figure)
+        with trace.stage("canvas"):
+            slot.canvas.draw()
 
     def run_algorithm():
         try:
-            nb_usines = int(nb_usines_entry.get())
-            nb_magasins = int(nb_magasins_entry.get())
-            
-            couts, capacites, demandes = generate_data(nb_usines, nb_magasins)
-            
-            # Nord-Ouest
-            allocation_nord_ouest = nord_ouest(capacites.copy(), demandes.copy())
-            cout_nord_ouest = calculer_cout_total(couts, allocation_nord_ouest)
-            
-            # Moindres Coûts
-            allocation_moindre_cout = moindre_cout(couts, capacites.copy(), demandes.copy())
-            cout_moindre_cout = calculer_cout_total(couts, allocation_moindre_cout)
-            
-            # Stepping Stone
-            allocation_optimisee = stepping_stone(couts, allocation_moindre_cout)
-            cout_optimise = calculer_cout_total(couts, allocation_optimisee)
-            
-            result_text = f"Coût total (Nord-Ouest): {cout_nord_ouest}\n"
-            result_text += f"Coût total (Moindres Coûts): {cout_moindre_cout}\n"
-            result_text += f"Coût total optimisé (Stepping Stone): {cout_optimise}\n\n"
-            
-            result_text += "Allocation optimisée:\n"
-            result_text += tabulate(allocation_optimisee, 
-                                    headers=[f"Magasin {j+1}" for j in range(nb_magasins)],
-                                    showindex=[f"Usine {i+1}" for i in range(nb_usines)])
-            
-            result_label.config(text=result_text)
-            
-            # Visualize the optimized allocation
-            fig, ax = plt.subplots(figsize=(10, 6))
-            im = ax.imshow(allocation_optimisee, cmap='YlOrRd')
-            
-            ax.set_xticks(np.arange(nb_magasins))
-            ax.set_yticks(np.arange(nb_usines))
-            ax.set_xticklabels([f"M{j+1}" for j in range(nb_magasins)])
-            ax.set_yticklabels([f"U{i+1}" for i in range(nb_usines)])
-            
-            plt.setp(ax.get_xticklabels(), rotation=45, ha="right", rotation_mode="anchor")
-            for i in range(nb_usines):
-                for j in range(nb_magasins):
-                    text = ax.text(j, i, allocation_optimisee[i, j], ha="center", va="center", color="black")
-            
-            ax.set_title("Allocation optimisée")
-            fig.tight_layout()
-            
-            # Show the allocation visualization in a new window
-            chart_window = tk.Toplevel()
-            chart_window.title("Allocation optimisée")
-            canvas = FigureCanvasTkAgg(fig, master=chart_window)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
+            path = file_var.get().strip()
+            nb_usines = None if path else int(nb_usines_entry.get())
+            nb_magasins = None if path else int(nb_magasins_entry.get())
+            runner.start(compute, show, nb_usines, nb_magasins, initial_var.get(), path, runner.seed())
+        except Exception as e:
+            result_label.config(text=f"Erreur : {str(e)}")
+
+    add_run_buttons(main_frame, run_algorithm, runner)
+    table = add_result_table(main_frame)
+
+def execute_monte_carlo_sweep():
+    window = create_modern_window("Balayage Monte-Carlo", "500x720")
+    main_frame = tk.Frame(window, bg=WINDOW_BG, padx=20, pady=20)
+    main_frame.pack(fill=tk.BOTH, expand=True)
+
+    tk.Label(main_frame, text="Algorithme :", bg=WINDOW_BG).pack(pady=5)
+    algorithm_var = tk.StringVar(value=SWEEP_ALGORITHMS[0])
+    tk.OptionMenu(main_frame, algorithm_var, *SWEEP_ALGORITHMS).pack(pady=5)
+
+    tk.Label(main_frame, text="Nombres de sommets (ex. 20:200:20) :", bg=WINDOW_BG).pack(pady=5)
+    sizes_entry = tk.Entry(main_frame)
+    sizes_entry.insert(0, "20:200:20")
+    sizes_entry.pack(pady=5)
+
+    tk.Label(main_frame, text="Probabilités / densités (ex. 0.1,0.3) :", bg=WINDOW_BG).pack(pady=5)
+    probabilities_entry = tk.Entry(main_frame)
+    probabilities_entry.insert(0, "0.1,0.3")
+    probabilities_entry.pack(pady=5)
+
+    tk.Label(main_frame, text="Capacités maximales (Ford-Fulkerson) :", bg=WINDOW_BG).pack(pady=5)
+    capacities_entry = tk.Entry(main_frame)
+    capacities_entry.insert(0, "10")
+    capacities_entry.pack(pady=5)
+
+    tk.Label(main_frame, text="Instances par point :", bg=WINDOW_BG).pack(pady=5)
+    samples_entry = tk.Entry(main_frame)
+    samples_entry.insert(0, "20")
+    samples_entry.pack(pady=5)
+
+    result_label = tk.Label(main_frame, text="", bg=WINDOW_BG)
+    result_label.pack(pady=10)
+    runner = BackgroundRunner(window, result_label)
+
+    def compute(job, trace, algorithm, points, samples, seed):
+        def progress(done, total):
+            job.report(f"{done}/{total} instances")
+
+        import multiprocessing
+
+        trace.note("graine", seed)
+        with trace.stage("balayage"):
+            # forking this threaded Tk process could deadlock the workers
+            results = run_sweep(algorithm, points, samples, seed=seed, progress=progress,
+                                mp_context=multiprocessing.get_context("spawn"))
+        trace.count("instances", samples * len(points))
+        return results
+
+    def show(results, trace):
+        failed = sum(point["errors"] for point in results)
+        result_label.config(text=f"{len(results)} points calculés" + (f", {failed} échecs" if failed else ""))
+        slot = FIGURES.slot(window, "balayage", f"Balayage Monte-Carlo ({algorithm_var.get()})", figsize=(11, 5))
+        with trace.stage("figure"):
+            sweep_figure(results, figure=slot.figure)
+        with trace.stage("canvas"):
+            slot.canvas.draw()
+
+    def run_algorithm():
+        try:
+            algorithm = algorithm_var.get()
+            capacities = [None]
+            if algorithm == "ford_fulkerson" and capacities_entry.get().strip():
+                capacities = parse_values(capacities_entry.get(), int)
+            points = sweep_points(algorithm, parse_values(sizes_entry.get(), int),
+                                  parse_values(probabilities_entry.get()), capacities)
+            runner.start(compute, show, algorithm, points, int(samples_entry.get()), runner.seed())
         except Exception as e:
             result_label.config(text=f"Erreur : {str(e)}")
 
-    ModernButton(main_frame, text="Exécuter", command=run_algorithm).pack(pady=15)
+    add_run_buttons(main_frame, run_algorithm, runner)
 
 def show_second_interface():
     window = create_modern_window("Algorithmes de Graphes", "600x400")
@@ -726,77 +918,85 @@ def show_second_interface():
         ("Potentiel-Metra", execute_potentiel_metra_algorithm),
         ("Ford-Fulkerson", execute_ford_fulkerson_algorithm),
         ("Stepping Stone", execute_stepping_stone_algorithm),
+        ("Monte-Carlo", execute_monte_carlo_sweep),
     ]
 
     for i, (text, command) in enumerate(algorithms):
         btn = ModernButton(main_frame, text=text, command=command, width=20)
         btn.grid(row=i // 3, column=i % 3, padx=10, pady=10)
 
-# Main window setup
-root = tk.Tk()
-root.title("EMSI - Algorithmes de Graphes")
-root.geometry("600x400")
-root.configure(bg=WINDOW_BG)
-
-# Main content frame
-main_frame = tk.Frame(root, bg=WINDOW_BG, padx=20, pady=20)
-main_frame.pack(fill=tk.BOTH, expand=True)
-
-# Title
-title_label = tk.Label(
-    main_frame,
-    text="Algorithmes de Théorie des Graphes",
-    font=("Helvetica", 18, "bold"),
-    fg=EMSI_GREEN,
-    bg=WINDOW_BG
-)
-title_label.pack(pady=20)
-
-# Subtitle
-subtitle_label = tk.Label(
-    main_frame,
-    text="École Marocaine des Sciences de l'Ingénieur",
-    font=("Helvetica", 12),
-    fg=DARK_GRAY,
-    bg=WINDOW_BG
-)
-subtitle_label.pack(pady=10)
-
-# Author and Supervisor
-author_label = tk.Label(
-    main_frame,
-    text="Réalisé par : Marwa Rouiss et Sanaa Rhriyeb",
-    font=("Helvetica", 10),
-    fg=DARK_GRAY,
-    bg=WINDOW_BG
-)
-author_label.pack(pady=5)
-
-supervisor_label = tk.Label(
-    main_frame,
-    text="Encadré par : El Mkhalet Mouna",
-    font=("Helvetica", 10),
-    fg=DARK_GRAY,
-    bg=WINDOW_BG
-)
-supervisor_label.pack(pady=5)
-
-# Buttons
-buttons_frame = tk.Frame(main_frame, bg=WINDOW_BG)
-buttons_frame.pack(pady=20)
-
-ModernButton(buttons_frame, text="Commencer", width=20, command=show_second_interface).grid(row=0, column=0, padx=10)
-ModernButton(buttons_frame, text="Quitter", width=20, command=root.quit).grid(row=0, column=1, padx=10)
-
-# Footer
-footer_label = tk.Label(
-    main_frame,
-    text="© 2024 EMSI - Tous droits réservés",
-    font=("Helvetica", 8),
-    fg=DARK_GRAY,
-    bg=WINDOW_BG
-)
-footer_label.pack(side=tk.BOTTOM, pady=20)
+def main():
+    # Main window setup
+    root = tk.Tk()
+    root.title("EMSI - Algorithmes de Graphes")
+    root.geometry("600x400")
+    root.configure(bg=WINDOW_BG)
 
-root.mainloop()
+    # Main content frame
+    main_frame = tk.Frame(root, bg=WINDOW_BG, padx=20, pady=20)
+    main_frame.pack(fill=tk.BOTH, expand=True)
 
+    # Title
+    title_label = tk.Label(
+        main_frame,
+        text="Algorithmes de Théorie des Graphes",
+        font=("Helvetica", 18, "bold"),
+        fg=EMSI_GREEN,
+        bg=WINDOW_BG
+    )
+    title_label.pack(pady=20)
+
+    # Subtitle
+    subtitle_label = tk.Label(
+        main_frame,
+        text="École Marocaine des Sciences de l'Ingénieur",
+        font=("Helvetica", 12),
+        fg=DARK_GRAY,
+        bg=WINDOW_BG
+    )
+    subtitle_label.pack(pady=10)
+
+    # Author and Supervisor
+    author_label = tk.Label(
+        main_frame,
+        text="Réalisé par : Marwa Rouiss et Sanaa Rhriyeb",
+        font=("Helvetica", 10),
+        fg=DARK_GRAY,
+        bg=WINDOW_BG
+    )
+    author_label.pack(pady=5)
+
+    supervisor_label = tk.Label(
+        main_frame,
+        text="Encadré par : El Mkhalet Mouna",
+        font=("Helvetica", 10),
+        fg=DARK_GRAY,
+        bg=WINDOW_BG
+    )
+    supervisor_label.pack(pady=5)
+
+    # Buttons
+    buttons_frame = tk.Frame(main_frame, bg=WINDOW_BG)
+    buttons_frame.pack(pady=20)
+
+    ModernButton(buttons_frame, text="Commencer", width=20, command=show_second_interface).grid(row=0, column=0, padx=10)
+    ModernButton(buttons_frame, text="Quitter", width=20, command=root.quit).grid(row=0, column=1, padx=10)
+
+    # delivers the progress and results of the background jobs
+    SCHEDULER.attach(root)
+
+    # Footer
+    footer_label = tk.Label(
+        main_frame,
+        text="© 2024 EMSI - Tous droits réservés",
+        font=("Helvetica", 8),
+        fg=DARK_GRAY,
+        bg=WINDOW_BG
+    )
+    footer_label.pack(side=tk.BOTTOM, pady=20)
+
+    root.mainloop()
+    SCHEDULER.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+# Headless batch runs of the algorithms over many seeded instances.
+#
+#   python batch.py spec.json --output results.jsonl
+#   python batch.py --algorithm kruskal --sizes 1000,2000 --probabilities 0.01,0.05 --seeds 0-9 \
+#       --output kruskal.jsonl --parquet kruskal.parquet
+#   python batch.py --list
+#
+# A job spec is a JSON object, or a list of them, with "algorithm", "sizes",
+# "probabilities" (omitted for the algorithms that do not use one), "seeds"
+# and optional solver "params"; every combination is one job. An entry with
+# "inputs" instead runs on files (edge lists, transport tables, task
+# networks; see loaders.py), one job per file. Jobs run on a process pool
+# (one worker per core by default) and each result is appended to the JSONL
+# output as soon as it completes, with its stage timings and counters (see
+# instrument.py). Running the same command again resumes the batch: jobs
+# whose key already has a successful line in the output are skipped.
+# Results also go through the on-disk result cache (see resultcache.py)
+# unless --no-cache is given, so a job solved before, in another batch, is
+# answered from the cache ("cached": true in its line). --parquet
+# additionally converts the output with pandas once the batch is done.
+# --figures DIR also draws every solved instance offscreen (Agg) in its
+# worker and writes it to DIR as PNG or SVG ("figure" in its line); those
+# jobs bypass the cache, which holds results, not instances.
+# Nothing here imports tkinter.
+import argparse
+import hashlib
+import importlib.util
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+import algorithms
+from generators import (
+    flow_network_edges, random_edges, random_task_network, random_weighted_edges, vertex_labels,
+)
+from graph_arrays import CompactGraph
+from instrument import RunTrace
+from loaders import load_compact_graph, load_edge_list, load_task_network, load_transport
+from maxflow import ResidualGraph, max_flow
+from resultcache import ResultCache, result_key
+from shortest_paths import ShortestPathService, shortest_path_tree
+from transport import INITIAL_METHODS, basis_to_allocation, modi
+
+# Each solver runs one job: solver(job, trace) -> dict of JSON-friendly
+# results. The instance is generated from (size, probability, seed), or
+# loaded from job["input"] (see loaders.py). Stages and counters go to trace.
+# When job["figure"] is set, the solver also draws its instance there.
+
+def _instance(job, trace, generate, load):
+    if job["input"] is not None:
+        with trace.stage("chargement"):
+            return load(job["input"])
+    with trace.stage("génération"):
+        return generate(job["size"], job["probability"], job["seed"])
+
+def _gnp(generate, **kwargs):
+    # G(n, p) generators need a probability
+    def build(size, probability, seed):
+        if probability is None:
+            raise ValueError("une probabilité est nécessaire pour générer le graphe")
+        return generate(size, probability, seed=seed, **kwargs)
+    return build
+
+def _figure(job, trace, build, figsize=(10, 8)):
+    # offscreen drawing of the solved instance, see --figures
+    if not job.get("figure"):
+        return
+    from rendering import render_to_file
+
+    with trace.stage("figure"):
+        render_to_file(build, job["figure"], figsize)
+
+def _graph_figure(job, trace, graph, title, **highlights):
+    from layout import graph_layout
+    from rendering import graph_figure_3d
+
+    def build(fig):
+        with trace.stage("disposition"):
+            pos = graph_layout(graph, dim=3).pos
+        graph_figure_3d(graph, title, pos=pos, figure=fig, **highlights)
+    _figure(job, trace, build, (8, 8))
+
+def _compact(edges_of, directed=False, labels=None):
+    # random instance of an edge generator as a CompactGraph: the solvers read
+    # its arrays, no networkx graph is built
+    def generate(size, probability, seed=None, **kwargs):
+        edges = edges_of(size, probability, seed=seed, **kwargs)
+        return CompactGraph.from_edge_arrays(edges, directed, labels(size) if labels else None)
+    return generate
+
+def _solve_welsh_powell(job, trace):
+    graph = _instance(job, trace, _gnp(_compact(random_edges)),
+                      lambda path: load_compact_graph(path, weighted=False))
+    with trace.stage("résolution"):
+        colors = algorithms.welsh_powell(graph, job["params"].get("ordering", "welsh_powell"))
+    _graph_figure(job, trace, graph, f"Welsh-Powell : {len(set(colors.values()))} couleurs")
+    return {"vertices": graph.number_of_nodes(), "edges": graph.number_of_edges(),
+            "colors": len(set(colors.values()))}
+
+def _solve_dijkstra(job, trace):
+    graph = _instance(job, trace, _gnp(_compact(random_weighted_edges)),
+                      lambda path: load_compact_graph(path, non_negative=True))
+    with trace.stage("résolution"):
+        tree = ShortestPathService(graph).tree(job["params"].get("source", 0))
+    trace.count("settled", tree.operations)
+    reached = np.isfinite(tree.dist)
+    if job.get("figure"):
+        farthest = int(np.argmax(np.where(reached, tree.dist, -np.inf)))
+        _graph_figure(job, trace, graph, f"Dijkstra : chemin vers {farthest}", path=tree.path(farthest))
+    return {"vertices": graph.number_of_nodes(), "edges": graph.number_of_edges(),
+            "reached": int(reached.sum()), "max_distance": float(tree.dist[reached].max())}
+
+def _solve_kruskal(job, trace):
+    graph = _instance(job, trace, _gnp(_compact(random_weighted_edges, labels=vertex_labels)), load_compact_graph)
+    with trace.stage("résolution"):
+        mst = algorithms.kruskal(graph, job["params"].get("algorithm", "kruskal"))
+    _graph_figure(job, trace, graph, "Arbre couvrant minimal", mst_edges=mst.edges())
+    return {"vertices": graph.number_of_nodes(), "edges": graph.number_of_edges(),
+            "weight": mst.size(weight="weight"), "tree_edges": mst.number_of_edges()}
+
+def _solve_bellman_ford(job, trace):
+    params = job["params"]
+    graph = _instance(job, trace, _gnp(_compact(random_weighted_edges, directed=True),
+                                       directed=True, min_weight=params.get("min_weight", -10),
+                                       max_weight=params.get("max_weight", 10)),
+                      lambda path: load_compact_graph(path, directed=True))
+    with trace.stage("résolution"):
+        tree = shortest_path_tree(graph, params.get("source", 0), params.get("method", "bellman_ford"))
+    trace.count("relaxations", tree.operations)
+    if job.get("figure"):
+        _graph_figure(job, trace, graph, "Bellman-Ford",
+                      bellman_ford_paths=tree.paths() if tree.negative_cycle is None else None)
+    if tree.negative_cycle is not None:
+        return {"edges": graph.number_of_edges(), "negative_cycle": True, "cycle_length": len(tree.cycle_labels()) - 1}
+    return {"edges": graph.number_of_edges(), "negative_cycle": False, "reached": len(tree.distances())}
+
+def _load_tasks(spec):
+    # a .npz path, or {"precedences": edge list, "durations": vector file}
+    if isinstance(spec, dict):
+        return load_task_network(spec["precedences"], spec["durations"])
+    return load_task_network(spec)
+
+def _solve_potentiel(job, trace):
+    network = _instance(job, trace, lambda size, probability, seed: random_task_network(
+        size, job["params"].get("max_predecessors", 3), seed=seed), _load_tasks)
+    with trace.stage("résolution"):
+        schedule = algorithms.appliquer_methode_potentiel(network)
+    trace.count("levels", schedule.levels)
+
+    def build(fig):
+        from rendering import gantt_figure
+
+        order = schedule.order
+        # no GanttChart.connect offscreen: savefig skips the animated highlight
+        gantt_figure(schedule.earliest_start[order], network.duration[order], schedule.critical[order],
+                     names=lambda row: f"T{order[row] + 1}", figure=fig)
+    _figure(job, trace, build, (10, 6))
+    return {"tasks": network.num_tasks, "precedences": len(network.src), "duration": schedule.duration,
+            "levels": schedule.levels, "critical_tasks": int(schedule.critical.sum())}
+
+def _solve_ford_fulkerson(job, trace):
+    # the probability is the density of the topology (None: its default);
+    # loaded networks go from vertex 0 to the last vertex
+    params = job["params"]
+    edges = _instance(job, trace, lambda size, probability, seed: flow_network_edges(
+        size, params.get("max_capacity", 10), params.get("topology", "layered"), probability, seed=seed),
+        lambda path: load_edge_list(path, non_negative=True))
+    with trace.stage("résolution"):
+        network = ResidualGraph(edges.num_nodes, edges.src, edges.dst, edges.weight)
+        result = max_flow(network, 0, edges.num_nodes - 1, params.get("method", "dinic"))
+    trace.count("operations", result.operations)
+
+    def build(fig):
+        from layout import graph_layout
+        from rendering import flow_figure
+
+        with trace.stage("disposition"):
+            pos = graph_layout(CompactGraph.from_edge_arrays(edges, directed=True)).pos
+        flow_figure(edges, pos, result.flow, figure=fig)
+    _figure(job, trace, build)
+    return {"vertices": edges.num_nodes, "edges": len(edges.src), "max_flow": result.value}
+
+def _load_problem(spec):
+    # a single file, or {"costs": ..., "supplies": ..., "demands": ...}
+    if isinstance(spec, dict):
+        return load_transport(spec["costs"], spec.get("supplies"), spec.get("demands"))
+    return load_transport(spec)
+
+def _solve_stepping_stone(job, trace):
+    # size factories, params["stores"] stores (default: as many)
+    params = job["params"]
+    couts, capacites, demandes = _instance(job, trace, lambda size, probability, seed: algorithms.generate_data(
+        size, params.get("stores", size), seed=seed), _load_problem)
+    with trace.stage("résolution"):
+        basis = INITIAL_METHODS[params.get("initial", "least_cost")](couts, capacites, demandes)
+        result = modi(couts, basis)
+    trace.count("pivots", result.pivots)
+
+    def build(fig):
+        from rendering import allocation_figure
+
+        allocation_figure(result.allocation, figure=fig)
+    _figure(job, trace, build, (10, 6))
+    return {"factories": len(capacites), "stores": len(demandes),
+            "initial_cost": algorithms.calculer_cout_total(couts, basis_to_allocation(basis)),
+            "optimal_cost": result.cost}
+
+SOLVERS = {
+    "welsh_powell": _solve_welsh_powell,
+    "dijkstra": _solve_dijkstra,
+    "kruskal": _solve_kruskal,
+    "bellman_ford": _solve_bellman_ford,
+    "potentiel_metra": _solve_potentiel,
+    "ford_fulkerson": _solve_ford_fulkerson,
+    "stepping_stone": _solve_stepping_stone,
+}
+
+def _json_value(value):
+    # numpy scalars from the solvers
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def job_key(job):
+    """Stable identifier of a job, used to resume a batch."""
+    params = json.dumps(job["params"], sort_keys=True)
+    if job["input"] is not None:
+        return f"{job['algorithm']}|input={json.dumps(job['input'], sort_keys=True)}|{params}"
+    return f"{job['algorithm']}|n={job['size']}|p={job['probability']}|seed={job['seed']}|{params}"
+
+def expand_spec(spec):
+    """The jobs of a spec (a dict or a list of dicts), in a stable order.
+
+    An entry with "inputs" (file paths, or dicts of paths for the transport
+    and task loaders) runs on those files instead of generated instances.
+    """
+    jobs = []
+    for entry in spec if isinstance(spec, list) else [spec]:
+        algorithm = entry["algorithm"]
+        if algorithm not in SOLVERS:
+            raise ValueError(f"Algorithme inconnu : {algorithm!r} (attendu : {', '.join(SOLVERS)})")
+        params = entry.get("params", {})
+        if "inputs" in entry:
+            combos = [(None, None, None, path) for path in entry["inputs"]]
+        else:
+            combos = [(size, probability, seed, None) for size, probability, seed in itertools.product(
+                entry["sizes"], entry.get("probabilities", [None]), entry.get("seeds", [0]))]
+        for size, probability, seed, path in combos:
+            job = {"algorithm": algorithm, "size": size, "probability": probability, "seed": seed,
+                   "input": path, "params": params}
+            job["key"] = job_key(job)
+            jobs.append(job)
+    return jobs
+
+_caches = {}
+
+def _cache(directory):
+    # one ResultCache per directory and worker process
+    if directory not in _caches:
+        _caches[directory] = ResultCache(directory)
+    return _caches[directory]
+
+def figure_path(job, directory, fmt="png"):
+    # file names stay short and safe whatever the job key
+    digest = hashlib.blake2b(job["key"].encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(directory, f"{job['algorithm']}-{digest}.{fmt}")
+
+def run_job(job, cache_dir=None, figure_dir=None, figure_format="png"):
+    """Run one job in a worker process; always returns a record, errors included.
+
+    With cache_dir, results are looked up in and stored to the result cache
+    (batch entries are keyed apart from the windows' ones). With figure_dir,
+    the instance is drawn offscreen into a figure_format file there.
+    """
+    trace = RunTrace(job["key"])
+    record = {key: job[key] for key in ("key", "algorithm", "size", "probability", "seed", "input", "params")}
+    if figure_dir is not None:
+        job = {**job, "figure": figure_path(job, figure_dir, figure_format)}
+    try:
+        solve = lambda: SOLVERS[job["algorithm"]](job, trace)
+        if cache_dir is None or figure_dir is not None:
+            result = solve()
+        else:
+            params = {"size": job["size"], "probability": job["probability"], **job["params"]}
+            key = result_key(f"batch/{job['algorithm']}", params, job["seed"] if job["input"] is None else None,
+                             job["input"])
+            result = _cache(cache_dir).lookup_or_run(trace, key, solve)
+            record["cached"] = trace.info.get("cache") == "succès"
+        record["status"] = "ok"
+        record["result"] = {name: _json_value(value) for name, value in result.items()}
+        if figure_dir is not None:
+            record["figure"] = job["figure"]
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["stages"] = {name: round(seconds, 6) for name, seconds in trace.stages.items()}
+    record["counters"] = {name: _json_value(value) for name, value in trace.counters.items()}
+    record["worker"] = os.getpid()
+    return record
+
+def completed_keys(path):
+    """Keys of the successful records already in a JSONL output.
+
+    A line cut short by an interrupted run is ignored (the job runs again).
+    """
+    keys = set()
+    if not os.path.exists(path):
+        return keys
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("status") == "ok":
+                keys.add(record["key"])
+    return keys
+
+def _open_output(path):
+    # append mode; a truncated last line gets terminated so new records
+    # start on their own line
+    needs_newline = False
+    if os.path.exists(path) and os.path.getsize(path):
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+    out = open(path, "a", encoding="utf-8")
+    if needs_newline:
+        out.write("\n")
+    return out
+
+def run_batch(jobs, output, workers=None, log=None, cache_dir=None, figure_dir=None, figure_format="png"):
+    """Run the jobs not yet completed in output; returns (done, failed, skipped)."""
+    done_keys = completed_keys(output)
+    pending = [job for job in jobs if job["key"] not in done_keys]
+    skipped = len(jobs) - len(pending)
+    done = failed = 0
+    workers = workers or os.cpu_count() or 1
+    with _open_output(output) as out:
+        pool = ProcessPoolExecutor(workers)
+        queue = iter(pending)
+        running = set()
+        try:
+            while True:
+                # a bounded number of jobs in flight, so huge batches are not
+                # all submitted (and held) at once
+                for job in itertools.islice(queue, 2 * workers - len(running)):
+                    running.add(pool.submit(run_job, job, cache_dir, figure_dir, figure_format))
+                if not running:
+                    break
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record = future.result()
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                    done += 1
+                    failed += record["status"] != "ok"
+                    if log is not None:
+                        total = sum(record["stages"].values()) * 1000
+                        log(f"[{done + skipped}/{len(jobs)}] {record['key']}  {record['status']}  {total:.0f} ms")
+        except BaseException:
+            # interrupted or failed: drop the queued jobs (by hand, shutdown's
+            # cancel_futures needs Python 3.9) and return without waiting for
+            # the running ones, which a with block on the pool would do
+            for future in running:
+                future.cancel()
+            pool.shutdown(wait=False)
+            raise
+        pool.shutdown()
+    return done, failed, skipped
+
+def to_parquet(jsonl_path, parquet_path):
+    """Successful records of a JSONL output as a flat Parquet table (needs pandas and pyarrow)."""
+    import pandas as pd
+
+    with open(jsonl_path, encoding="utf-8") as f:
+        records = []
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("status") == "ok":
+                record["params"] = json.dumps(record["params"], sort_keys=True)
+                records.append(record)
+    pd.json_normalize(records).to_parquet(parquet_path, index=False)
+
+def _int_list(text):
+    # "1,2,5-8" -> [1, 2, 5, 6, 7, 8]
+    values = []
+    for part in text.split(","):
+        low, _, high = part.partition("-")
+        values.extend(range(int(low), int(high) + 1) if high else [int(low)])
+    return values
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exécution en lot des algorithmes, sans interface")
+    parser.add_argument("spec", nargs="?", help="fichier JSON de spécification des travaux")
+    parser.add_argument("--algorithm", help="algorithme (sans fichier de spécification)")
+    parser.add_argument("--sizes", type=_int_list, help="tailles, ex. 100,200,400")
+    parser.add_argument("--probabilities", help="probabilités, ex. 0.01,0.05")
+    parser.add_argument("--seeds", type=_int_list, default=[0], help="graines, ex. 0-9")
+    parser.add_argument("--inputs", help="fichiers d'instances séparés par des virgules (au lieu de --sizes)")
+    parser.add_argument("--params", default="{}", help="paramètres du solveur en JSON")
+    parser.add_argument("--output", default="batch.jsonl", help="fichier JSONL des résultats (repris s'il existe)")
+    parser.add_argument("--parquet", help="copie Parquet des résultats en fin de lot")
+    parser.add_argument("--workers", type=int, help="processus (défaut : un par cœur)")
+    parser.add_argument("--restart", action="store_true", help="efface la sortie au lieu de la reprendre")
+    parser.add_argument("--no-cache", action="store_true", help="sans le cache de résultats (mesures de temps)")
+    parser.add_argument("--figures", help="dossier où dessiner chaque instance résolue (rendu hors écran)")
+    parser.add_argument("--figure-format", default="png", choices=("png", "svg"), help="format des figures")
+    parser.add_argument("--list", action="store_true", help="liste les algorithmes disponibles")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(SOLVERS))
+        return 0
+    if args.spec:
+        with open(args.spec, encoding="utf-8") as f:
+            spec = json.load(f)
+    elif args.algorithm and args.inputs:
+        spec = {"algorithm": args.algorithm, "inputs": args.inputs.split(","), "params": json.loads(args.params)}
+    elif args.algorithm and args.sizes:
+        spec = {"algorithm": args.algorithm, "sizes": args.sizes, "seeds": args.seeds,
+                "params": json.loads(args.params)}
+        if args.probabilities:
+            spec["probabilities"] = [float(p) for p in args.probabilities.split(",")]
+    else:
+        parser.error("un fichier de spécification, ou --algorithm avec --sizes ou --inputs, est nécessaire")
+    try:
+        jobs = expand_spec(spec)
+    except (KeyError, ValueError) as e:
+        parser.error(f"spécification invalide : {e}")
+
+    if args.parquet and not any(importlib.util.find_spec(m) for m in ("pyarrow", "fastparquet")):
+        # checked before the batch rather than after hours of work
+        parser.error("--parquet nécessite pandas et pyarrow (ou fastparquet)")
+
+    if args.restart and os.path.exists(args.output):
+        os.remove(args.output)
+    log = lambda line: print(line, file=sys.stderr)
+    started = time.perf_counter()
+    cache_dir = None if args.no_cache else ResultCache.from_env().directory
+    if args.figures:
+        os.makedirs(args.figures, exist_ok=True)
+    done, failed, skipped = run_batch(jobs, args.output, args.workers, log, cache_dir, args.figures,
+                                      args.figure_format)
+    log(f"{done} travaux exécutés ({failed} en erreur), {skipped} déjà faits, "
+        f"{time.perf_counter() - started:.1f} s")
+    if args.parquet:
+        to_parquet(args.output, args.parquet)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
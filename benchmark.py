@@ -0,0 +1,263 @@
+# Scaling benchmarks for the headless algorithms.
+#
+#   python benchmark.py                              # all cases, JSON on stdout
+#   python benchmark.py --quick --output bench.json
+#   python benchmark.py --cases kruskal,dijkstra --baseline bench.json --threshold 0.25
+#
+# Every case builds seeded instances of growing size (generation is not
+# timed, except for the generator cases themselves), runs the algorithm
+# --repeat times and keeps the fastest wall time, then runs it once more
+# under tracemalloc for the peak memory. Operation counts come from the
+# engines that report one (relaxations, settled vertices, augmentations or
+# pushes, pivots, levels). Per case, a power law t = c * size^k is fitted on
+# the timings and the closest of the usual complexity classes is reported.
+# With --baseline, the run fails (exit code 1) when a timing is more than
+# --threshold slower than the same case and size in the baseline file.
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+import numpy as np
+
+import algorithms
+from generators import flow_network_edges, random_task_network
+from maxflow import ResidualGraph, max_flow
+from shortest_paths import ShortestPathService, shortest_path_tree
+from transport import modi
+
+# setup(size, seed) -> (args, work): work is the input size the timings are
+# fitted against (vertices + edges, tasks + arcs, cells); run(*args) returns
+# an operation count or None
+Case = namedtuple("Case", ["name", "sizes", "quick_sizes", "setup", "run"])
+
+def _sparse_graph(generate, n, seed, **kwargs):
+    # about 8 neighbours per vertex at every size
+    graph = generate(n, min(1.0, 8 / n), seed=seed, **kwargs)
+    return graph, graph.number_of_nodes() + graph.number_of_edges()
+
+def _graph_case(generate, **kwargs):
+    def setup(n, seed):
+        graph, work = _sparse_graph(generate, n, seed, **kwargs)
+        return (graph,), work
+    return setup
+
+def _run_welsh_powell(graph):
+    algorithms.welsh_powell(graph)
+
+def _run_dijkstra(graph):
+    return ShortestPathService(graph).tree(0).operations
+
+def _run_kruskal(graph):
+    algorithms.kruskal(graph)
+
+def _run_bellman_ford(graph):
+    return shortest_path_tree(graph, 0).operations
+
+def _setup_tasks(n, seed):
+    network = random_task_network(n, seed=seed)
+    return (network,), network.num_tasks + len(network.src)
+
+def _run_potentiel(network):
+    return algorithms.appliquer_methode_potentiel(network).levels
+
+def _setup_flow(n, seed):
+    edges = flow_network_edges(n, 100, "layered", seed=seed)
+    return (edges,), n + len(edges.src)
+
+def _run_ford_fulkerson(edges):
+    network = ResidualGraph(edges.num_nodes, edges.src, edges.dst, edges.weight)
+    return max_flow(network, 0, edges.num_nodes - 1, "dinic").operations
+
+def _setup_transport(m, seed):
+    couts, capacites, demandes = algorithms.generate_data(m, m, seed=seed)
+    return (couts, capacites, demandes), m * m
+
+def _run_moindre_cout(couts, capacites, demandes):
+    algorithms.moindre_cout(couts, capacites, demandes)
+
+def _run_nord_ouest(couts, capacites, demandes):
+    algorithms.nord_ouest(capacites.copy(), demandes.copy())
+
+def _setup_stepping_stone(m, seed):
+    (couts, capacites, demandes), work = _setup_transport(m, seed)
+    start = algorithms.nord_ouest(capacites.copy(), demandes.copy())
+    return (couts, start), work
+
+def _run_stepping_stone(couts, start):
+    return modi(couts, start).pivots
+
+def _setup_generator(n, seed):
+    return (n, seed), n
+
+def _run_generate_graph(n, seed):
+    algorithms.generate_weighted_graph(n, min(1.0, 8 / n), seed=seed)
+
+def _run_generate_flow(n, seed):
+    flow_network_edges(n, 100, "layered", seed=seed)
+
+def _run_generate_tasks(n, seed):
+    random_task_network(n, seed=seed)
+
+GRAPH_SIZES = [1000, 2000, 4000, 8000, 16000]
+QUICK_GRAPH_SIZES = [250, 500, 1000]
+
+CASES = [
+    Case("welsh_powell", GRAPH_SIZES, QUICK_GRAPH_SIZES, _graph_case(algorithms.generate_random_graph),
+         _run_welsh_powell),
+    Case("dijkstra", GRAPH_SIZES, QUICK_GRAPH_SIZES, _graph_case(algorithms.generate_weighted_graph), _run_dijkstra),
+    Case("kruskal", GRAPH_SIZES, QUICK_GRAPH_SIZES, _graph_case(algorithms.generate_labeled_weighted_graph),
+         _run_kruskal),
+    # non-negative weights, so every size has a shortest-path tree to build
+    Case("bellman_ford", GRAPH_SIZES, QUICK_GRAPH_SIZES,
+         _graph_case(algorithms.generate_random_weighted_digraph, min_weight=0, max_weight=10), _run_bellman_ford),
+    Case("appliquer_methode_potentiel", [12500, 25000, 50000, 100000, 200000], [2000, 4000, 8000],
+         _setup_tasks, _run_potentiel),
+    Case("ford_fulkerson", [1000, 2000, 4000, 8000, 16000], [250, 500, 1000], _setup_flow, _run_ford_fulkerson),
+    Case("moindre_cout", [100, 200, 400, 800], [25, 50, 100], _setup_transport, _run_moindre_cout),
+    Case("nord_ouest", [100, 200, 400, 800], [25, 50, 100], _setup_transport, _run_nord_ouest),
+    Case("stepping_stone", [25, 50, 100, 200], [10, 20, 40], _setup_stepping_stone, _run_stepping_stone),
+    Case("generate_weighted_graph", [2000, 4000, 8000, 16000, 32000], [250, 500, 1000], _setup_generator,
+         _run_generate_graph),
+    Case("flow_network_edges", [10000, 20000, 40000, 80000], [1000, 2000, 4000], _setup_generator,
+         _run_generate_flow),
+    Case("random_task_network", [25000, 50000, 100000, 200000], [2000, 4000, 8000], _setup_generator,
+         _run_generate_tasks),
+]
+
+# complexity classes tried by fit_complexity, as functions of the size
+MODELS = {
+    "n": lambda n: n,
+    "n log n": lambda n: n * np.log2(n),
+    "n^2": lambda n: n ** 2,
+    "n^3": lambda n: n ** 3,
+}
+
+def fit_complexity(work, seconds):
+    """Power-law exponent of seconds against work, and the closest model.
+
+    Each model f is fitted as t = c * f(n) in log space; the model with the
+    smallest spread of log(t / f(n)) wins. Needs at least 3 points.
+    """
+    work = np.asarray(work, dtype=float)
+    seconds = np.maximum(np.asarray(seconds, dtype=float), 1e-9)
+    if len(work) < 3:
+        return None
+    exponent = float(np.polyfit(np.log(work), np.log(seconds), 1)[0])
+    spread = {}
+    for name, f in MODELS.items():
+        spread[name] = float(np.std(np.log(seconds) - np.log(f(work))))
+    best = min(spread, key=spread.get)
+    return {"exponent": round(exponent, 3), "model": best, "spread": round(spread[best], 4)}
+
+def measure(case, size, seed, repeat, memory):
+    args, work = case.setup(size, seed)
+    best = math.inf
+    operations = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operations = case.run(*args)
+        best = min(best, time.perf_counter() - started)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        case.run(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"size": size, "work": int(work), "seconds": best, "peak_bytes": peak, "operations": operations}
+
+def run_benchmarks(cases, quick=False, seed=0, repeat=3, memory=True, log=None):
+    results = {}
+    for case in cases:
+        rows = []
+        for size in (case.quick_sizes if quick else case.sizes):
+            row = measure(case, size, seed, repeat, memory)
+            rows.append(row)
+            if log is not None:
+                peak = "" if row["peak_bytes"] is None else f"  peak {row['peak_bytes'] / 2**20:8.1f} MiB"
+                ops = "" if row["operations"] is None else f"  ops {row['operations']}"
+                log(f"{case.name:28} size {size:>7}  {row['seconds'] * 1000:9.1f} ms{peak}{ops}")
+        results[case.name] = {
+            "results": rows,
+            "fit": fit_complexity([r["work"] for r in rows], [r["seconds"] for r in rows]),
+        }
+        if log is not None and results[case.name]["fit"]:
+            fit = results[case.name]["fit"]
+            log(f"{case.name:28} ~ size^{fit['exponent']} (closest: {fit['model']})")
+    return results
+
+def compare(results, baseline, threshold, min_seconds=0.005):
+    """Regressions of results against a baseline report, as readable lines.
+
+    A timing regresses when it is more than threshold (relative) and
+    min_seconds (absolute) slower than the baseline timing of the same case
+    and size. Cases or sizes missing from either side are skipped.
+    """
+    regressions = []
+    for name, entry in results.items():
+        old = {r["size"]: r for r in baseline.get("cases", {}).get(name, {}).get("results", [])}
+        for row in entry["results"]:
+            ref = old.get(row["size"])
+            if ref is None:
+                continue
+            if row["seconds"] > ref["seconds"] * (1 + threshold) and row["seconds"] - ref["seconds"] > min_seconds:
+                regressions.append(f"{name} size {row['size']}: {row['seconds'] * 1000:.1f} ms "
+                                   f"(référence {ref['seconds'] * 1000:.1f} ms, x{row['seconds'] / ref['seconds']:.2f})")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de passage à l'échelle des algorithmes")
+    parser.add_argument("--cases", help="noms séparés par des virgules (défaut : tous)")
+    parser.add_argument("--quick", action="store_true", help="petites tailles seulement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="sans mesure tracemalloc")
+    parser.add_argument("--output", help="fichier JSON des résultats (défaut : sortie standard)")
+    parser.add_argument("--baseline", help="rapport JSON de référence à comparer")
+    parser.add_argument("--threshold", type=float, default=0.25, help="ralentissement relatif toléré")
+    args = parser.parse_args(argv)
+
+    cases = CASES
+    if args.cases:
+        wanted = args.cases.split(",")
+        unknown = set(wanted) - {case.name for case in CASES}
+        if unknown:
+            parser.error(f"cas inconnus : {', '.join(sorted(unknown))}")
+        cases = [case for case in CASES if case.name in wanted]
+
+    log = lambda line: print(line, file=sys.stderr)
+    results = run_benchmarks(cases, args.quick, args.seed, args.repeat, not args.no_memory, log)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "quick": args.quick,
+            "repeat": args.repeat,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "cases": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            log(f"RÉGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# Cold-start budget check for the headless core and the GUI entry point.
+#
+#   python coldstart.py                 # median of 5 fresh interpreters
+#   python coldstart.py --runs 9 --core-budget 400 --gui-budget 600
+#
+# Each target is imported in a fresh interpreter so nothing is cached in
+# sys.modules. The run fails (exit code 1) when a median import time is over
+# budget or when a module that must stay lazy was loaded by the import.
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Budgets in milliseconds, measured on a developer laptop; override on the
+# command line for slower CI machines.
+CORE_BUDGET_MS = 600
+GUI_BUDGET_MS = 800
+
+# Modules that must not be imported just by importing the target.
+LAZY_MODULES = ("matplotlib", "pandas", "tabulate", "mpl_toolkits")
+HEADLESS_MODULES = LAZY_MODULES + ("tkinter",)
+
+TARGETS = {
+    "core": ("algorithms", HEADLESS_MODULES),
+    "batch": ("batch", HEADLESS_MODULES),
+    "gui": ("appro", LAZY_MODULES),
+}
+
+_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - t) * 1000
+loaded = sorted(m for m in {forbidden!r} if m in sys.modules)
+print(json.dumps({{"ms": elapsed, "loaded": loaded}}))
+"""
+
+def measure(module, forbidden, runs=5):
+    timings = []
+    loaded = set()
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, forbidden=forbidden)],
+            check=True, capture_output=True, text=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        timings.append(result["ms"])
+        loaded.update(result["loaded"])
+    return statistics.median(timings), sorted(loaded)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesure du temps de démarrage à froid")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--core-budget", type=float, default=CORE_BUDGET_MS)
+    parser.add_argument("--gui-budget", type=float, default=GUI_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    budgets = {"core": args.core_budget, "batch": args.core_budget, "gui": args.gui_budget}
+    ok = True
+    for name, (module, forbidden) in TARGETS.items():
+        ms, loaded = measure(module, forbidden, args.runs)
+        status = "OK"
+        if ms > budgets[name]:
+            status = "OVER BUDGET"
+            ok = False
+        if loaded:
+            status = f"EAGER IMPORTS: {', '.join(loaded)}"
+            ok = False
+        print(f"{name:5} import {module:10} {ms:7.1f} ms (budget {budgets[name]:.0f} ms)  {status}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# Result windows holding a matplotlib figure.
+#
+# Every algorithm window shows its figures in a fixed set of result windows,
+# one per kind of figure (graph, Gantt chart, allocation...). A new run
+# clears and redraws the figure of the window already open for that kind
+# instead of opening another window with another figure. Closing a result
+# window (or the algorithm window, its parent) releases its figure and
+# canvas. At most max_live result windows stay open: past that, the least
+# recently drawn one is closed.
+import tkinter as tk
+from collections import OrderedDict
+
+class FigureSlot:
+    """One result window: its Toplevel, figure, canvas and footer frame.
+
+    footer holds the widgets that go with the current figure (labels,
+    check buttons); it is emptied before each redraw, and so are the canvas
+    callbacks registered through connect().
+    """
+
+    def __init__(self, parent, title, figsize, toolbar):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from matplotlib.figure import Figure
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.figure = Figure(figsize=figsize)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.window)
+        self.footer = tk.Frame(self.window)
+        self.footer.pack(side=tk.BOTTOM, fill=tk.X)
+        self.toolbar = None
+        if toolbar:
+            self.toolbar = NavigationToolbar2Tk(self.canvas, self.window, pack_toolbar=False)
+            self.toolbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self._callbacks = []
+
+    def connect(self, event, handler):
+        self.track(self.canvas.mpl_connect(event, handler))
+
+    def track(self, cid):
+        # a callback connected elsewhere (e.g. GanttChart.connect)
+        self._callbacks.append(cid)
+
+    def _disconnect(self):
+        for cid in self._callbacks:
+            self.canvas.mpl_disconnect(cid)
+        self._callbacks.clear()
+
+    def reset(self, title):
+        self._disconnect()
+        for widget in self.footer.winfo_children():
+            widget.destroy()
+        self.figure.clear()
+        if self.toolbar is not None:
+            # forget the zoom history of the previous figure
+            self.toolbar.update()
+        self.window.title(title)
+
+    def release(self):
+        # the Tk widgets go with the window; the figure is emptied and dropped
+        self._disconnect()
+        self.figure.clear()
+        self.canvas = None
+        self.figure = None
+        self.toolbar = None
+
+class FigureManager:
+    """Result windows keyed by (algorithm window, kind), reused across runs."""
+
+    def __init__(self, max_live=8):
+        self.max_live = max_live
+        self._slots = OrderedDict()
+        self.created = 0
+        self.reused = 0
+
+    def slot(self, parent, kind, title, figsize=(10, 8), toolbar=True):
+        """The result window for kind, emptied and ready to draw into.
+
+        Draw into slot.figure, then call slot.canvas.draw().
+        """
+        key = (parent, kind)
+        slot = self._slots.get(key)
+        if slot is not None:
+            self.reused += 1
+            self._slots.move_to_end(key)
+            slot.reset(title)
+            slot.window.deiconify()
+            slot.window.lift()
+            return slot
+        self.created += 1
+        slot = FigureSlot(parent, title, figsize, toolbar)
+        self._slots[key] = slot
+        slot.window.bind("<Destroy>", lambda event: self._on_destroy(event, key, slot), add="+")
+        while len(self._slots) > self.max_live:
+            _, oldest = self._slots.popitem(last=False)
+            oldest.window.destroy()
+        return slot
+
+    def _on_destroy(self, event, key, slot):
+        if event.widget is not slot.window:
+            return
+        if self._slots.get(key) is slot:
+            del self._slots[key]
+        slot.release()
+
+    def live(self):
+        return len(self._slots)
+
+    def close_all(self):
+        for slot in list(self._slots.values()):
+            slot.window.destroy()
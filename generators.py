@@ -0,0 +1,197 @@
+# Random instance generators that work on edge arrays.
+#
+# G(n, p) edges are sampled by geometric skipping (Batagelj & Brandes): the
+# gap between two consecutive selected vertex pairs is geometric with
+# parameter p, so only the O(n + m) selected pairs are ever touched instead
+# of all n² candidates. Gaps are drawn in NumPy batches and the linear pair
+# index is decoded back to (src, dst) in row-major order, the same order as a
+# nested "for i / for j" loop. networkx graphs are only built, in bulk, when
+# to_networkx is called.
+from collections import namedtuple
+
+import numpy as np
+
+EdgeArrays = namedtuple("EdgeArrays", ["num_nodes", "src", "dst", "weight"])
+
+def make_rng(seed=None):
+    # accepts None, an int seed or an existing np.random.Generator
+    return np.random.default_rng(seed)
+
+def _sample_indices(total, probability, rng):
+    if total <= 0 or probability <= 0:
+        return np.empty(0, dtype=np.int64)
+    if probability >= 1:
+        return np.arange(total, dtype=np.int64)
+    expected = total * probability
+    batch = int(expected + 6 * np.sqrt(expected * (1 - probability))) + 16
+    chunks = []
+    last = -1
+    while last < total:
+        positions = last + np.cumsum(rng.geometric(probability, size=batch))
+        chunks.append(positions)
+        last = int(positions[-1])
+    indices = np.concatenate(chunks)
+    return indices[indices < total]
+
+def gnp_pairs(num_vertices, probability, directed=False, seed=None):
+    """Sample the vertex pairs of a G(n, p) graph; returns (src, dst) arrays.
+
+    Undirected graphs only use pairs i < j; directed graphs use every ordered
+    pair i != j.
+    """
+    rng = make_rng(seed)
+    n = int(num_vertices)
+    if directed:
+        k = _sample_indices(n * (n - 1), probability, rng)
+        src = k // max(n - 1, 1)
+        dst = k % max(n - 1, 1)
+        dst += dst >= src
+        return src, dst
+    k = _sample_indices(n * (n - 1) // 2, probability, rng)
+    rows = np.arange(n, dtype=np.int64)
+    offsets = rows * n - rows * (rows + 1) // 2
+    src = np.searchsorted(offsets, k, side="right") - 1
+    dst = k - offsets[src] + src + 1
+    return src, dst
+
+def random_edges(num_vertices, probability, directed=False, seed=None):
+    src, dst = gnp_pairs(num_vertices, probability, directed, seed)
+    return EdgeArrays(num_vertices, src, dst, None)
+
+def random_weighted_edges(num_vertices, probability, min_weight=1, max_weight=100,
+                          directed=False, seed=None):
+    rng = make_rng(seed)
+    src, dst = gnp_pairs(num_vertices, probability, directed, rng)
+    weight = rng.integers(min_weight, max_weight, size=len(src), endpoint=True)
+    return EdgeArrays(num_vertices, src, dst, weight)
+
+def vertex_labels(num_vertices):
+    # spreadsheet-style names: A..Z, AA..AZ, BA..ZZ, AAA..
+    labels = []
+    for k in range(num_vertices):
+        name = ""
+        k += 1
+        while k:
+            k, r = divmod(k - 1, 26)
+            name = chr(ord("A") + r) + name
+        labels.append(name)
+    return labels
+
+def to_networkx(edges, directed=False, labels=None, attr="weight"):
+    import networkx as nx
+
+    graph = nx.DiGraph() if directed else nx.Graph()
+    src, dst = edges.src.tolist(), edges.dst.tolist()
+    if labels is not None:
+        src = [labels[i] for i in src]
+        dst = [labels[i] for i in dst]
+        graph.add_nodes_from(labels[:edges.num_nodes])
+    else:
+        graph.add_nodes_from(range(edges.num_nodes))
+    if edges.weight is None:
+        graph.add_edges_from(zip(src, dst))
+    else:
+        graph.add_weighted_edges_from(zip(src, dst, edges.weight.tolist()), weight=attr)
+    return graph
+
+# Flow networks: vertex 0 is the source and vertex n-1 the sink. "weight"
+# holds the integer capacities, in the format maxflow.ResidualGraph expects.
+FLOW_TOPOLOGIES = ("complete", "random", "layered", "grid")
+
+def _layered_pairs(n, density, rng):
+    middle = np.arange(1, n - 1)
+    if len(middle) == 0:
+        return np.array([0]), np.array([n - 1])
+    width = max(1, int(round(np.sqrt(len(middle)))))
+    layers = np.array_split(middle, int(np.ceil(len(middle) / width)))
+    src = [np.zeros(len(layers[0]), dtype=np.int64)]
+    dst = [layers[0]]
+    if density is None:
+        density = min(1.0, 4 / width)
+    for a, b in zip(layers, layers[1:]):
+        # each vertex keeps at least one successor so no layer is a dead end
+        forced = np.arange(len(a)) * len(b) + rng.integers(0, len(b), size=len(a))
+        k = np.union1d(_sample_indices(len(a) * len(b), density, rng), forced)
+        i, j = k // len(b), k % len(b)
+        src.append(a[i])
+        dst.append(b[j])
+    src.append(layers[-1])
+    dst.append(np.full(len(layers[-1]), n - 1, dtype=np.int64))
+    return np.concatenate(src), np.concatenate(dst)
+
+def _grid_pairs(n, density, rng):
+    middle = n - 2
+    if middle <= 0:
+        return np.array([0]), np.array([n - 1])
+    cols = int(np.ceil(np.sqrt(middle)))
+    cell = np.arange(middle)
+    col = cell % cols
+    src, dst = [], []
+    right = cell[(col + 1 < cols) & (cell + 1 < middle)]
+    src.append(right)
+    dst.append(right + 1)
+    down = cell[cell + cols < middle]
+    # vertical links both ways, the reverse one with probability density
+    up = down[rng.random(len(down)) < density]
+    src += [down, up + cols]
+    dst += [down + cols, up]
+    first, last = cell[col == 0], cell[(col == cols - 1) | (cell == middle - 1)]
+    src = np.concatenate(src + [np.full(len(first), -1), last]) + 1
+    dst = np.concatenate(dst + [first, np.full(len(last), n - 2)]) + 1
+    return src, dst
+
+def flow_network_edges(num_vertices, max_capacity=10, topology="complete", density=None, seed=None):
+    """Random flow network as EdgeArrays (capacities in the weight field).
+
+    complete: every ordered pair; random: G(n, p) digraph with p = density;
+    layered: source -> layers of about sqrt(n) vertices -> sink, consecutive
+    layers linked with probability density (default: about 4 successors per
+    vertex); grid: source -> grid (right/down links, upward
+    links with probability density) -> sink.
+    """
+    if topology not in FLOW_TOPOLOGIES:
+        raise ValueError(f"Topologie inconnue : {topology!r} (attendu : {', '.join(FLOW_TOPOLOGIES)})")
+    rng = make_rng(seed)
+    n = int(num_vertices)
+    if n < 2:
+        raise ValueError("Un réseau de flot a au moins deux sommets")
+    if topology == "complete":
+        src, dst = gnp_pairs(n, 1.0, directed=True)
+    elif topology == "random":
+        src, dst = gnp_pairs(n, min(1.0, 8 / n) if density is None else density, True, rng)
+    elif topology == "layered":
+        src, dst = _layered_pairs(n, density, rng)
+    else:
+        src, dst = _grid_pairs(n, 0.5 if density is None else density, rng)
+    capacity = rng.integers(1, max_capacity, size=len(src), endpoint=True)
+    return EdgeArrays(n, src.astype(np.int64), dst.astype(np.int64), capacity)
+
+# Project networks for the potential-task (CPM) method: one duration per task
+# and precedence arcs src -> dst ("src must finish before dst starts").
+TaskNetwork = namedtuple("TaskNetwork", ["num_tasks", "duration", "src", "dst"])
+
+def random_task_network(num_tasks, max_predecessors=3, window=100, min_duration=1, max_duration=10,
+                        seed=None):
+    """Random precedence DAG with up to max_predecessors per task.
+
+    In a hidden order, each task makes max_predecessors draws, each kept
+    with probability 1/2, among the window tasks just before it (duplicates
+    are merged), which keeps the graph acyclic and gives chains of
+    length about num_tasks / window. Task numbers are then shuffled so the
+    numbering is not a topological order.
+    """
+    rng = make_rng(seed)
+    n = int(num_tasks)
+    rank = np.arange(n, dtype=np.int64)
+    src, dst = [], []
+    for _ in range(max_predecessors):
+        has = (rank > 0) & (rng.random(n) < 0.5)
+        after = rank[has]
+        before = after - 1 - (rng.random(len(after)) * np.minimum(after, window)).astype(np.int64)
+        src.append(before)
+        dst.append(after)
+    base = max(n, 1)
+    pairs = np.unique(np.concatenate(src + [rank[:0]]) * base + np.concatenate(dst + [rank[:0]]))
+    label = rng.permutation(n)
+    duration = rng.integers(min_duration, max_duration, size=n, endpoint=True)
+    return TaskNetwork(n, duration, label[pairs // base], label[pairs % base])
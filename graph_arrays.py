@@ -0,0 +1,195 @@
+# Compact array views of networkx graphs, shared by the array-based solvers.
+# Nodes are renumbered 0..n-1 in graph.nodes() order; the list of original
+# node objects is returned alongside the arrays so results can be mapped back.
+#
+# CompactGraph holds a whole graph in a handful of flat arrays (about 30
+# bytes per edge, against several hundred for a networkx graph with its
+# per-edge attribute dicts). The solvers take it wherever they take a
+# networkx graph, and read its arrays directly instead of walking the graph.
+from itertools import chain
+
+import numpy as np
+
+from generators import EdgeArrays
+
+def index_nodes(graph):
+    nodes = list(graph.nodes())
+    return nodes, {node: i for i, node in enumerate(nodes)}
+
+def edge_arrays(graph, weight=None, default=1):
+    """Return (nodes, src, dst, data) for the edges of a networkx graph.
+
+    data is None when no weight attribute is requested. A CompactGraph hands
+    out its own arrays, without copying.
+    """
+    if isinstance(graph, CompactGraph):
+        data = None
+        if weight is not None:
+            data = graph.weight if graph.weight is not None else np.full(len(graph.src), default)
+        return graph.nodes(), graph.src, graph.dst, data
+    nodes, index = index_nodes(graph)
+    m = graph.number_of_edges()
+    pairs = np.fromiter(
+        chain.from_iterable((index[u], index[v]) for u, v in graph.edges()),
+        dtype=np.int64, count=2 * m,
+    ).reshape(m, 2)
+    data = None
+    if weight is not None:
+        # integer weights stay integers so results keep their type
+        data = np.array([d for _, _, d in graph.edges(data=weight, default=default)])
+        if data.dtype.kind not in "iuf":
+            data = data.astype(np.float64)
+    return nodes, pairs[:, 0], pairs[:, 1], data
+
+def build_csr(num_nodes, src, dst, data=None, symmetric=False, drop_loops=True):
+    """Group edges by source vertex; returns (indptr, indices, data, order).
+
+    With symmetric=True each edge is stored in both directions, which is the
+    adjacency of an undirected graph. order maps every CSR slot back to the
+    position of its edge in the input arrays.
+    """
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    edge_ids = np.arange(len(src))
+    if drop_loops:
+        keep = src != dst
+        src, dst, edge_ids = src[keep], dst[keep], edge_ids[keep]
+    if symmetric:
+        src, dst = np.concatenate((src, dst)), np.concatenate((dst, src))
+        edge_ids = np.concatenate((edge_ids, edge_ids))
+    order = np.argsort(src, kind="stable")
+    indices = dst[order]
+    edge_ids = edge_ids[order]
+    counts = np.bincount(src, minlength=num_nodes)
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    if data is not None:
+        data = np.asarray(data)[edge_ids]
+    return indptr, indices, data, edge_ids
+
+def csr_slots(indptr, rows):
+    """Concatenated CSR slot indices of the given rows (vectorized gather)."""
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    # each slot is its row start plus its rank inside the row
+    row_of_slot = np.repeat(np.arange(len(rows)), lengths)
+    first_slot = np.cumsum(lengths) - lengths
+    return starts[row_of_slot] + np.arange(total) - first_slot[row_of_slot]
+
+def _index_dtype(size):
+    return np.int32 if size < 2**31 else np.int64
+
+class CompactGraph:
+    """Read-only graph on the vertices 0..n-1, stored in flat arrays.
+
+    src and dst list the edges in input order and weight (int64 or float64,
+    or None) their weights or capacities. indptr, indices and edge_ids are
+    the adjacency by tail in CSR form, self-loops left out; an undirected
+    graph stores every edge in both directions. edge_ids maps each CSR slot
+    back to its edge. For a directed graph reverse() builds the same index
+    by head on first use. labels are the original node objects (None: the
+    vertices are their own labels).
+
+    The read methods of networkx graphs that the solvers and the figure code
+    use (nodes, edges, is_directed, number_of_nodes, number_of_edges, size)
+    are provided, so a CompactGraph goes wherever a networkx graph did.
+    """
+
+    __slots__ = ("num_nodes", "directed", "labels", "src", "dst", "weight", "indptr", "indices", "edge_ids",
+                 "_reverse")
+
+    def __init__(self, num_nodes, src, dst, weight=None, directed=False, labels=None):
+        index = _index_dtype(max(num_nodes, 2 * len(src)))
+        self.num_nodes = int(num_nodes)
+        self.directed = directed
+        self.labels = labels
+        # no copy when the arrays already have the right types
+        self.src = np.asarray(src, dtype=index)
+        self.dst = np.asarray(dst, dtype=index)
+        if weight is not None:
+            weight = np.asarray(weight)
+            if weight.dtype.kind not in "if":
+                weight = weight.astype(np.float64)
+        self.weight = weight
+        indptr, indices, _, edge_ids = build_csr(self.num_nodes, self.src, self.dst, symmetric=not directed)
+        self.indptr = indptr
+        self.indices = indices.astype(index)
+        self.edge_ids = edge_ids.astype(index)
+        self._reverse = None
+
+    @classmethod
+    def from_edge_arrays(cls, edges, directed=False, labels=None):
+        """Wrap a generators.EdgeArrays (from a generator or a loader)."""
+        return cls(edges.num_nodes, edges.src, edges.dst, edges.weight, directed, labels)
+
+    @classmethod
+    def from_networkx(cls, graph, weight="weight", default=1):
+        """Copy a networkx graph; weight=None drops the edge weights."""
+        nodes, src, dst, data = edge_arrays(graph, weight, default)
+        labels = None if nodes == list(range(len(nodes))) else nodes
+        return cls(len(nodes), src, dst, data, graph.is_directed(), labels)
+
+    def to_edge_arrays(self):
+        return EdgeArrays(self.num_nodes, self.src, self.dst, self.weight)
+
+    def to_networkx(self, attr="weight"):
+        from generators import to_networkx
+
+        return to_networkx(self.to_edge_arrays(), directed=self.directed, labels=self.labels, attr=attr)
+
+    def reverse(self):
+        """(indptr, indices, edge_ids) of the adjacency by head."""
+        if not self.directed:
+            return self.indptr, self.indices, self.edge_ids
+        if self._reverse is None:
+            indptr, indices, _, edge_ids = build_csr(self.num_nodes, self.dst, self.src)
+            self._reverse = (indptr, indices.astype(self.indices.dtype), edge_ids.astype(self.edge_ids.dtype))
+        return self._reverse
+
+    def slot_weights(self, edge_ids=None):
+        """Weight of every CSR slot (of the forward index by default)."""
+        if self.weight is None:
+            return None
+        return self.weight[self.edge_ids if edge_ids is None else edge_ids]
+
+    def degrees(self):
+        return np.diff(self.indptr)
+
+    @property
+    def nbytes(self):
+        arrays = [self.src, self.dst, self.weight, self.indptr, self.indices, self.edge_ids, *(self._reverse or ())]
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    def is_directed(self):
+        return self.directed
+
+    def number_of_nodes(self):
+        return self.num_nodes
+
+    def number_of_edges(self):
+        return len(self.src)
+
+    def size(self, weight=None):
+        if weight is None or self.weight is None:
+            return len(self.src)
+        return self.weight.sum().item()
+
+    def nodes(self):
+        return list(range(self.num_nodes)) if self.labels is None else list(self.labels[:self.num_nodes])
+
+    def edges(self):
+        if self.labels is None:
+            return zip(self.src.tolist(), self.dst.tolist())
+        labels = self.labels
+        return ((labels[u], labels[v]) for u, v in zip(self.src.tolist(), self.dst.tolist()))
+
+    def __len__(self):
+        return self.num_nodes
+
+    def __repr__(self):
+        kind = "orienté" if self.directed else "non orienté"
+        return f"CompactGraph({self.num_nodes} sommets, {len(self.src)} arêtes, {kind})"
@@ -0,0 +1,163 @@
+# Per-run stage timers and counters.
+#
+# A RunTrace follows one run of an algorithm window (or of a batch job)
+# through its stages: generation, solving, layout, figure building, canvas
+# drawing. A stage costs two perf_counter calls, so traces are always on.
+# capture() can additionally run cProfile (in the calling thread) and
+# tracemalloc (process wide) around the compute part. Finished traces are
+# appended as JSON lines to the file named by the APPRO_RUN_LOG environment
+# variable, when it is set, for offline analysis.
+import io
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+LOG_ENV = "APPRO_RUN_LOG"
+PROFILE_ROWS = 25
+
+_log_lock = threading.Lock()
+
+# tracemalloc is process wide: profiled runs share it, the first one starts
+# it (unless it was already on) and the last one stops it. The peak is only
+# reset when no other run is measuring, so with overlapping runs each peak
+# is the process peak since the first of them started.
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+def _acquire_tracing():
+    global _tracing_users, _tracing_owned
+    import tracemalloc
+
+    with _tracing_lock:
+        if _tracing_users == 0:
+            _tracing_owned = not tracemalloc.is_tracing()
+            if _tracing_owned:
+                tracemalloc.start()
+            elif hasattr(tracemalloc, "reset_peak"):
+                # Python 3.9+
+                tracemalloc.reset_peak()
+        _tracing_users += 1
+
+def _release_tracing():
+    # returns the peak traced memory, in bytes
+    global _tracing_users, _tracing_owned
+    import tracemalloc
+
+    with _tracing_lock:
+        peak = tracemalloc.get_traced_memory()[1]
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+    return peak
+
+class RunTrace:
+    """Stage timings, counters and optional profile of one run."""
+
+    def __init__(self, name, profile=False):
+        self.name = name
+        self.profile = profile
+        self.started = time.time()
+        self.stages = {}
+        self.counters = {}
+        self.info = {}
+        self.peak_bytes = None
+        self.profile_rows = None
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def count(self, name, value):
+        self.counters[name] = value
+
+    def note(self, name, value):
+        self.info[name] = value
+
+    @contextmanager
+    def capture(self):
+        """cProfile and tracemalloc around the block when profile is set."""
+        if not self.profile:
+            yield
+            return
+        import cProfile
+
+        _acquire_tracing()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self.peak_bytes = _release_tracing()
+            self.profile_rows = _profile_rows(profiler)
+
+    def total(self):
+        return sum(self.stages.values())
+
+    def summary(self):
+        """Stage timings on one line, counters and notes on the next, for display."""
+        stages = [f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.stages.items()]
+        stages.append(f"total {self.total() * 1000:.0f} ms")
+        counters = [f"{name} : {value}" for name, value in {**self.counters, **self.info}.items()]
+        if self.peak_bytes is not None:
+            counters.append(f"pic mémoire : {self.peak_bytes / 2**20:.1f} Mio")
+        return " · ".join(stages) + ("\n" + " · ".join(counters) if counters else "")
+
+    def profile_text(self):
+        if not self.profile_rows:
+            return ""
+        out = io.StringIO()
+        out.write(f"{'appels':>10} {'propre (s)':>11} {'cumulé (s)':>11}  fonction\n")
+        for row in self.profile_rows:
+            out.write(f"{row['calls']:>10} {row['tottime']:>11.4f} {row['cumtime']:>11.4f}  {row['function']}\n")
+        return out.getvalue()
+
+    def as_dict(self):
+        return {
+            "run": self.name,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "stages": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            "total": round(self.total(), 6),
+            "counters": self.counters,
+            "info": self.info,
+            "peak_bytes": self.peak_bytes,
+            "profile": self.profile_rows,
+        }
+
+def _profile_rows(profiler, limit=PROFILE_ROWS):
+    import pstats
+
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({"function": f"{os.path.basename(filename)}:{line}({function})", "calls": calls,
+                     "tottime": round(tottime, 6), "cumtime": round(cumtime, 6)})
+    rows.sort(key=lambda row: row["cumtime"], reverse=True)
+    return rows[:limit]
+
+def _default(value):
+    # numpy scalars in counters
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+def log_trace(trace, path=None):
+    """Append the trace as one JSON line to path (default: $APPRO_RUN_LOG).
+
+    Does nothing when no path is given and the variable is not set.
+    """
+    path = path or os.environ.get(LOG_ENV)
+    if not path:
+        return
+    line = json.dumps(trace.as_dict(), default=_default, ensure_ascii=False)
+    with _log_lock:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
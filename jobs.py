@@ -0,0 +1,187 @@
+# Background jobs for the interface.
+#
+# Compute stages run on a thread pool (or a process pool for picklable
+# functions) so the Tk event loop never waits on a solver. Workers never
+# touch Tk: they publish progress on their Job, and JobScheduler.poll(),
+# called from the Tk loop through widget.after, delivers progress, results
+# and errors to the callbacks on the UI thread. Cancellation is cooperative:
+# job.report() / job.check() raise JobCancelled once cancel() was called,
+# which is how the solvers' progress callbacks stop a running solve.
+import itertools
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    """Handle on one submitted computation.
+
+    The worker function receives the job as its first argument and may call
+    job.report(*values) to publish progress (only the latest values are
+    kept) and job.check() between stages.
+    """
+
+    def __init__(self, job_id, name=None, on_done=None, on_error=None, on_progress=None):
+        self.id = job_id
+        self.name = name
+        self.future = None
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.progress = None
+        self._delivered = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled(f"Calcul annulé ({self.name or self.id})")
+
+    def report(self, *values):
+        self.check()
+        self.progress = values
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+class _RemoteJob:
+    # what a process-pool worker sees of its Job: progress goes through a
+    # manager queue, cancellation through a manager event
+    def __init__(self, job_id, name, queue, event):
+        self.id = job_id
+        self.name = name
+        self._queue = queue
+        self._event = event
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise JobCancelled(f"Calcul annulé ({self.name or self.id})")
+
+    def report(self, *values):
+        self.check()
+        self._queue.put((self.id, values))
+
+def _run_remote(fn, remote, args, kwargs):
+    return fn(remote, *args, **kwargs)
+
+class JobScheduler:
+    """Runs jobs on a worker pool and hands their outcome back to the UI thread.
+
+    With processes=True, fn and its arguments must be picklable (module-level
+    functions); progress then crosses the process boundary through a
+    multiprocessing manager, started on the first submit. poll() must be
+    called regularly from the UI thread; attach() does it with widget.after.
+    """
+
+    def __init__(self, max_workers=None, processes=False):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.processes = processes
+        self._pool = None
+        self._manager = None
+        self._queue = None
+        self._jobs = {}
+        self._ids = itertools.count(1)
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            if self.processes:
+                import multiprocessing
+
+                self._manager = multiprocessing.Manager()
+                self._queue = self._manager.Queue()
+                self._pool = ProcessPoolExecutor(self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="job")
+        return self._pool
+
+    def submit(self, fn, *args, name=None, on_done=None, on_error=None, on_progress=None, **kwargs):
+        """Run fn(job, *args, **kwargs) in the pool; returns the Job.
+
+        on_done(result), on_error(exception) and on_progress(*values) are
+        called from poll(). A cancelled job ends with on_error(JobCancelled).
+        """
+        pool = self._ensure_pool()
+        job = Job(next(self._ids), name, on_done, on_error, on_progress)
+        if self.processes:
+            event = self._manager.Event()
+            job._cancel = event
+            job.future = pool.submit(_run_remote, fn, _RemoteJob(job.id, name, self._queue, event), args, kwargs)
+        else:
+            job.future = pool.submit(fn, job, *args, **kwargs)
+        self._jobs[job.id] = job
+        return job
+
+    def _drain_remote_progress(self):
+        while True:
+            try:
+                job_id, values = self._queue.get_nowait()
+            except Exception:
+                return
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.progress = values
+
+    def poll(self):
+        """Deliver pending progress and outcomes; returns the number of live jobs."""
+        if self._queue is not None:
+            self._drain_remote_progress()
+        for job_id, job in list(self._jobs.items()):
+            if job.progress is not None and job.progress is not job._delivered:
+                job._delivered = job.progress
+                if job.on_progress is not None and not job.cancelled:
+                    job.on_progress(*job.progress)
+            if not job.future.done():
+                continue
+            del self._jobs[job_id]
+            if job.future.cancelled():
+                error = JobCancelled(f"Calcul annulé ({job.name or job.id})")
+            else:
+                error = job.future.exception()
+            if error is None:
+                if job.on_done is not None:
+                    job.on_done(job.future.result())
+            elif job.on_error is not None:
+                job.on_error(error)
+        return len(self._jobs)
+
+    def attach(self, widget, interval_ms=50):
+        """Poll from the Tk loop of widget every interval_ms while it exists."""
+        def tick():
+            try:
+                self.poll()
+            finally:
+                widget.after(interval_ms, tick)
+        widget.after(interval_ms, tick)
+
+    def running(self):
+        return list(self._jobs.values())
+
+    def cancel_all(self):
+        for job in self._jobs.values():
+            job.cancel()
+
+    def shutdown(self, wait=False):
+        # cancel_all also cancels the futures still queued (shutdown's own
+        # cancel_futures needs Python 3.9)
+        self.cancel_all()
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+            self._queue = None
@@ -0,0 +1,170 @@
+# Node positions for the graph windows, computed once per graph.
+#
+# Layouts are cached under a fingerprint of the graph structure (node list
+# and edge list, weights ignored), so drawing the same graph again with other
+# highlights costs nothing. After a small edit (same nodes, most edges kept)
+# the previous positions seed a short spring layout instead of a fresh one.
+# Graphs above large_threshold vertices get a spectral layout: a few hundred
+# sparse Laplacian products by subspace iteration, O(iterations * (V + E)),
+# instead of the O(V²) per iteration of nx.spring_layout.
+import hashlib
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from graph_arrays import CompactGraph, edge_arrays
+
+# pos: {node: coordinates}; seconds: time spent (0 on a cache hit);
+# method: "cache", "spring", "warm" or "spectral"
+LayoutResult = namedtuple("LayoutResult", ["pos", "seconds", "method"])
+
+def graph_fingerprint(graph):
+    """Hash of the node list and edge list of a networkx graph."""
+    nodes, src, dst, _ = edge_arrays(graph)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(b"D" if graph.is_directed() else b"U")
+    digest.update(repr(nodes).encode())
+    digest.update(src.tobytes())
+    digest.update(dst.tobytes())
+    return digest.hexdigest()
+
+def _laplacian_product(x, src, dst, degree):
+    # L x = D x - A x, column by column, for the undirected edges (src, dst)
+    out = degree[:, None] * x
+    n = len(x)
+    for c in range(x.shape[1]):
+        out[:, c] -= np.bincount(src, x[dst, c], minlength=n) + np.bincount(dst, x[src, c], minlength=n)
+    return out
+
+def spectral_positions(num_nodes, src, dst, dim=2, iterations=300, seed=0):
+    """(num_nodes, dim) coordinates in [-1, 1] from the Laplacian eigenvectors.
+
+    The eigenvectors of the dim smallest non-zero eigenvalues are
+    approximated by subspace iteration on c I - L, with the constant vector
+    projected out. Isolated vertices are left out of the iteration and placed
+    on an outer ring.
+    """
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+    degree = (np.bincount(src, minlength=num_nodes) + np.bincount(dst, minlength=num_nodes)).astype(float)
+    rng = np.random.default_rng(seed)
+    coords = np.zeros((num_nodes, dim))
+
+    linked = np.nonzero(degree > 0)[0]
+    if len(linked) > dim + 1:
+        local = np.full(num_nodes, -1, dtype=np.int64)
+        local[linked] = np.arange(len(linked))
+        s, d, deg = local[src], local[dst], degree[linked]
+        shift = 2 * deg.max()
+        # two extra vectors speed up the convergence of the first dim ones
+        x = rng.standard_normal((len(linked), dim + 2))
+        for _ in range(iterations):
+            x -= x.mean(axis=0)
+            x = shift * x - _laplacian_product(x, s, d, deg)
+            x, _ = np.linalg.qr(x)
+        coords[linked] = x[:, :dim]
+    elif len(linked):
+        coords[linked] = rng.uniform(-1, 1, (len(linked), dim))
+
+    scale = np.abs(coords).max()
+    if scale > 0:
+        coords /= scale
+    isolated = np.nonzero(degree == 0)[0]
+    if len(isolated):
+        ring = rng.standard_normal((len(isolated), dim))
+        ring /= np.linalg.norm(ring, axis=1, keepdims=True) + 1e-12
+        coords[isolated] = 1.2 * ring
+    return coords
+
+class LayoutCache:
+    """LRU cache of node positions keyed by (graph fingerprint, dim).
+
+    Graphs with at most large_threshold vertices use nx.spring_layout; a graph
+    that shares its nodes and at least warm_overlap of its edges with the
+    previous one of the same dim is warm-started from its positions with
+    warm_iterations spring iterations. Larger graphs use spectral_positions.
+    """
+
+    def __init__(self, max_entries=32, large_threshold=500, warm_overlap=0.9, warm_iterations=15, seed=0):
+        self.max_entries = max_entries
+        self.large_threshold = large_threshold
+        self.warm_overlap = warm_overlap
+        self.warm_iterations = warm_iterations
+        self.seed = seed
+        self._layouts = OrderedDict()
+        self._previous = {}
+        # layouts may be requested from several worker threads at once
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _warm_start(self, graph, dim):
+        previous = self._previous.get(dim)
+        if previous is None:
+            return None
+        nodes, edges, pos = previous
+        if set(graph.nodes()) != nodes:
+            return None
+        current = {frozenset(e) for e in graph.edges()}
+        shared = len(current & edges)
+        if shared < self.warm_overlap * max(len(current), len(edges)):
+            return None
+        return pos
+
+    def layout(self, graph, dim=2):
+        import networkx as nx
+
+        key = (graph_fingerprint(graph), dim)
+        with self._lock:
+            pos = self._layouts.get(key)
+            if pos is not None:
+                self.hits += 1
+                self._layouts.move_to_end(key)
+                return LayoutResult(pos, 0.0, "cache")
+            self.misses += 1
+            initial = self._warm_start(graph, dim)
+
+        started = time.perf_counter()
+        if isinstance(graph, CompactGraph) and graph.number_of_nodes() <= self.large_threshold:
+            # spring_layout needs a networkx graph; small ones are cheap to convert
+            graph = graph.to_networkx()
+        if graph.number_of_nodes() > self.large_threshold:
+            nodes, src, dst, _ = edge_arrays(graph)
+            coords = spectral_positions(len(nodes), src, dst, dim, seed=self.seed)
+            pos = dict(zip(nodes, coords))
+            method = "spectral"
+        elif initial is not None:
+            pos = nx.spring_layout(graph, dim=dim, pos=initial, iterations=self.warm_iterations,
+                                   weight=None, seed=self.seed)
+            method = "warm"
+        else:
+            pos = nx.spring_layout(graph, dim=dim, weight=None, seed=self.seed)
+            method = "spring"
+        seconds = time.perf_counter() - started
+
+        with self._lock:
+            if graph.number_of_nodes() <= self.large_threshold:
+                self._previous[dim] = (set(graph.nodes()), {frozenset(e) for e in graph.edges()}, pos)
+            self._layouts[key] = pos
+            while len(self._layouts) > self.max_entries:
+                self._layouts.popitem(last=False)
+        return LayoutResult(pos, seconds, method)
+
+    def cache_info(self):
+        return {"hits": self.hits, "misses": self.misses, "layouts": len(self._layouts),
+                "max_entries": self.max_entries}
+
+    def clear_cache(self):
+        with self._lock:
+            self._layouts.clear()
+            self._previous.clear()
+
+# shared by all the windows of the interface
+LAYOUTS = LayoutCache()
+
+def graph_layout(graph, dim=2):
+    return LAYOUTS.layout(graph, dim)
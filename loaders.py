@@ -0,0 +1,275 @@
+# Instances from files: edge lists and transportation problems.
+#
+# Edge lists come as text (CSV, TSV or whitespace separated: "src dst
+# [weight]" per line, '#' / '%' comments and one header line allowed) or as
+# NumPy files: an (m, 2) or (m, 3) .npy array, or a .npz with "src", "dst"
+# and optionally "weight" and "num_nodes". They load into
+# generators.EdgeArrays, the format the array solvers and to_networkx take.
+#
+# Nothing is built per edge: .npy files are memory-mapped and their columns
+# returned as views, text files are parsed in blocks of lines straight into
+# preallocated arrays (one counting pass, then one parsing pass), and the
+# validation walks the arrays in chunks so it never allocates more than one
+# chunk of temporaries, whatever the file size.
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from generators import EdgeArrays, TaskNetwork, to_networkx
+from graph_arrays import CompactGraph
+
+# costs: (m, n) matrix; supplies: m values; demands: n values
+TransportProblem = namedtuple("TransportProblem", ["costs", "supplies", "demands"])
+
+CHUNK_ROWS = 1 << 20
+_BLOCK_BYTES = 1 << 26
+_COMMENTS = ("#", "%")
+
+def _delimiter(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return ","
+    if ext in (".tsv", ".tab"):
+        return "\t"
+    return None
+
+def _count_lines(path):
+    # upper bound on the data rows (comments and the header included)
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(_BLOCK_BYTES)
+            if not block:
+                break
+            lines += block.count(b"\n")
+            last = block[-1:]
+    return lines + (last != b"\n")
+
+def _text_blocks(path, chunk_rows):
+    # lists of at most chunk_rows lines, comments and blank lines dropped
+    with open(path, encoding="utf-8") as f:
+        lines = []
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith(_COMMENTS):
+                continue
+            lines.append(line)
+            if len(lines) == chunk_rows:
+                yield lines
+                lines = []
+        if lines:
+            yield lines
+
+def _is_header(line, delimiter):
+    try:
+        float(line.split(delimiter)[0])
+    except ValueError:
+        return True
+    return False
+
+def _field_count(path):
+    # fields on the first data line (the header counts as one)
+    for lines in _text_blocks(path, 1):
+        return len(lines[0].split(_delimiter(path)))
+    return 0
+
+def read_table(path, columns=None, chunk_rows=CHUNK_ROWS):
+    """A numeric text table as a float64 (rows, columns) array.
+
+    The table is parsed chunk_rows lines at a time into one preallocated
+    array; columns limits the parsed columns (first columns of each line).
+    """
+    delimiter = _delimiter(path)
+    out = None
+    rows = 0
+    for k, lines in enumerate(_text_blocks(path, chunk_rows)):
+        if k == 0 and _is_header(lines[0], delimiter):
+            lines = lines[1:]
+            if not lines:
+                continue
+        usecols = None if columns is None else range(columns)
+        block = np.loadtxt(lines, delimiter=delimiter, usecols=usecols, ndmin=2, dtype=np.float64)
+        if out is None:
+            out = np.empty((_count_lines(path), block.shape[1]), dtype=np.float64)
+        elif block.shape[1] != out.shape[1]:
+            raise ValueError(f"{path} : ligne {rows + 1} : {block.shape[1]} colonnes au lieu de {out.shape[1]}")
+        out[rows:rows + len(block)] = block
+        rows += len(block)
+    if out is None:
+        return np.empty((0, columns or 0), dtype=np.float64)
+    return out[:rows]
+
+def _integral(values, chunk_rows):
+    # float column -> int64 when every value is a whole number, chunk by chunk
+    out = np.empty(len(values), dtype=np.int64)
+    for start in range(0, len(values), chunk_rows):
+        block = values[start:start + chunk_rows]
+        ints = block.astype(np.int64)
+        if not np.array_equal(ints, block):
+            return None
+        out[start:start + chunk_rows] = ints
+    return out
+
+def validate_edges(src, dst, weight=None, num_nodes=None, non_negative=False, chunk_rows=CHUNK_ROWS):
+    """Check an edge list chunk by chunk; returns the number of vertices.
+
+    Vertex ids must be non-negative integers (below num_nodes when it is
+    given) and weights finite (and >= 0 with non_negative, for capacities).
+    Raises ValueError naming the first offending row.
+    """
+    top = -1
+    for start in range(0, len(src), chunk_rows):
+        for name, column in (("source", src), ("destination", dst)):
+            block = np.asarray(column[start:start + chunk_rows])
+            if block.dtype.kind == "f":
+                bad = np.nonzero(~np.isfinite(block) | (block != np.floor(block)))[0]
+                if len(bad):
+                    raise ValueError(f"Ligne {start + bad[0] + 1} : sommet {name} non entier ({block[bad[0]]})")
+            bad = np.nonzero(block < 0)[0]
+            if len(bad):
+                raise ValueError(f"Ligne {start + bad[0] + 1} : sommet {name} négatif ({block[bad[0]]})")
+            if len(block):
+                top = max(top, int(block.max()))
+        if weight is not None:
+            block = np.asarray(weight[start:start + chunk_rows])
+            bad = np.nonzero(~np.isfinite(block) | ((block < 0) if non_negative else False))[0]
+            if len(bad):
+                raise ValueError(f"Ligne {start + bad[0] + 1} : poids invalide ({block[bad[0]]})")
+    if num_nodes is None:
+        return top + 1
+    if top >= num_nodes:
+        raise ValueError(f"Sommet {top} hors de 0..{num_nodes - 1}")
+    return num_nodes
+
+def load_edge_list(path, weighted=True, num_nodes=None, non_negative=False, chunk_rows=CHUNK_ROWS):
+    """Load an edge list file as EdgeArrays.
+
+    The vertex count is the largest id + 1 unless num_nodes is given (or
+    stored in a .npz). weight is None when weighted is False or the file has
+    no third column; whole-number weights come back as int64.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        table = np.load(path, mmap_mode="r")
+        if table.ndim != 2 or table.shape[1] < 2:
+            raise ValueError(f"{path} : tableau (m, 2) ou (m, 3) attendu, reçu {table.shape}")
+        src, dst = table[:, 0], table[:, 1]
+        weight = table[:, 2] if weighted and table.shape[1] > 2 else None
+    elif ext == ".npz":
+        # zip members cannot be memory-mapped; each array is read once
+        with np.load(path) as archive:
+            src, dst = archive["src"], archive["dst"]
+            weight = archive["weight"] if weighted and "weight" in archive.files else None
+            if num_nodes is None and "num_nodes" in archive.files:
+                num_nodes = int(archive["num_nodes"])
+    else:
+        table = read_table(path, min(_field_count(path), 3 if weighted else 2), chunk_rows)
+        src, dst = table[:, 0], table[:, 1]
+        weight = table[:, 2] if weighted and table.shape[1] > 2 else None
+    if len(src) != len(dst) or (weight is not None and len(weight) != len(src)):
+        raise ValueError(f"{path} : colonnes de longueurs différentes")
+
+    num_nodes = validate_edges(src, dst, weight, num_nodes, non_negative, chunk_rows)
+    if src.dtype.kind == "f":
+        src, dst = _integral(src, chunk_rows), _integral(dst, chunk_rows)
+    if weight is not None and weight.dtype.kind == "f":
+        ints = _integral(weight, chunk_rows)
+        weight = weight if ints is None else ints
+    return EdgeArrays(num_nodes, src, dst, weight)
+
+def _load_vector(path):
+    if path.lower().endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    return read_table(path).ravel()
+
+def _load_matrix(path, chunk_rows):
+    if path.lower().endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    table = read_table(path, chunk_rows=chunk_rows)
+    # text tables are already a copy: whole-number costs become integers
+    ints = _integral(table.ravel(), chunk_rows)
+    return table if ints is None else ints.reshape(table.shape)
+
+def load_transport(costs_path, supplies_path=None, demands_path=None, chunk_rows=CHUNK_ROWS):
+    """Load a transportation problem as a TransportProblem.
+
+    Accepted layouts:
+    - one .npz with "costs", "supplies" and "demands";
+    - one table (.npy, memory-mapped, or CSV/TSV) laid out as a
+      transportation tableau: the cost matrix with the supplies in an extra
+      last column and the demands in an extra last row;
+    - a cost matrix with the supplies and demands in their own .npy or text
+      files.
+    Costs must be finite, quantities non-negative, and total supply equal to
+    total demand.
+    """
+    if costs_path.lower().endswith(".npz"):
+        with np.load(costs_path) as archive:
+            costs, supplies, demands = archive["costs"], archive["supplies"], archive["demands"]
+    elif supplies_path is None and demands_path is None:
+        tableau = _load_matrix(costs_path, chunk_rows)
+        if tableau.ndim != 2 or min(tableau.shape) < 2:
+            raise ValueError(f"{costs_path} : tableau de transport (m + 1, n + 1) attendu, reçu {tableau.shape}")
+        costs, supplies, demands = tableau[:-1, :-1], tableau[:-1, -1], tableau[-1, :-1]
+    else:
+        if supplies_path is None or demands_path is None:
+            raise ValueError("Les capacités et les demandes vont ensemble")
+        costs = _load_matrix(costs_path, chunk_rows)
+        supplies, demands = _load_vector(supplies_path), _load_vector(demands_path)
+
+    if costs.ndim != 2 or costs.shape != (len(supplies), len(demands)):
+        raise ValueError(f"Matrice de coûts {costs.shape} incompatible avec {len(supplies)} usines "
+                         f"et {len(demands)} magasins")
+    rows = max(1, chunk_rows // max(costs.shape[1], 1))
+    for start in range(0, costs.shape[0], rows):
+        block = np.asarray(costs[start:start + rows])
+        bad = np.argwhere(~np.isfinite(block))
+        if len(bad):
+            raise ValueError(f"Coût non fini en ({start + bad[0][0] + 1}, {bad[0][1] + 1})")
+    for name, values in (("capacité", supplies), ("demande", demands)):
+        bad = np.nonzero(~np.isfinite(values) | (values < 0))[0]
+        if len(bad):
+            raise ValueError(f"{name} invalide en position {bad[0] + 1} ({values[bad[0]]})")
+    if not np.isclose(np.sum(supplies), np.sum(demands)):
+        raise ValueError(f"Problème non équilibré : capacités {np.sum(supplies)}, demandes {np.sum(demands)}")
+
+    # whole-number quantities stay integers, like generate_data
+    supplies, demands = np.asarray(supplies), np.asarray(demands)
+    if supplies.dtype.kind == "f" and np.array_equal(supplies, np.floor(supplies)) \
+            and np.array_equal(demands, np.floor(demands)):
+        supplies, demands = supplies.astype(np.int64), demands.astype(np.int64)
+    return TransportProblem(costs, supplies, demands)
+
+def load_task_network(path, durations_path=None, chunk_rows=CHUNK_ROWS):
+    """Load a project as a generators.TaskNetwork.
+
+    Either a .npz with "duration", "src" and "dst", or a precedence edge
+    list (src must finish before dst starts) with the durations, one per
+    task, in durations_path. Cycles are only detected by the scheduler.
+    """
+    if path.lower().endswith(".npz"):
+        with np.load(path) as archive:
+            duration, src, dst = archive["duration"], archive["src"], archive["dst"]
+    else:
+        if durations_path is None:
+            raise ValueError("Les durées des tâches sont nécessaires avec une liste de précédences")
+        edges = load_edge_list(path, weighted=False, chunk_rows=chunk_rows)
+        src, dst, duration = edges.src, edges.dst, _load_vector(durations_path)
+    validate_edges(src, dst, num_nodes=len(duration), chunk_rows=chunk_rows)
+    bad = np.nonzero(~np.isfinite(duration) | (duration < 0))[0]
+    if len(bad):
+        raise ValueError(f"Durée invalide pour la tâche {bad[0] + 1} ({duration[bad[0]]})")
+    duration = np.asarray(duration)
+    if duration.dtype.kind == "f" and np.array_equal(duration, np.floor(duration)):
+        duration = duration.astype(np.int64)
+    return TaskNetwork(len(duration), duration, np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64))
+
+def load_graph(path, directed=False, weighted=True, non_negative=False, attr="weight"):
+    """An edge list file as a networkx graph, for the networkx-based windows."""
+    return to_networkx(load_edge_list(path, weighted, non_negative=non_negative), directed=directed, attr=attr)
+
+def load_compact_graph(path, directed=False, weighted=True, non_negative=False):
+    """An edge list file as a graph_arrays.CompactGraph (no networkx graph built)."""
+    return CompactGraph.from_edge_arrays(load_edge_list(path, weighted, non_negative=non_negative), directed)
@@ -0,0 +1,334 @@
+# Maximum flow over a CSR residual graph.
+#
+# Every edge u -> v of the network becomes two residual arcs, the forward arc
+# (residual capacity = capacity) and its reverse arc (residual capacity 0).
+# Arcs are grouped by tail in CSR order; rev[a] is the slot of the paired arc,
+# so pushing f units along a is res[a] -= f, res[rev[a]] += f. Memory is
+# O(V + E) whatever the density of the network.
+#
+# The arrays are built and stored with NumPy; the solvers copy them into
+# Python lists for their inner loops (indexing a list is several times faster
+# than indexing a NumPy array element by element) and write the residual
+# capacities back when they are done.
+from collections import deque, namedtuple
+
+import numpy as np
+
+from graph_arrays import csr_slots
+
+METHODS = ("edmonds_karp", "dinic", "push_relabel_fifo", "push_relabel_highest")
+
+# value: flow value; flow: flow on every input edge (same order as src/dst);
+# operations: augmenting paths for the path-based methods, pushes for
+# push-relabel.
+FlowResult = namedtuple("FlowResult", ["value", "flow", "operations", "network"])
+
+class ResidualGraph:
+    def __init__(self, num_nodes, src, dst, capacity):
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        capacity = np.asarray(capacity)
+        m = len(src)
+        self.num_nodes = int(num_nodes)
+        self.src, self.dst, self.capacity = src, dst, capacity
+        tails = np.concatenate((src, dst))
+        heads = np.concatenate((dst, src))
+        order = np.argsort(tails, kind="stable")
+        slot_of_arc = np.empty(2 * m, dtype=np.int64)
+        slot_of_arc[order] = np.arange(2 * m)
+        self.indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tails, minlength=self.num_nodes), out=self.indptr[1:])
+        self.head = heads[order]
+        self.rev = slot_of_arc[(order + m) % max(2 * m, 1)]
+        self.edge_slot = slot_of_arc[:m]
+        self.initial = np.concatenate((capacity, np.zeros(m, dtype=capacity.dtype)))[order]
+        self.residual = self.initial.copy()
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Network of a directed graph_arrays.CompactGraph, weights as capacities."""
+        return cls(graph.num_nodes, graph.src, graph.dst, graph.weight)
+
+    @classmethod
+    def from_dense(cls, capacity):
+        capacity = np.asarray(capacity)
+        src, dst = np.nonzero(capacity > 0)
+        return cls(len(capacity), src, dst, capacity[src, dst])
+
+    def reset(self):
+        self.residual = self.initial.copy()
+
+    def edge_flow(self):
+        slots = self.edge_slot
+        return self.initial[slots] - self.residual[slots]
+
+    def dense_flow(self):
+        # net flow matrix, flow[u][v] == -flow[v][u], as the dense solver returned
+        flow = np.zeros((self.num_nodes, self.num_nodes), dtype=self.residual.dtype)
+        np.add.at(flow, (self.src, self.dst), self.edge_flow())
+        return flow - flow.T
+
+    def reachable(self, source):
+        """Vertices reachable from source through arcs with residual capacity."""
+        seen = np.zeros(self.num_nodes, dtype=bool)
+        seen[source] = True
+        frontier = np.array([source])
+        while len(frontier):
+            slots = csr_slots(self.indptr, frontier)
+            slots = slots[self.residual[slots] > 0]
+            nxt = np.unique(self.head[slots])
+            frontier = nxt[~seen[nxt]]
+            seen[frontier] = True
+        return seen
+
+    def min_cut(self, source):
+        side = self.reachable(source)
+        cut = side[self.src] & ~side[self.dst]
+        return side, np.nonzero(cut)[0]
+
+def _bfs_levels(network, residual, source, sink):
+    level = np.full(network.num_nodes, -1, dtype=np.int64)
+    level[source] = 0
+    frontier = np.array([source])
+    depth = 0
+    # vertices deeper than the sink can not be on a shortest augmenting path
+    while len(frontier) and level[sink] < 0:
+        depth += 1
+        slots = csr_slots(network.indptr, frontier)
+        slots = slots[residual[slots] > 0]
+        nxt = np.unique(network.head[slots])
+        frontier = nxt[level[nxt] < 0]
+        level[frontier] = depth
+    return level
+
+def _edmonds_karp(network, source, sink, progress):
+    indptr = network.indptr.tolist()
+    head = network.head.tolist()
+    rev = network.rev.tolist()
+    res = network.residual.tolist()
+    n = network.num_nodes
+    total = 0
+    augmentations = 0
+    while True:
+        parent_arc = [-1] * n
+        parent_arc[source] = -2
+        queue = deque([source])
+        while queue and parent_arc[sink] == -1:
+            u = queue.popleft()
+            for a in range(indptr[u], indptr[u + 1]):
+                v = head[a]
+                if parent_arc[v] == -1 and res[a] > 0:
+                    parent_arc[v] = a
+                    queue.append(v)
+        if parent_arc[sink] == -1:
+            break
+        path = []
+        v = sink
+        while v != source:
+            a = parent_arc[v]
+            path.append(a)
+            v = head[rev[a]]
+        f = min(res[a] for a in path)
+        for a in path:
+            res[a] -= f
+            res[rev[a]] += f
+        total += f
+        augmentations += 1
+        if progress is not None:
+            progress(augmentations, total)
+    network.residual = np.asarray(res, dtype=network.residual.dtype)
+    return total, augmentations
+
+def _dinic(network, source, sink, progress):
+    indptr = network.indptr.tolist()
+    head = network.head.tolist()
+    rev = network.rev.tolist()
+    total = 0
+    augmentations = 0
+    while True:
+        level = _bfs_levels(network, network.residual, source, sink)
+        if level[sink] < 0:
+            break
+        level = level.tolist()
+        res = network.residual.tolist()
+        current = indptr[:-1]
+        path = []
+        u = source
+        # blocking flow: advance along level-increasing arcs with the
+        # current-arc pointers, augment at the sink, retreat on dead ends
+        while True:
+            if u == sink:
+                f = min(res[a] for a in path)
+                for a in path:
+                    res[a] -= f
+                    res[rev[a]] += f
+                total += f
+                augmentations += 1
+                k = next(i for i, a in enumerate(path) if res[a] == 0)
+                del path[k:]
+                u = source if k == 0 else head[path[k - 1]]
+                continue
+            end = indptr[u + 1]
+            a = current[u]
+            next_level = level[u] + 1
+            while a < end and (res[a] <= 0 or level[head[a]] != next_level):
+                a += 1
+            current[u] = a
+            if a < end:
+                path.append(a)
+                u = head[a]
+                continue
+            if not path:
+                break
+            level[u] = -1
+            a = path.pop()
+            u = head[rev[a]]
+            current[u] += 1
+        network.residual = np.asarray(res, dtype=network.residual.dtype)
+        if progress is not None:
+            progress(augmentations, total)
+    return total, augmentations
+
+def _global_relabel(indptr, head, rev, res, source, sink, n):
+    # exact distance labels: distance to the sink, or n + distance to the
+    # source for vertices that can only send their excess back
+    height = [2 * n] * n
+    for root, base in ((sink, 0), (source, n)):
+        height[root] = base
+        queue = deque([root])
+        while queue:
+            u = queue.popleft()
+            for a in range(indptr[u], indptr[u + 1]):
+                v = head[a]
+                if height[v] == 2 * n and res[rev[a]] > 0 and v != source and v != sink:
+                    height[v] = height[u] + 1
+                    queue.append(v)
+    return height
+
+def _push_relabel(network, source, sink, highest, progress):
+    indptr = network.indptr.tolist()
+    head = network.head.tolist()
+    rev = network.rev.tolist()
+    res = network.residual.tolist()
+    n = network.num_nodes
+    excess = [0] * n
+    for a in range(indptr[source], indptr[source + 1]):
+        f = res[a]
+        if f > 0:
+            res[a] = 0
+            res[rev[a]] += f
+            excess[head[a]] += f
+            excess[source] -= f
+
+    # relabel work after which the heights are recomputed from scratch
+    update_every = 6 * n + len(head) // 2
+    work = update_every
+
+    pushes = 0
+    discharges = 0
+    while True:
+        if work >= update_every:
+            # global relabel: exact distance labels and a fresh active set
+            work = 0
+            height = _global_relabel(indptr, head, rev, res, source, sink, n)
+            count = [0] * (2 * n + 1)
+            for h in height:
+                count[h] += 1
+            current = indptr[:-1]
+            active = [excess[v] > 0 and v != source and v != sink and height[v] < 2 * n for v in range(n)]
+            if highest:
+                buckets = [[] for _ in range(2 * n + 1)]
+                top = 0
+                for v in range(n):
+                    if active[v]:
+                        buckets[height[v]].append(v)
+                        top = max(top, height[v])
+            else:
+                queue = deque(v for v in range(n) if active[v])
+        if highest:
+            while top > 0 and not buckets[top]:
+                top -= 1
+            if not buckets[top]:
+                break
+            u = buckets[top].pop()
+            if height[u] != top:
+                # moved up by a gap relabel since it was queued
+                buckets[height[u]].append(u)
+                top = max(top, height[u])
+                continue
+        else:
+            if not queue:
+                break
+            u = queue.popleft()
+        active[u] = False
+
+        # discharge u
+        while excess[u] > 0:
+            a = current[u]
+            if a == indptr[u + 1]:
+                old = height[u]
+                new = 2 * n
+                for b in range(indptr[u], indptr[u + 1]):
+                    if res[b] > 0 and height[head[b]] + 1 < new:
+                        new = height[head[b]] + 1
+                work += 12 + indptr[u + 1] - indptr[u]
+                count[old] -= 1
+                height[u] = new
+                count[new] += 1
+                current[u] = indptr[u]
+                if count[old] == 0 and old < n:
+                    # gap: nothing left at this height, so every vertex above
+                    # it (and below n) is cut off from the sink
+                    for v in range(n):
+                        if old < height[v] < n:
+                            count[height[v]] -= 1
+                            height[v] = n + 1
+                            count[n + 1] += 1
+                if new >= 2 * n or work >= update_every:
+                    # u keeps its excess; the global update re-queues it
+                    break
+                continue
+            v = head[a]
+            if res[a] > 0 and height[u] == height[v] + 1:
+                f = min(excess[u], res[a])
+                res[a] -= f
+                res[rev[a]] += f
+                excess[u] -= f
+                excess[v] += f
+                pushes += 1
+                if not active[v] and v != source and v != sink:
+                    active[v] = True
+                    if highest:
+                        buckets[height[v]].append(v)
+                        top = max(top, height[v])
+                    else:
+                        queue.append(v)
+                if res[a] == 0:
+                    current[u] = a + 1
+            else:
+                current[u] = a + 1
+        discharges += 1
+        if progress is not None and discharges % 1024 == 0:
+            progress(pushes, excess[sink])
+
+    network.residual = np.asarray(res, dtype=network.residual.dtype)
+    return excess[sink], pushes
+
+def max_flow(network, source, sink, method="dinic", progress=None):
+    """Maximum flow from source to sink; returns a FlowResult.
+
+    progress, when given, is called as progress(operations, flow_so_far) while
+    the solver runs; raising from it aborts the computation.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue : {method!r} (attendu : {', '.join(METHODS)})")
+    if source == sink:
+        raise ValueError("La source et le puits doivent être distincts")
+    network.reset()
+    if method == "edmonds_karp":
+        value, operations = _edmonds_karp(network, source, sink, progress)
+    elif method == "dinic":
+        value, operations = _dinic(network, source, sink, progress)
+    else:
+        value, operations = _push_relabel(network, source, sink, method == "push_relabel_highest", progress)
+    return FlowResult(value, network.edge_flow(), operations, network)
@@ -0,0 +1,156 @@
+# Minimum spanning forests on edge arrays.
+#
+# Kruskal sorts the weights once with a stable NumPy argsort and scans them
+# with an iterative union-find (path halving, union by size) over integer
+# lists, so long chains no longer hit the recursion limit. Borůvka works on
+# whole edge arrays per round: every component picks its cheapest outgoing
+# edge, the components are merged by pointer jumping, and the number of
+# components at least halves each round. Its per-round minimum search can be
+# split across worker processes.
+#
+# Ties are broken by edge position (the stable sort rank), which makes the
+# forest unique: both algorithms return the same edges, and the same ones the
+# previous sorted(graph.edges(data=True)) implementation picked.
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from graph_arrays import CompactGraph, edge_arrays
+
+ALGORITHMS = ("kruskal", "boruvka")
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return True
+
+def kruskal_arrays(num_nodes, src, dst, weight):
+    """Indices of the spanning-forest edges, in the order Kruskal adds them."""
+    order = np.argsort(weight, kind="stable")
+    src = np.asarray(src)[order].tolist()
+    dst = np.asarray(dst)[order].tolist()
+    order = order.tolist()
+    sets = UnionFind(num_nodes)
+    chosen = []
+    target = num_nodes - 1
+    for k in range(len(order)):
+        if sets.union(src[k], dst[k]):
+            chosen.append(order[k])
+            if len(chosen) == target:
+                break
+    return np.array(chosen, dtype=np.int64)
+
+def _cheapest(num_comps, cu, cv, rank):
+    # lowest rank among the edges touching each component (-1: none)
+    best = np.full(num_comps, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(best, cu, rank)
+    np.minimum.at(best, cv, rank)
+    best[best == np.iinfo(np.int64).max] = -1
+    return best
+
+def _cheapest_parallel(pool, workers, num_comps, cu, cv, rank):
+    chunks = np.array_split(np.arange(len(rank)), workers)
+    parts = pool.map(_cheapest, [num_comps] * workers, [cu[c] for c in chunks],
+                     [cv[c] for c in chunks], [rank[c] for c in chunks])
+    best = np.full(num_comps, -1, dtype=np.int64)
+    for part in parts:
+        take = (part >= 0) & ((best < 0) | (part < best))
+        best[take] = part[take]
+    return best
+
+def boruvka_arrays(num_nodes, src, dst, weight, workers=1, parallel_threshold=1_000_000):
+    """Indices of the spanning-forest edges, found by Borůvka rounds.
+
+    With workers > 1, rounds with at least parallel_threshold live edges
+    search the cheapest edges in that many processes (None: one per core).
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    order = np.argsort(weight, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+
+    comp = np.arange(num_nodes)
+    live = np.nonzero(src != dst)[0]
+    chosen = []
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        while len(live):
+            cu, cv = comp[src[live]], comp[dst[live]]
+            keep = cu != cv
+            live, cu, cv = live[keep], cu[keep], cv[keep]
+            if not len(live):
+                break
+            if pool is not None and len(live) >= parallel_threshold:
+                best = _cheapest_parallel(pool, workers, num_nodes, cu, cv, rank[live])
+            else:
+                best = _cheapest(num_nodes, cu, cv, rank[live])
+            has_edge = np.nonzero(best >= 0)[0]
+            picked = order[best[has_edge]]
+            chosen.append(np.unique(picked))
+            # each component points at the component across its cheapest
+            # edge; two components picking the same edge form a 2-cycle that
+            # is broken by keeping the smaller label as root
+            a, b = comp[src[picked]], comp[dst[picked]]
+            pointer = np.arange(num_nodes)
+            pointer[has_edge] = np.where(a == has_edge, b, a)
+            mutual = pointer[pointer] == np.arange(num_nodes)
+            roots = mutual & (np.arange(num_nodes) < pointer)
+            pointer[roots] = np.nonzero(roots)[0]
+            while True:
+                jumped = pointer[pointer]
+                if np.array_equal(jumped, pointer):
+                    break
+                pointer = jumped
+            comp = pointer[comp]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if not chosen:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(chosen)
+
+def minimum_spanning_forest(graph, algorithm="kruskal", weight="weight", workers=1):
+    """Minimum spanning forest of a networkx graph, as a new nx.Graph.
+
+    A CompactGraph gives a CompactGraph (same labels) without going through
+    networkx.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algorithme inconnu : {algorithm!r} (attendu : {', '.join(ALGORITHMS)})")
+    nodes, src, dst, data = edge_arrays(graph, weight)
+    if algorithm == "kruskal":
+        chosen = kruskal_arrays(len(nodes), src, dst, data)
+    else:
+        chosen = boruvka_arrays(len(nodes), src, dst, data, workers)
+    if isinstance(graph, CompactGraph):
+        return CompactGraph(graph.num_nodes, src[chosen], dst[chosen], data[chosen], labels=graph.labels)
+    import networkx as nx
+
+    mst = nx.Graph()
+    mst.add_nodes_from(nodes)
+    mst.add_weighted_edges_from(
+        ((nodes[u], nodes[v], w) for u, v, w in zip(src[chosen].tolist(), dst[chosen].tolist(), data[chosen].tolist())),
+        weight=weight,
+    )
+    return mst
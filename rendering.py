@@ -0,0 +1,388 @@
+# Figure builders for the result windows.
+#
+# These functions only build matplotlib figures (matplotlib.figure.Figure,
+# not pyplot, so nothing touches global figure state); embedding them in a Tk
+# window is left to the interface (see figures.py). Every builder takes an
+# optional figure to draw into, so a window can reuse its figure from one run
+# to the next. render_to_file draws a figure offscreen with Agg, for batch
+# workers without a display. matplotlib is imported lazily.
+import numpy as np
+
+# above this many edges the 3D view draws every highlighted edge but only a
+# sample of the others
+DEFAULT_LOD_EDGES = 2000
+
+HIGHLIGHT_COLOR = "red"
+EDGE_COLOR = "gray"
+GANTT_COLOR = "tab:blue"
+
+def _edge_key(u, v, directed):
+    return (u, v) if directed else frozenset((u, v))
+
+def highlighted_edges(graph, path=None, mst_edges=None, bellman_ford_paths=None):
+    """Set of edge keys drawn in the highlight color, computed once.
+
+    An edge is highlighted when it is an MST edge, when both its ends lie on
+    path, or when it joins two consecutive vertices of one of the
+    bellman_ford_paths. Keys are (u, v) for digraphs and frozenset({u, v})
+    otherwise.
+    """
+    directed = graph.is_directed()
+    keys = set()
+    if mst_edges:
+        keys.update(_edge_key(u, v, directed) for u, v in mst_edges)
+    if bellman_ford_paths:
+        for p in bellman_ford_paths.values():
+            keys.update(_edge_key(u, v, directed) for u, v in zip(p, p[1:]))
+    if path:
+        on_path = set(path)
+        keys.update(_edge_key(u, v, directed) for u, v in graph.edges() if u in on_path and v in on_path)
+    return keys
+
+def _segments(pos, edges):
+    if not edges:
+        return np.empty((0, 2, 3))
+    starts = np.array([pos[u] for u, _ in edges], dtype=float)
+    ends = np.array([pos[v] for _, v in edges], dtype=float)
+    return np.stack((starts, ends), axis=1)
+
+def graph_figure_3d(graph, title, path=None, mst_edges=None, bellman_ford_paths=None,
+                    pos=None, lod_threshold=DEFAULT_LOD_EDGES, figure=None):
+    """3D drawing of graph with one Line3DCollection per edge color.
+
+    pos maps nodes to 3D coordinates (taken from the shared layout cache
+    when it is missing). When the graph has more than lod_threshold edges, only
+    lod_threshold of the plain edges are drawn (a fixed random sample);
+    highlighted edges are always drawn. lod_threshold=None draws everything.
+    """
+    from matplotlib.figure import Figure
+    from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+    if pos is None:
+        from layout import graph_layout
+        pos = graph_layout(graph, dim=3).pos
+
+    fig = figure if figure is not None else Figure(figsize=(8, 8))
+    ax = fig.add_subplot(111, projection='3d')
+
+    nodes = list(graph.nodes())
+    coords = np.array([pos[node] for node in nodes], dtype=float).reshape(-1, 3)
+    if path:
+        on_path = set(path)
+        node_colors = ['green' if node in on_path else 'lightblue' for node in nodes]
+    else:
+        node_colors = 'lightblue'
+    node_size = 700 if len(nodes) <= 200 else max(10, 140000 // len(nodes))
+    ax.scatter(coords[:, 0], coords[:, 1], coords[:, 2], s=node_size, c=node_colors, marker='o')
+
+    directed = graph.is_directed()
+    keys = highlighted_edges(graph, path, mst_edges, bellman_ford_paths)
+    highlighted, plain = [], []
+    for u, v in graph.edges():
+        (highlighted if _edge_key(u, v, directed) in keys else plain).append((u, v))
+
+    total = len(highlighted) + len(plain)
+    if lod_threshold is not None and len(plain) > lod_threshold:
+        keep = np.sort(np.random.default_rng(0).choice(len(plain), lod_threshold, replace=False))
+        plain = [plain[k] for k in keep.tolist()]
+        title = f"{title} ({len(plain) + len(highlighted)}/{total} arêtes affichées)"
+
+    # empty collections are skipped: recent matplotlib cannot autoscale on them
+    if plain:
+        ax.add_collection3d(Line3DCollection(_segments(pos, plain), colors=EDGE_COLOR, linewidths=1))
+    if highlighted:
+        ax.add_collection3d(Line3DCollection(_segments(pos, highlighted), colors=HIGHLIGHT_COLOR, linewidths=1))
+    if path and len(path) > 1:
+        ax.add_collection3d(Line3DCollection(_segments(pos, list(zip(path, path[1:]))),
+                                             colors=HIGHLIGHT_COLOR, linewidths=2))
+    if len(coords):
+        ax.auto_scale_xyz(coords[:, 0], coords[:, 1], coords[:, 2])
+
+    ax.set_title(title)
+    return fig
+
+class GanttChart:
+    """Gantt bars of many tasks drawn through two PolyCollections.
+
+    Row k is the bar [start[k], start[k] + duration[k]]. Only the bars that
+    fall inside the current view are handed to the collections, one every
+    step rows when more than max_bars are visible; the view is refreshed
+    from the xlim/ylim callbacks, so panning and zooming only rebuild the
+    vertices of the visible rows. Critical rows are drawn by a second
+    collection on top, every one in view whatever the decimation; once
+    connect(canvas) was called, toggling it with set_critical_visible
+    blits that collection alone instead of redrawing the figure. names(row)
+    gives the tick label of a row; matplotlib's locator keeps at most
+    max_labels of them.
+    """
+
+    def __init__(self, ax, start, duration, critical=None, names=None, max_bars=4000, max_labels=40):
+        from matplotlib.collections import PolyCollection
+        from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+        self.ax = ax
+        self.start = np.asarray(start, dtype=float)
+        self.end = self.start + np.asarray(duration, dtype=float)
+        self.num_rows = len(self.start)
+        self.critical = np.zeros(self.num_rows, dtype=bool) if critical is None else np.asarray(critical, dtype=bool)
+        self.max_bars = max_bars
+        self.names = names if names is not None else (lambda row: str(row + 1))
+        self.step = 1
+        self.canvas = None
+        self._background = None
+
+        self.bars = PolyCollection([], facecolors=GANTT_COLOR, edgecolors="none")
+        self.highlight = PolyCollection([], facecolors=HIGHLIGHT_COLOR, edgecolors="none")
+        ax.add_collection(self.bars)
+        ax.add_collection(self.highlight)
+
+        ax.yaxis.set_major_locator(MaxNLocator(nbins=max_labels, integer=True))
+        ax.yaxis.set_major_formatter(FuncFormatter(self._row_label))
+        ax.set_xlim(0, max(float(self.end.max()) if self.num_rows else 0.0, 1.0) * 1.02)
+        ax.set_ylim(max(self.num_rows, 1) - 0.5, -0.5)
+        ax.callbacks.connect("xlim_changed", self._on_limits)
+        ax.callbacks.connect("ylim_changed", self._on_limits)
+        self.update()
+
+    def _row_label(self, y, pos=None):
+        row = int(round(y))
+        if abs(y - row) > 1e-6 or not 0 <= row < self.num_rows:
+            return ""
+        return self.names(row)
+
+    def _verts(self, rows):
+        y0, y1 = rows - 0.4, rows + 0.4
+        x0, x1 = self.start[rows], self.end[rows]
+        return np.stack((np.column_stack((x0, y0)), np.column_stack((x0, y1)),
+                         np.column_stack((x1, y1)), np.column_stack((x1, y0))), axis=1)
+
+    def rows_in_view(self):
+        """Rows whose bar meets the current view, before decimation."""
+        y_lo, y_hi = sorted(self.ax.get_ylim())
+        first = max(0, int(np.ceil(y_lo - 0.4)))
+        last = min(self.num_rows - 1, int(np.floor(y_hi + 0.4)))
+        rows = np.arange(first, last + 1)
+        x_lo, x_hi = sorted(self.ax.get_xlim())
+        return rows[(self.start[rows] <= x_hi) & (self.end[rows] >= x_lo)]
+
+    def visible_rows(self, rows=None):
+        """Rows drawn in the current view, after decimation."""
+        rows = self.rows_in_view() if rows is None else rows
+        self.step = max(1, -(-len(rows) // self.max_bars))
+        return rows[::self.step]
+
+    def update(self):
+        rows = self.rows_in_view()
+        self.bars.set_verts(self._verts(self.visible_rows(rows)))
+        # critical rows are taken before decimation: the path stays complete
+        # at every zoom level
+        self.highlight.set_verts(self._verts(rows[self.critical[rows]]))
+
+    def _on_limits(self, ax):
+        self.update()
+
+    def connect(self, canvas):
+        # the highlight is then drawn by blitting, over a saved background;
+        # returns the callback id, for mpl_disconnect
+        self.canvas = canvas
+        self.highlight.set_animated(True)
+        return canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._blit_highlight()
+
+    def _blit_highlight(self):
+        if self._background is None:
+            return
+        self.canvas.restore_region(self._background)
+        if self.highlight.get_visible():
+            self.ax.draw_artist(self.highlight)
+        self.canvas.blit(self.ax.bbox)
+
+    def set_critical_visible(self, visible):
+        self.highlight.set_visible(visible)
+        if self.canvas is not None:
+            self._blit_highlight()
+
+def gantt_figure(start, duration, critical=None, names=None, title="Diagramme de Gantt des tâches",
+                 figure=None, **kwargs):
+    """Figure with a GanttChart; returns (figure, chart)."""
+    from matplotlib.figure import Figure
+
+    fig = figure if figure is not None else Figure(figsize=(10, 6))
+    ax = fig.add_subplot(111)
+    chart = GanttChart(ax, start, duration, critical, names, **kwargs)
+    ax.set_xlabel('Jours')
+    ax.set_title(title)
+    return fig, chart
+
+# Views of a transportation allocation (factories in rows, stores in columns)
+ALLOCATION_VIEWS = ("auto", "heatmap", "raster", "scatter")
+
+def _index_axis(axis, prefix, size, max_labels):
+    from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+    axis.set_major_locator(MaxNLocator(nbins=max_labels, integer=True))
+    axis.set_major_formatter(FuncFormatter(
+        lambda x, pos: f"{prefix}{int(round(x)) + 1}" if abs(x - round(x)) < 1e-6 and 0 <= round(x) < size else ""))
+
+def _block_sums(matrix, fy, fx):
+    rows = np.add.reduceat(matrix, np.arange(0, matrix.shape[0], fy), axis=0)
+    return np.add.reduceat(rows, np.arange(0, matrix.shape[1], fx), axis=1)
+
+def allocation_figure(allocation, view="auto", raster_threshold=200, max_annotations=400,
+                      title="Allocation optimisée", figure=None):
+    """Figure of an m x n allocation.
+
+    heatmap: one pixel per cell, with the quantities written on the non-zero
+    cells when there are at most max_annotations of them; raster: cells
+    summed over blocks so that at most raster_threshold blocks remain per
+    side; scatter: one marker per non-zero cell, sized by quantity. auto
+    picks heatmap up to raster_threshold rows and columns, raster above.
+    """
+    from matplotlib.figure import Figure
+
+    if view not in ALLOCATION_VIEWS:
+        raise ValueError(f"Affichage inconnu : {view!r} (attendu : {', '.join(ALLOCATION_VIEWS)})")
+    allocation = np.asarray(allocation)
+    m, n = allocation.shape
+    if view == "auto":
+        view = "heatmap" if max(m, n) <= raster_threshold else "raster"
+
+    fig = figure if figure is not None else Figure(figsize=(10, 6))
+    ax = fig.add_subplot(111)
+    rows, cols = np.nonzero(allocation)
+    values = allocation[rows, cols]
+    extent = (-0.5, n - 0.5, m - 0.5, -0.5)
+
+    if view == "scatter":
+        largest = float(values.max()) if len(values) else 1.0
+        # markers shrink with the grid so they stay inside their cells
+        scale = min(1.0, 60 / max(m, n))
+        points = ax.scatter(cols, rows, s=scale * (10 + 190 * values / largest), c=values, cmap='YlOrRd',
+                            edgecolors='gray', linewidths=0.5 * scale)
+        ax.set_xlim(extent[0], extent[1])
+        ax.set_ylim(extent[2], extent[3])
+        fig.colorbar(points, ax=ax, label="Quantité")
+    elif view == "raster":
+        fy, fx = -(-m // raster_threshold), -(-n // raster_threshold)
+        image = ax.imshow(_block_sums(allocation, fy, fx), cmap='YlOrRd', extent=extent, aspect='auto',
+                          interpolation='nearest')
+        fig.colorbar(image, ax=ax, label="Quantité")
+        title = f"{title} (sommes par blocs de {fy}×{fx} cases)"
+    else:
+        image = ax.imshow(allocation, cmap='YlOrRd', aspect='auto', interpolation='nearest')
+        fig.colorbar(image, ax=ax, label="Quantité")
+        if len(values) <= max_annotations:
+            for i, j, q in zip(rows.tolist(), cols.tolist(), values.tolist()):
+                ax.text(j, i, q, ha="center", va="center", color="black", fontsize=8)
+
+    _index_axis(ax.xaxis, "M", n, 20)
+    _index_axis(ax.yaxis, "U", m, 25)
+    for label in ax.get_xticklabels():
+        label.set(rotation=45, ha="right", rotation_mode="anchor")
+    ax.set_title(title)
+    return fig
+
+def flow_figure(edges, pos, flow, title="Réseau de flot avec flots/capacités", max_labels=300, figure=None):
+    """Flow network drawn as arrows labelled flow/capacity.
+
+    edges is the generators.EdgeArrays of the network (weights are the
+    capacities) and pos maps its vertices to 2D coordinates. Arcs that carry
+    flow are drawn in the highlight color; labels are only written up to
+    max_labels arcs.
+    """
+    from matplotlib.figure import Figure
+
+    fig = figure if figure is not None else Figure(figsize=(10, 8))
+    ax = fig.add_subplot(111)
+    coords = np.array([pos[v] for v in range(edges.num_nodes)], dtype=float).reshape(-1, 2)
+    src, dst = np.asarray(edges.src), np.asarray(edges.dst)
+    flow = np.asarray(flow)
+    tail, head = coords[src], coords[dst]
+    colors = np.where(flow > 0, HIGHLIGHT_COLOR, EDGE_COLOR)
+    # arrows stop short of the head vertex so their tips stay visible
+    ax.quiver(tail[:, 0], tail[:, 1], 0.85 * (head[:, 0] - tail[:, 0]), 0.85 * (head[:, 1] - tail[:, 1]),
+              color=colors, angles="xy", scale_units="xy", scale=1, width=0.002, headwidth=6)
+    node_size = 500 if edges.num_nodes <= 100 else max(10, 50000 // edges.num_nodes)
+    ax.scatter(coords[:, 0], coords[:, 1], s=node_size, c="lightblue", edgecolors="gray", zorder=2)
+    if edges.num_nodes <= 100:
+        for v, (x, y) in enumerate(coords.tolist()):
+            ax.text(x, y, str(v), ha="center", va="center", fontsize=10, fontweight="bold", zorder=3)
+    if len(src) <= max_labels:
+        middle = (tail + head) / 2
+        for (x, y), f, c in zip(middle.tolist(), flow.tolist(), np.asarray(edges.weight).tolist()):
+            ax.text(x, y, f"{f}/{c}", ha="center", va="center", fontsize=8,
+                    bbox={"boxstyle": "round,pad=0.1", "facecolor": "white", "edgecolor": "none", "alpha": 0.8})
+    ax.set_axis_off()
+    ax.set_title(title)
+    return fig
+
+SWEEP_LABELS = {"colors": "Nombre chromatique", "weight": "Poids de l'arbre couvrant", "max_flow": "Flot maximal"}
+
+def sweep_figure(results, title="Balayage Monte-Carlo", figure=None):
+    """Curves of a Monte-Carlo sweep (sweep.run_sweep) against the size.
+
+    One curve per (probability, capacity) pair: the mean with a ± one
+    standard deviation band, the median, and the 10-90 % quantile range
+    dashed. A second axis shows the mean solve time.
+    """
+    from matplotlib.figure import Figure
+
+    fig = figure if figure is not None else Figure(figsize=(11, 5))
+    ax, timing = fig.subplots(1, 2, gridspec_kw={"width_ratios": (2, 1)})
+    curves = {}
+    for point in results:
+        capacity = point["params"].get("max_capacity")
+        curves.setdefault((point["probability"], capacity), []).append(point)
+    metric = results[0]["metric"] if results else ""
+    for (probability, capacity), points in curves.items():
+        points = sorted(points, key=lambda point: point["size"])
+        sizes = np.array([point["size"] for point in points])
+        # a point whose samples all failed has None statistics: a gap in the curve
+        stats = {key: np.array([point["values"][key] for point in points], dtype=float)
+                 for key in ("mean", "std", "q10", "q50", "q90")}
+        parts = []
+        if probability is not None:
+            parts.append(f"p = {probability:g}")
+        if capacity is not None:
+            parts.append(f"cap. max = {capacity}")
+        label = ", ".join(parts) or metric
+        line, = ax.plot(sizes, stats["mean"], marker="o", label=label)
+        color = line.get_color()
+        ax.fill_between(sizes, stats["mean"] - stats["std"], stats["mean"] + stats["std"], color=color, alpha=0.2)
+        ax.plot(sizes, stats["q50"], color=color, marker="x", linestyle="none")
+        ax.plot(sizes, stats["q10"], color=color, linestyle="--", linewidth=0.8)
+        ax.plot(sizes, stats["q90"], color=color, linestyle="--", linewidth=0.8)
+        seconds = np.array([point["seconds"]["mean"] for point in points], dtype=float) * 1000
+        timing.plot(sizes, seconds, marker="o", color=color)
+    ax.set_xlabel("Nombre de sommets")
+    ax.set_ylabel(SWEEP_LABELS.get(metric, metric))
+    ax.set_title(f"{title} (moyenne ± écart type, × médiane, -- déciles 1 et 9)", fontsize="medium")
+    if curves:
+        ax.legend(fontsize="small")
+    timing.set_xlabel("Nombre de sommets")
+    timing.set_ylabel("Temps moyen de résolution (ms)")
+    fig.tight_layout()
+    return fig
+
+def render_to_file(build, path, figsize=(10, 8), dpi=100):
+    """Draw build(figure) offscreen with Agg and save it to path.
+
+    The format follows the extension (png, svg, pdf...). Nothing is left
+    behind: the figure is cleared once written. Interactive helpers such as
+    GanttChart.connect must not be used here, savefig skips animated
+    artists.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    try:
+        build(fig)
+        fig.savefig(path)
+    finally:
+        fig.clear()
+    return path
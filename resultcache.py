@@ -0,0 +1,211 @@
+# Content-addressed on-disk cache of solved instances.
+#
+# An entry is keyed by a blake2b digest of (algorithm, parameters, seed or
+# input file digest, code version), so the same run always finds its
+# previous result and any change to the solver code invalidates everything
+# at once. Values are pickled, one file per entry, written to a temporary
+# file and renamed into place so that concurrent batch workers and the GUI
+# can share a directory. The directory is bounded in bytes: past
+# max_bytes, the least recently used entries (by file mtime, refreshed on
+# every hit) are deleted.
+#
+# Only reproducible runs are cached: the batch runner's jobs all have a seed
+# or an input file, while the windows cache a run only when a seed was typed
+# or a file loaded. A window run on a seed drawn at random skips the cache.
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+
+CACHE_DIR_ENV = "APPRO_CACHE_DIR"
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+# modules whose source goes into the code version: the solvers, and appro
+# and batch, which build the cached values (result tuples and records)
+CODE_MODULES = (
+    "algorithms", "appro", "batch", "coloring", "generators", "graph_arrays", "layout", "loaders", "maxflow",
+    "mst", "scheduling", "shortest_paths", "transport",
+)
+
+_code_version = None
+_digests = {}
+_digests_lock = threading.Lock()
+
+def code_version():
+    """Digest of the solver sources, computed once per process."""
+    global _code_version
+    if _code_version is None:
+        h = hashlib.blake2b(digest_size=16)
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in CODE_MODULES:
+            with open(os.path.join(here, name + ".py"), "rb") as f:
+                h.update(f.read())
+        _code_version = h.hexdigest()
+    return _code_version
+
+def file_digest(path, block=1 << 20):
+    """blake2b digest of a file's content, memoized on (path, size, mtime)."""
+    st = os.stat(path)
+    memo = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    with _digests_lock:
+        if memo in _digests:
+            return _digests[memo]
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block), b""):
+            h.update(chunk)
+    with _digests_lock:
+        _digests[memo] = h.hexdigest()
+    return _digests[memo]
+
+def _input_digest(inputs):
+    # a path, or a dict / list of paths (transport and task loaders)
+    if isinstance(inputs, dict):
+        return {name: _input_digest(value) for name, value in inputs.items()}
+    if isinstance(inputs, (list, tuple)):
+        return [_input_digest(value) for value in inputs]
+    return file_digest(inputs)
+
+def result_key(algorithm, params, seed=None, inputs=None):
+    """Cache key of a run, or None when it is not reproducible (no seed, no input)."""
+    if seed is None and inputs is None:
+        return None
+    payload = {
+        "algorithm": algorithm,
+        "params": params,
+        "seed": seed,
+        "inputs": None if inputs is None else _input_digest(inputs),
+        "code": code_version(),
+    }
+    text = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=20).hexdigest()
+
+class ResultCache:
+    """Size-bounded LRU store of pickled results in a directory."""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, max_bytes=DEFAULT_MAX_BYTES):
+        """Cache in $APPRO_CACHE_DIR, else in the user cache directory."""
+        directory = os.environ.get(CACHE_DIR_ENV)
+        if not directory:
+            base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+            directory = os.path.join(base, "appro")
+        return cls(directory, max_bytes)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".pkl")
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for sub in os.scandir(self.directory):
+            if sub.is_dir():
+                for entry in os.scandir(sub.path):
+                    if entry.name.endswith(".pkl"):
+                        st = entry.stat()
+                        entries.append((st.st_mtime_ns, st.st_size, entry.path))
+        return entries
+
+    def get(self, key):
+        """The cached value, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store value; values larger than the whole cache are not kept."""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return False
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+        return True
+
+    def _evict(self):
+        # rescan: other processes share the directory
+        entries = sorted(self._entries())
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+            self.evictions += 1
+
+    def lookup_or_run(self, trace, key, compute):
+        """compute() through the cache, recording the outcome on trace.
+
+        The counters compute() leaves on trace are stored with the value and
+        restored on a hit. key None runs compute() without caching.
+        """
+        if key is None:
+            return compute()
+        with trace.stage("cache"):
+            hit = self.get(key)
+        if hit is not None:
+            value, counters = hit
+            trace.counters.update(counters)
+            trace.note("cache", "succès")
+            return value
+        value = compute()
+        with trace.stage("cache"):
+            stored = self.put(key, (value, dict(trace.counters)))
+        trace.note("cache", "enregistré" if stored else "trop grand")
+        return value
+
+    def clear(self):
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
+
+    def cache_info(self):
+        return {
+            "directory": self.directory,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,154 @@
+# Scrollable result table shared by the algorithm windows.
+#
+# Results stay in their column arrays; the ttk.Treeview only ever holds the
+# rows currently on screen, and scrolling rewrites those few items from the
+# arrays. A million-row result costs the same to display as a ten-row one.
+# Search filters the rows into an index array (vectorized for NumPy
+# columns) and CSV export writes the full result straight from the columns.
+import csv
+import tkinter as tk
+from tkinter import filedialog, ttk
+
+import numpy as np
+
+class LazyColumn:
+    """Column whose cells are computed by getter(row) each time it is displayed."""
+
+    def __init__(self, length, getter):
+        self.length = length
+        self.getter = getter
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, row):
+        return self.getter(row)
+
+def _cell_text(value):
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+def write_csv(path, headings, columns, rows=None, chunk=10000):
+    """Write the columns (or only the given row indices) to a CSV file."""
+    total = len(columns[0]) if columns else 0
+    rows = np.arange(total) if rows is None else np.asarray(rows)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(headings)
+        for start in range(0, len(rows), chunk):
+            block = rows[start:start + chunk].tolist()
+            writer.writerows([[_cell_text(col[k]) for col in columns] for k in block])
+
+def matching_rows(columns, text):
+    """Indices of the rows where some cell contains text (case-insensitive)."""
+    total = len(columns[0]) if columns else 0
+    text = text.lower()
+    found = np.zeros(total, dtype=bool)
+    for col in columns:
+        if isinstance(col, np.ndarray):
+            cells = col.astype(str)
+            if col.dtype.kind not in "iuf":
+                cells = np.char.lower(cells)
+            found |= np.char.find(cells, text) >= 0
+        else:
+            found |= np.fromiter((text in _cell_text(col[k]).lower() for k in range(total)),
+                                 dtype=bool, count=total)
+    return np.nonzero(found)[0]
+
+class ResultTable(tk.Frame):
+    """Treeview over column arrays, with search and CSV export.
+
+    set_data(headings, columns) takes one sequence per column (NumPy arrays,
+    lists or LazyColumn), all of the same length; only the visible rows are
+    read from them.
+    """
+
+    def __init__(self, master=None, height=12, **kwargs):
+        super().__init__(master, **kwargs)
+        self.height = height
+        self.headings = []
+        self.columns = []
+        self.view = np.empty(0, dtype=np.int64)
+        self.offset = 0
+
+        bar = tk.Frame(self, bg=self["bg"])
+        bar.pack(fill=tk.X, pady=(0, 5))
+        self.search_entry = tk.Entry(bar)
+        self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.search_entry.bind("<Return>", lambda e: self.search())
+        tk.Button(bar, text="Rechercher", command=self.search).pack(side=tk.LEFT, padx=5)
+        tk.Button(bar, text="Exporter CSV", command=self.export).pack(side=tk.LEFT)
+
+        body = tk.Frame(self)
+        body.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(body, show="headings", height=height, selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.count_label = tk.Label(self, text="", bg=self["bg"])
+        self.count_label.pack(anchor=tk.W)
+
+        for widget in (self.tree, self.scrollbar):
+            widget.bind("<MouseWheel>", self._on_wheel)
+            widget.bind("<Button-4>", lambda e: self.scroll(-3))
+            widget.bind("<Button-5>", lambda e: self.scroll(3))
+
+    def set_data(self, headings, columns):
+        self.headings = list(headings)
+        self.columns = list(columns)
+        self.tree["columns"] = [str(k) for k in range(len(self.headings))]
+        for k, heading in enumerate(self.headings):
+            self.tree.heading(str(k), text=heading)
+            self.tree.column(str(k), width=max(60, 8 * len(heading)), stretch=True)
+        self.search_entry.delete(0, tk.END)
+        self.view = np.arange(len(self.columns[0]) if self.columns else 0)
+        self.offset = 0
+        self._refresh()
+
+    def clear(self):
+        self.set_data([], [])
+
+    def search(self):
+        text = self.search_entry.get().strip()
+        total = len(self.columns[0]) if self.columns else 0
+        self.view = matching_rows(self.columns, text) if text else np.arange(total)
+        self.offset = 0
+        self._refresh()
+
+    def export(self):
+        if not self.columns:
+            return
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".csv",
+                                            filetypes=[("CSV", "*.csv")])
+        if path:
+            write_csv(path, self.headings, self.columns)
+
+    def scroll(self, rows):
+        self.offset = max(0, min(self.offset + rows, len(self.view) - self.height))
+        self._refresh()
+
+    def _on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.view))
+            self.scroll(0)
+        elif unit == "pages":
+            self.scroll(int(amount) * self.height)
+        else:
+            self.scroll(int(amount))
+
+    def _refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        visible = self.view[self.offset:self.offset + self.height].tolist()
+        for k in visible:
+            self.tree.insert("", tk.END, values=[_cell_text(col[k]) for col in self.columns])
+        total = max(len(self.view), 1)
+        self.scrollbar.set(self.offset / total, (self.offset + len(visible)) / total)
+        shown = len(self.columns[0]) if self.columns else 0
+        if len(self.view) == shown:
+            self.count_label.config(text=f"{shown} lignes")
+        else:
+            self.count_label.config(text=f"{len(self.view)} / {shown} lignes")
@@ -0,0 +1,105 @@
+# Potential-task method (CPM) on a precedence DAG.
+#
+# Tasks are 0..n-1 with a duration each; an arc u -> v means u must finish
+# before v starts. The DAG is processed level by level (Kahn's algorithm on
+# whole frontiers): when a level is taken, all its tasks have their final
+# earliest start, so the arcs leaving it are relaxed in one NumPy step. The
+# latest dates are computed by walking the same levels backwards, and the
+# floats over all arcs at once. Every task and arc is touched a constant
+# number of times, so the cost is O(tasks + arcs), plus a small fixed cost
+# per level.
+from collections import namedtuple
+
+import numpy as np
+
+from graph_arrays import build_csr, csr_slots
+
+# Dates are times from the project start (0). order: a topological order;
+# levels: number of frontiers; critical_path: task indices from a start task
+# to an end task, all with zero total float.
+Schedule = namedtuple("Schedule", [
+    "duration", "order", "levels",
+    "earliest_start", "earliest_finish", "latest_start", "latest_finish",
+    "total_float", "free_float", "critical", "critical_path",
+])
+
+def _forward_levels(num_tasks, duration, indptr, heads):
+    indegree = np.bincount(heads, minlength=num_tasks)
+    earliest = np.zeros(num_tasks, dtype=duration.dtype)
+    frontier = np.nonzero(indegree == 0)[0]
+    levels = []
+    done = 0
+    while len(frontier):
+        levels.append(frontier)
+        done += len(frontier)
+        slots = csr_slots(indptr, frontier)
+        if not len(slots):
+            break
+        tails = np.repeat(frontier, indptr[frontier + 1] - indptr[frontier])
+        nxt = heads[slots]
+        np.maximum.at(earliest, nxt, earliest[tails] + duration[tails])
+        np.subtract.at(indegree, nxt, 1)
+        nxt = np.unique(nxt)
+        frontier = nxt[indegree[nxt] == 0]
+    if done < num_tasks:
+        raise ValueError("Les précédences contiennent un cycle : ce n'est pas un graphe de tâches")
+    return earliest, levels
+
+def _backward_levels(num_tasks, duration, indptr, heads, levels, project):
+    latest_finish = np.full(num_tasks, project, dtype=duration.dtype)
+    latest_start = np.empty(num_tasks, dtype=duration.dtype)
+    for level in reversed(levels):
+        slots = csr_slots(indptr, level)
+        if len(slots):
+            tails = np.repeat(level, indptr[level + 1] - indptr[level])
+            np.minimum.at(latest_finish, tails, latest_start[heads[slots]])
+        latest_start[level] = latest_finish[level] - duration[level]
+    return latest_start, latest_finish
+
+def _critical_path(indptr, heads, earliest_start, earliest_finish, critical, project, tolerance):
+    # from a critical task starting at 0, follow critical arcs with no slack
+    starts = np.nonzero(critical & (earliest_start <= tolerance))[0]
+    if not len(starts):
+        return []
+    path = [int(starts[0])]
+    while earliest_finish[path[-1]] < project - tolerance:
+        u = path[-1]
+        succ = heads[indptr[u]:indptr[u + 1]]
+        tight = succ[critical[succ] & (np.abs(earliest_start[succ] - earliest_finish[u]) <= tolerance)]
+        path.append(int(tight[0]))
+    return path
+
+def cpm(duration, src, dst):
+    """Schedule tasks with the given durations and precedence arcs src -> dst.
+
+    Raises ValueError when the precedences contain a cycle.
+    """
+    duration = np.asarray(duration)
+    if duration.dtype.kind not in "iuf":
+        duration = duration.astype(np.float64)
+    n = len(duration)
+    indptr, heads, _, _ = build_csr(n, src, dst, drop_loops=False)
+    heads = np.asarray(heads, dtype=np.int64)
+
+    earliest_start, levels = _forward_levels(n, duration, indptr, heads)
+    earliest_finish = earliest_start + duration
+    project = earliest_finish.max() if n else duration.dtype.type(0)
+    latest_start, latest_finish = _backward_levels(n, duration, indptr, heads, levels, project)
+
+    total_float = latest_start - earliest_start
+    # free float: slack before delaying the earliest start of any successor
+    next_start = np.full(n, project, dtype=duration.dtype)
+    src = np.asarray(src, dtype=np.int64)
+    np.minimum.at(next_start, src, earliest_start[np.asarray(dst, dtype=np.int64)])
+    free_float = next_start - earliest_finish
+
+    tolerance = 0 if duration.dtype.kind in "iu" else 1e-9 * max(1.0, float(project))
+    critical = total_float <= tolerance
+    path = _critical_path(indptr, heads, earliest_start, earliest_finish, critical, project, tolerance)
+    order = np.concatenate(levels) if levels else np.empty(0, dtype=np.int64)
+    return Schedule(project, order, len(levels), earliest_start, earliest_finish, latest_start,
+                    latest_finish, total_float, free_float, critical, path)
+
+def cpm_network(network):
+    """cpm() on a generators.TaskNetwork."""
+    return cpm(network.duration, network.src, network.dst)
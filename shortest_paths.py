@@ -0,0 +1,382 @@
+# Single-source shortest paths on edge arrays.
+#
+# One run produces a ShortestPathTree: distances and the predecessor of every
+# vertex, from which all paths are read without solving again. Bellman-Ford
+# relaxes edges in bulk with NumPy, one round at a time, and only looks at
+# the edges leaving vertices whose distance changed in the previous round;
+# it stops at the first round without any change. SPFA is the queue-based
+# variant, in pure Python, which is faster when few vertices change per round.
+# When a negative cycle is reachable from the source, the cycle itself is
+# returned (read off the predecessor graph, every cycle of which is negative).
+import heapq
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from graph_arrays import CompactGraph, build_csr, edge_arrays
+
+class ShortestPathTree:
+    """Distances and predecessors from one source.
+
+    Vertices are 0..n-1; nodes, when given, maps them back to the original
+    node objects for paths() / distances(). negative_cycle is None or a
+    closed list [v0, v1, ..., v0] of vertices along a negative cycle.
+    integral marks integer edge weights, for which distances() returns ints.
+    """
+
+    def __init__(self, source, dist, pred, nodes=None, negative_cycle=None, operations=0, integral=False):
+        self.source = source
+        self.dist = dist
+        self.pred = pred
+        self.nodes = nodes
+        self.negative_cycle = negative_cycle
+        self.operations = operations
+        self.integral = integral
+
+    def _label(self, vertex):
+        return vertex if self.nodes is None else self.nodes[vertex]
+
+    def path(self, target):
+        """Vertex path from the source to target, or None if unreachable."""
+        if self.negative_cycle is not None:
+            raise ValueError("Chemins non définis : le graphe contient un cycle de poids négatif")
+        if not np.isfinite(self.dist[target]):
+            return None
+        path = [target]
+        pred = self.pred
+        while path[-1] != self.source:
+            path.append(int(pred[path[-1]]))
+        path.reverse()
+        return path
+
+    def distances(self):
+        reached = np.nonzero(np.isfinite(self.dist))[0]
+        values = self.dist[reached]
+        if self.integral:
+            values = values.astype(np.int64)
+        return {self._label(v): d for v, d in zip(reached.tolist(), values.tolist())}
+
+    def paths(self):
+        # each path is its predecessor's path plus one vertex, so every
+        # tree branch is walked only once
+        result = {}
+        reached = np.nonzero(np.isfinite(self.dist))[0].tolist()
+        pred = self.pred
+        built = {self.source: [self.source]}
+        for v in reached:
+            chain = []
+            while v not in built:
+                chain.append(v)
+                v = int(pred[v])
+            for w in reversed(chain):
+                built[w] = built[v] + [w]
+                v = w
+        for v in reached:
+            result[self._label(v)] = [self._label(w) for w in built[v]]
+        return result
+
+    def cycle_labels(self):
+        if self.negative_cycle is None:
+            return None
+        return [self._label(v) for v in self.negative_cycle]
+
+def find_pred_cycle(pred):
+    """A cycle of the predecessor graph as a closed vertex list, or None."""
+    n = len(pred)
+    pred = np.asarray(pred).tolist()
+    state = [0] * n  # 0: unseen, 1: on the current walk, 2: done
+    for start in range(n):
+        walk = []
+        v = start
+        while v != -1 and state[v] == 0:
+            state[v] = 1
+            walk.append(v)
+            v = pred[v]
+        if v != -1 and state[v] == 1:
+            # pred edges point backwards; reverse to follow the arcs
+            cycle = walk[walk.index(v):]
+            cycle.reverse()
+            return cycle + [cycle[0]]
+        for w in walk:
+            state[w] = 2
+    return None
+
+def bellman_ford_arrays(num_nodes, src, dst, weight, source):
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    weight = np.asarray(weight, dtype=np.float64)
+    dist = np.full(num_nodes, np.inf)
+    dist[source] = 0.0
+    pred = np.full(num_nodes, -1, dtype=np.int64)
+    changed = np.zeros(num_nodes, dtype=bool)
+    changed[source] = True
+    relaxations = 0
+    rounds = 0
+    while changed.any():
+        if rounds >= num_nodes:
+            cycle = find_pred_cycle(pred)
+            if cycle is not None:
+                return ShortestPathTree(source, dist, pred, negative_cycle=cycle, operations=relaxations)
+        rounds += 1
+        # only edges leaving a vertex improved last round can improve anything
+        active = np.nonzero(changed[src])[0]
+        relaxations += len(active)
+        tails, heads = src[active], dst[active]
+        candidate = dist[tails] + weight[active]
+        best = dist.copy()
+        np.minimum.at(best, heads, candidate)
+        changed = best < dist
+        hit = changed[heads] & (candidate == best[heads])
+        pred[heads[hit]] = tails[hit]
+        dist = best
+    return ShortestPathTree(source, dist, pred, operations=relaxations)
+
+def spfa_arrays(num_nodes, src, dst, weight, source):
+    indptr, heads, weights, _ = build_csr(num_nodes, src, dst, weight, drop_loops=False)
+    indptr, heads = indptr.tolist(), heads.tolist()
+    weights = np.asarray(weights, dtype=np.float64).tolist()
+    inf = float("inf")
+    dist = [inf] * num_nodes
+    pred = [-1] * num_nodes
+    dist[source] = 0.0
+    queued = [False] * num_nodes
+    queued[source] = True
+    # path length in edges; a shortest path has at most n - 1 of them
+    length = [0] * num_nodes
+    queue = deque([source])
+    relaxations = 0
+    cycle = None
+    while queue:
+        u = queue.popleft()
+        queued[u] = False
+        du = dist[u]
+        for a in range(indptr[u], indptr[u + 1]):
+            v = heads[a]
+            nd = du + weights[a]
+            relaxations += 1
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                length[v] = length[u] + 1
+                if length[v] % num_nodes == 0:
+                    # n edges on a "shortest" path: some vertex repeats
+                    cycle = find_pred_cycle(pred)
+                    if cycle is not None:
+                        queue.clear()
+                        break
+                if not queued[v]:
+                    queued[v] = True
+                    queue.append(v)
+    return ShortestPathTree(source, np.array(dist), np.array(pred, dtype=np.int64),
+                            negative_cycle=cycle, operations=relaxations)
+
+SOLVERS = {
+    "bellman_ford": bellman_ford_arrays,
+    "spfa": spfa_arrays,
+}
+
+def shortest_path_tree(graph, source, method="bellman_ford", weight="weight"):
+    """Run a single-source solver on a networkx graph (one solve, all paths)."""
+    if method not in SOLVERS:
+        raise ValueError(f"Méthode inconnue : {method!r} (attendu : {', '.join(SOLVERS)})")
+    nodes, src, dst, data = edge_arrays(graph, weight)
+    if not graph.is_directed():
+        src, dst, data = np.concatenate((src, dst)), np.concatenate((dst, src)), np.concatenate((data, data))
+    index = {node: i for i, node in enumerate(nodes)}
+    if source not in index:
+        raise ValueError(f"Le sommet source {source!r} n'est pas dans le graphe")
+    tree = SOLVERS[method](len(nodes), src, dst, data, index[source])
+    tree.nodes = nodes
+    tree.integral = data.dtype.kind in "iu"
+    return tree
+
+# Dijkstra and a batch query service for repeated queries on one graph.
+def _dijkstra_lists(indptr, heads, weights, source, target=None):
+    n = len(indptr) - 1
+    inf = float("inf")
+    dist = [inf] * n
+    pred = [-1] * n
+    done = [False] * n
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    settled = 0
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = True
+        settled += 1
+        if u == target:
+            break
+        for a in range(indptr[u], indptr[u + 1]):
+            v = heads[a]
+            nd = d + weights[a]
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd, v))
+    return dist, pred, settled
+
+def _bidirectional_lists(forward, backward, source, target):
+    # alternate one settled vertex per side; stop when the two frontiers
+    # together can not beat the best meeting point found so far
+    inf = float("inf")
+    if source == target:
+        return 0.0, [source], 0
+    sides = []
+    for csr, root in ((forward, source), (backward, target)):
+        n = len(csr[0]) - 1
+        dist = [inf] * n
+        dist[root] = 0.0
+        sides.append({"csr": csr, "dist": dist, "pred": [-1] * n, "done": [False] * n, "heap": [(0.0, root)]})
+    best, meet = inf, -1
+    settled = 0
+    turn = 0
+    while sides[0]["heap"] and sides[1]["heap"]:
+        if sides[0]["heap"][0][0] + sides[1]["heap"][0][0] >= best:
+            break
+        side, other = sides[turn], sides[1 - turn]
+        turn = 1 - turn
+        d, u = heapq.heappop(side["heap"])
+        if side["done"][u]:
+            continue
+        side["done"][u] = True
+        settled += 1
+        indptr, heads, weights = side["csr"]
+        dist, pred = side["dist"], side["pred"]
+        for a in range(indptr[u], indptr[u + 1]):
+            v = heads[a]
+            nd = d + weights[a]
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(side["heap"], (nd, v))
+            if nd + other["dist"][v] < best:
+                best, meet = nd + other["dist"][v], v
+    if meet < 0:
+        return inf, None, settled
+    path = [meet]
+    pred = sides[0]["pred"]
+    while path[-1] != source:
+        path.append(pred[path[-1]])
+    path.reverse()
+    pred = sides[1]["pred"]
+    while path[-1] != target:
+        path.append(pred[path[-1]])
+    return best, path, settled
+
+class ShortestPathService:
+    """Shortest-path queries against one fixed graph.
+
+    Full shortest-path trees (distance and predecessor arrays) are computed
+    with Dijkstra and kept in an LRU cache, so many targets from the same
+    source cost one solve. The cache is bounded by max_trees and, when
+    given, by max_bytes of tree arrays. bidirectional() answers a one-off
+    query without building or caching a tree. Weights must be
+    non-negative.
+    """
+
+    def __init__(self, graph, weight="weight", max_trees=64, max_bytes=None):
+        nodes, src, dst, data = edge_arrays(graph, weight)
+        if len(data) and data.min() < 0:
+            raise ValueError("Dijkstra demande des poids positifs ou nuls")
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.integral = data.dtype.kind in "iu"
+        n = len(nodes)
+        if isinstance(graph, CompactGraph):
+            # the graph's own adjacency, in both directions
+            slot_data = data[graph.edge_ids]
+            self._forward = self._lists((graph.indptr, graph.indices, slot_data, None))
+            indptr, indices, edge_ids = graph.reverse()
+            self._backward = self._forward if not graph.directed else self._lists((indptr, indices, data[edge_ids], None))
+        else:
+            if not graph.is_directed():
+                src, dst, data = np.concatenate((src, dst)), np.concatenate((dst, src)), np.concatenate((data, data))
+            self._forward = self._lists(build_csr(n, src, dst, data, drop_loops=False))
+            self._backward = self._forward if not graph.is_directed() else self._lists(build_csr(n, dst, src, data, drop_loops=False))
+        self.max_trees = max_trees
+        self.max_bytes = max_bytes
+        self._trees = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _lists(csr):
+        indptr, heads, weights, _ = csr
+        return indptr.tolist(), heads.tolist(), np.asarray(weights, dtype=np.float64).tolist()
+
+    def _vertex(self, node):
+        try:
+            return self.index[node]
+        except KeyError:
+            raise ValueError(f"Le sommet {node!r} n'est pas dans le graphe") from None
+
+    def tree(self, source):
+        s = self._vertex(source)
+        tree = self._trees.get(s)
+        if tree is not None:
+            self.hits += 1
+            self._trees.move_to_end(s)
+            return tree
+        self.misses += 1
+        dist, pred, settled = _dijkstra_lists(*self._forward, s)
+        tree = ShortestPathTree(s, np.array(dist), np.array(pred, dtype=np.int64), self.nodes,
+                                operations=settled, integral=self.integral)
+        self._trees[s] = tree
+        self._bytes += tree.dist.nbytes + tree.pred.nbytes
+        while self._trees and (len(self._trees) > self.max_trees
+                               or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            _, old = self._trees.popitem(last=False)
+            self._bytes -= old.dist.nbytes + old.pred.nbytes
+            self.evictions += 1
+        return tree
+
+    def _result(self, tree, target):
+        t = self._vertex(target)
+        d = tree.dist[t]
+        if not np.isfinite(d):
+            return None, None
+        return (int(d) if self.integral else float(d)), [self.nodes[v] for v in tree.path(t)]
+
+    def query(self, source, target):
+        """(distance, path) from source to target, (None, None) if unreachable."""
+        return self._result(self.tree(source), target)
+
+    def query_batch(self, pairs):
+        """Answer many (source, target) pairs, grouping them by source.
+
+        Results come back in the order of pairs.
+        """
+        pairs = list(pairs)
+        results = [None] * len(pairs)
+        order = sorted(range(len(pairs)), key=lambda k: self._vertex(pairs[k][0]))
+        for k in order:
+            source, target = pairs[k]
+            results[k] = self._result(self.tree(source), target)
+        return results
+
+    def bidirectional(self, source, target):
+        """One-off (distance, path) query; does not touch the tree cache."""
+        s, t = self._vertex(source), self._vertex(target)
+        d, path, _ = _bidirectional_lists(self._forward, self._backward, s, t)
+        if path is None:
+            return None, None
+        return (int(d) if self.integral else d), [self.nodes[v] for v in path]
+
+    def cache_info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "trees": len(self._trees),
+            "bytes": self._bytes,
+            "max_trees": self.max_trees,
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear_cache(self):
+        self._trees.clear()
+        self._bytes = 0
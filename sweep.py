@@ -0,0 +1,262 @@
+# Monte-Carlo parameter sweeps.
+#
+#   python sweep.py --algorithm kruskal --sizes 50:400:50 --probabilities 0.05,0.1 --samples 30
+#   python sweep.py --algorithm ford_fulkerson --sizes 100,200 --capacities 10,100 --samples 20 \
+#       --output sweep.json --plot sweep.png
+#
+# Every point of the grid (size x probability x max capacity) is solved on
+# --samples seeded random instances, spread over a process pool (the batch
+# runner's solvers and worker function, see batch.py). Workers only send
+# back the small result record of each sample, and every point keeps
+# streaming statistics of the metric and of the solve time: mean and
+# variance by Welford's update, quantiles by the P² estimator (Jain &
+# Chlamtac), so memory does not grow with the number of samples.
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from batch import SOLVERS, job_key, run_job
+
+# metric studied by default for each algorithm (a key of its batch result)
+SWEEP_METRICS = {
+    "welsh_powell": "colors",
+    "kruskal": "weight",
+    "ford_fulkerson": "max_flow",
+}
+QUANTILES = (0.1, 0.5, 0.9)
+
+class P2Quantile:
+    """Streaming estimate of the p-quantile with five markers (P² algorithm)."""
+
+    def __init__(self, p):
+        self.p = p
+        self.first = []
+        self.heights = None
+        self.positions = None
+        self.desired = None
+        self.increments = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+
+    def add(self, x):
+        if self.heights is None:
+            self.first.append(x)
+            if len(self.first) == 5:
+                self.heights = sorted(self.first)
+                self.positions = [0, 1, 2, 3, 4]
+                p = self.p
+                self.desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+            return
+        q, n = self.heights, self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < candidate < q[i + 1]:
+                    # parabolic step out of order: linear step instead
+                    candidate = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = candidate
+                n[i] += d
+
+    def value(self):
+        if self.heights is not None:
+            return self.heights[2]
+        if not self.first:
+            return math.nan
+        return float(np.quantile(self.first, self.p))
+
+class RunningStats:
+    """Count, mean, variance, extremes and quantiles of a stream of values."""
+
+    def __init__(self, quantiles=QUANTILES):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.quantiles = [P2Quantile(p) for p in quantiles]
+
+    def add(self, x):
+        x = float(x)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        for estimator in self.quantiles:
+            estimator.add(x)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def summary(self):
+        # with no value, every statistic is None (null in JSON, not Infinity)
+        empty = self.count == 0
+        out = {"count": self.count, "mean": None if empty else self.mean,
+               "std": None if empty else math.sqrt(self.variance),
+               "min": None if empty else self.min, "max": None if empty else self.max}
+        for estimator in self.quantiles:
+            out[f"q{round(estimator.p * 100):02d}"] = None if empty else estimator.value()
+        return out
+
+def parse_values(text, cast=float):
+    """"a,b,c" or an inclusive range "start:stop:step" (or a mix of both)."""
+    values = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if ":" in part:
+            start, stop, step = (float(v) for v in part.split(":"))
+            count = int(math.floor((stop - start) / step + 1e-9)) + 1
+            values.extend(cast(round(start + k * step, 10)) for k in range(count))
+        else:
+            values.append(cast(part))
+    return values
+
+def sample_seed(seed, point, sample):
+    # independent, reproducible stream per (point, sample)
+    return int(np.random.SeedSequence([seed, point, sample]).generate_state(1)[0])
+
+def sweep_points(algorithm, sizes, probabilities=(None,), capacities=(None,)):
+    """Grid points as (size, probability, params) tuples."""
+    points = []
+    for size, probability, capacity in itertools.product(sizes, probabilities, capacities):
+        params = {} if capacity is None else {"max_capacity": capacity}
+        points.append((size, probability, params))
+    return points
+
+def run_sweep(algorithm, points, samples, metric=None, seed=0, workers=None, progress=None, cache_dir=None,
+              mp_context=None):
+    """Solve samples instances per point and aggregate them as they complete.
+
+    Returns one dict per point with its parameters and the summaries of the
+    metric and of the solve time ("seconds"). progress(done, total), when
+    given, is called after every sample; raising from it stops the sweep.
+    mp_context is the multiprocessing context of the worker pool (the
+    platform default if None).
+    """
+    if algorithm not in SOLVERS:
+        raise ValueError(f"Algorithme inconnu : {algorithm!r} (attendu : {', '.join(SOLVERS)})")
+    metric = metric or SWEEP_METRICS.get(algorithm)
+    if metric is None:
+        raise ValueError(f"Indiquer la mesure à étudier pour {algorithm}")
+    stats = [(RunningStats(), RunningStats()) for _ in points]
+    errors = [0] * len(points)
+
+    def jobs():
+        for k in range(samples):
+            for index, (size, probability, params) in enumerate(points):
+                job = {"algorithm": algorithm, "size": size, "probability": probability,
+                       "seed": sample_seed(seed, index, k), "input": None, "params": params}
+                job["key"] = job_key(job)
+                yield index, job
+
+    total = samples * len(points)
+    done = 0
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(workers, mp_context=mp_context)
+    queue = jobs()
+    running = {}
+    try:
+        while True:
+            for index, job in itertools.islice(queue, 2 * workers - len(running)):
+                running[pool.submit(run_job, job, cache_dir)] = index
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index = running.pop(future)
+                record = future.result()
+                if record["status"] == "ok":
+                    values, seconds = stats[index]
+                    values.add(record["result"][metric])
+                    seconds.add(record["stages"].get("résolution", 0.0))
+                else:
+                    errors[index] += 1
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+    except BaseException:
+        # the queued samples are cancelled by hand (shutdown's cancel_futures
+        # needs Python 3.9), and the ones already running are not waited
+        # for, so a cancelled sweep returns at once: no with block, whose
+        # exit would wait for them
+        for future in running:
+            future.cancel()
+        pool.shutdown(wait=False)
+        raise
+    pool.shutdown()
+
+    results = []
+    for (size, probability, params), (values, seconds), failed in zip(points, stats, errors):
+        results.append({"size": size, "probability": probability, "params": params, "metric": metric,
+                        "values": values.summary(), "seconds": seconds.summary(), "errors": failed})
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Balayage Monte-Carlo des paramètres d'un algorithme")
+    parser.add_argument("--algorithm", required=True, choices=sorted(SOLVERS))
+    parser.add_argument("--sizes", required=True, help="tailles, ex. 50,100 ou 50:500:50")
+    parser.add_argument("--probabilities", help="probabilités (densité pour ford_fulkerson), ex. 0.05:0.3:0.05")
+    parser.add_argument("--capacities", help="capacités maximales (ford_fulkerson)")
+    parser.add_argument("--samples", type=int, default=20, help="instances par point")
+    parser.add_argument("--metric", help="mesure étudiée (clé du résultat de batch.py)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="processus (défaut : un par cœur)")
+    parser.add_argument("--output", help="fichier JSON du résumé (défaut : sortie standard)")
+    parser.add_argument("--plot", help="image des courbes (PNG, SVG...)")
+    args = parser.parse_args(argv)
+
+    points = sweep_points(
+        args.algorithm, parse_values(args.sizes, int),
+        parse_values(args.probabilities) if args.probabilities else [None],
+        parse_values(args.capacities, int) if args.capacities else [None],
+    )
+    step = max(1, args.samples * len(points) // 20)
+
+    def progress(done, total):
+        if done % step == 0 or done == total:
+            print(f"{done}/{total} instances", file=sys.stderr)
+
+    try:
+        results = run_sweep(args.algorithm, points, args.samples, args.metric, args.seed, args.workers, progress)
+    except ValueError as e:
+        parser.error(str(e))
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.plot:
+        from rendering import render_to_file, sweep_figure
+
+        render_to_file(lambda fig: sweep_figure(results, figure=fig), args.plot, figsize=(11, 5))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+import pytest
+
+from batch import SOLVERS, completed_keys, expand_spec, run_batch, run_job
+
+SIZES = {"welsh_powell": 30, "dijkstra": 30, "kruskal": 30, "bellman_ford": 20, "potentiel_metra": 40,
+         "ford_fulkerson": 20, "stepping_stone": 6}
+
+def _job(name, seed=0, **params):
+    return expand_spec({"algorithm": name, "sizes": [SIZES[name]], "probabilities": [0.2],
+                        "seeds": [seed], "params": params})[0]
+
+def test_expand_spec():
+    jobs = expand_spec([
+        {"algorithm": "kruskal", "sizes": [10, 20], "probabilities": [0.1, 0.2], "seeds": [0, 1, 2]},
+        {"algorithm": "stepping_stone", "inputs": ["a.npz", "b.npz"]},
+    ])
+    assert len(jobs) == 14
+    assert len({job["key"] for job in jobs}) == 14
+    assert jobs[-1]["input"] == "b.npz" and jobs[-1]["seed"] is None
+    with pytest.raises(ValueError):
+        expand_spec({"algorithm": "prim", "sizes": [10]})
+
+@pytest.mark.parametrize("algorithm", SOLVERS)
+def test_every_solver_runs(algorithm):
+    record = run_job(_job(algorithm))
+    assert record["status"] == "ok", record.get("error")
+    assert record["result"] and "résolution" in record["stages"]
+    json.dumps(record)
+
+def test_solver_results():
+    assert run_job(_job("stepping_stone"))["result"]["optimal_cost"] <= \
+        run_job(_job("stepping_stone"))["result"]["initial_cost"]
+    kruskal = run_job(_job("kruskal", algorithm="boruvka"))["result"]
+    assert kruskal["tree_edges"] <= kruskal["vertices"] - 1
+
+def test_failures_are_recorded():
+    job = {**_job("kruskal"), "input": "/nonexistent/edges.txt"}
+    record = run_job(job)
+    assert record["status"] == "error" and "FileNotFoundError" in record["error"]
+
+def test_cached_results(tmp_path):
+    job = _job("dijkstra", seed=3)
+    first = run_job(job, cache_dir=str(tmp_path))
+    second = run_job(job, cache_dir=str(tmp_path))
+    assert not first["cached"] and second["cached"]
+    assert first["result"] == second["result"]
+
+def test_figures(tmp_path):
+    record = run_job(_job("potentiel_metra"), figure_dir=str(tmp_path))
+    assert record["status"] == "ok"
+    assert record["figure"].endswith(".png") and (tmp_path / record["figure"].split("/")[-1]).exists()
+
+def test_run_batch_resumes(tmp_path):
+    output = tmp_path / "out.jsonl"
+    jobs = expand_spec({"algorithm": "welsh_powell", "sizes": [20], "probabilities": [0.3], "seeds": [0, 1, 2]})
+    assert run_batch(jobs[:2], str(output), workers=1) == (2, 0, 0)
+    # an interrupted write leaves a partial last line
+    with open(output, "a", encoding="utf-8") as f:
+        f.write('{"key": "welsh')
+    assert completed_keys(str(output)) == {job["key"] for job in jobs[:2]}
+    assert run_batch(jobs, str(output), workers=1) == (1, 0, 2)
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()
+               if line.startswith('{"key": "welsh_powell')]
+    assert sorted(record["seed"] for record in records) == [0, 1, 2]
+    assert all(np.isfinite(record["result"]["colors"]) for record in records)
@@ -0,0 +1,22 @@
+import numpy as np
+
+from benchmark import compare, fit_complexity
+
+def test_fit_complexity_finds_the_model():
+    n = np.array([1000, 2000, 4000, 8000])
+    fit = fit_complexity(n, 1e-9 * n ** 2)
+    assert fit["model"] == "n^2" and abs(fit["exponent"] - 2) < 1e-6
+    assert fit_complexity(n, 1e-7 * n * np.log2(n))["model"] == "n log n"
+    assert fit_complexity(n[:2], n[:2]) is None
+
+def test_compare_reports_regressions_only():
+    baseline = {"cases": {"kruskal": {"results": [{"size": 1000, "seconds": 0.1},
+                                                 {"size": 2000, "seconds": 0.001}]}}}
+    results = {
+        "kruskal": {"results": [{"size": 1000, "seconds": 0.2}, {"size": 2000, "seconds": 0.003},
+                                {"size": 4000, "seconds": 1.0}]},
+        "dijkstra": {"results": [{"size": 1000, "seconds": 5.0}]},
+    }
+    regressions = compare(results, baseline, threshold=0.25)
+    # 2000 is slower, but by less than min_seconds; 4000 and dijkstra have no baseline
+    assert len(regressions) == 1 and regressions[0].startswith("kruskal size 1000")
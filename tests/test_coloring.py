@@ -0,0 +1,42 @@
+import networkx as nx
+import pytest
+
+import algorithms
+from coloring import ORDERINGS, color_graph
+from graph_arrays import CompactGraph
+
+def _is_proper(graph, colors):
+    return all(colors[u] != colors[v] for u, v in graph.edges() if u != v)
+
+@pytest.mark.parametrize("ordering", ORDERINGS)
+def test_colorings_are_proper(ordering):
+    for seed in range(5):
+        graph = algorithms.generate_random_graph(60, 0.2, seed=seed)
+        colors = color_graph(graph, ordering)
+        assert set(colors) == set(graph.nodes())
+        assert _is_proper(graph, colors)
+        assert max(colors.values()) <= max(dict(graph.degree()).values())
+
+@pytest.mark.parametrize("ordering", ORDERINGS)
+def test_even_cycle_and_complete_graph(ordering):
+    assert len(set(color_graph(nx.cycle_graph(10), ordering).values())) == 2
+    assert len(set(color_graph(nx.complete_graph(7), ordering).values())) == 7
+
+def test_dsatur_colors_bipartite_graphs_with_two_colors():
+    graph = nx.complete_bipartite_graph(8, 12)
+    assert len(set(color_graph(graph, "dsatur").values())) == 2
+
+def test_welsh_powell_wrapper_and_labels():
+    graph = nx.relabel_nodes(nx.petersen_graph(), lambda v: f"v{v}")
+    colors = algorithms.welsh_powell(graph)
+    assert set(colors) == set(graph.nodes())
+    assert _is_proper(graph, colors)
+
+@pytest.mark.parametrize("ordering", ORDERINGS)
+def test_compact_graph_gives_the_same_coloring(ordering):
+    graph = algorithms.generate_random_graph(80, 0.1, seed=3)
+    assert color_graph(CompactGraph.from_networkx(graph), ordering) == color_graph(graph, ordering)
+
+def test_unknown_ordering():
+    with pytest.raises(ValueError):
+        color_graph(nx.path_graph(3), "random")
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from generators import FLOW_TOPOLOGIES, flow_network_edges, gnp_pairs, random_task_network, vertex_labels
+from maxflow import ResidualGraph
+from scheduling import cpm_network
+
+def test_undirected_pairs_are_unique_and_ordered():
+    src, dst = gnp_pairs(300, 0.05, seed=1)
+    assert (src < dst).all()
+    assert dst.max() < 300
+    assert len(set(zip(src.tolist(), dst.tolist()))) == len(src)
+
+def test_directed_pairs_have_no_loops():
+    src, dst = gnp_pairs(200, 0.1, directed=True, seed=2)
+    assert (src != dst).all()
+    assert len(set(zip(src.tolist(), dst.tolist()))) == len(src)
+
+def test_edge_count_matches_p():
+    n, p = 2000, 0.01
+    src, _ = gnp_pairs(n, p, seed=0)
+    expected = n * (n - 1) / 2 * p
+    assert abs(len(src) - expected) < 5 * np.sqrt(expected)
+
+def test_seed_reproduces_the_graph_and_extreme_probabilities():
+    a, b = gnp_pairs(100, 0.3, seed=7), gnp_pairs(100, 0.3, seed=7)
+    assert np.array_equal(a[0], b[0]) and np.array_equal(a[1], b[1])
+    assert len(gnp_pairs(10, 0.0, seed=0)[0]) == 0
+    assert len(gnp_pairs(10, 1.0, seed=0)[0]) == 45
+    assert len(gnp_pairs(10, 1.0, directed=True, seed=0)[0]) == 90
+
+def test_vertex_labels():
+    labels = vertex_labels(30)
+    assert labels[:3] == ["A", "B", "C"]
+    assert labels[25:28] == ["Z", "AA", "AB"]
+
+@pytest.mark.parametrize("topology", FLOW_TOPOLOGIES)
+def test_flow_networks_reach_the_sink(topology):
+    edges = flow_network_edges(50, max_capacity=20, topology=topology, seed=4)
+    assert edges.num_nodes == 50
+    assert ((edges.weight >= 1) & (edges.weight <= 20)).all()
+    assert (edges.src != edges.dst).all()
+    assert ResidualGraph(edges.num_nodes, edges.src, edges.dst, edges.weight).reachable(0)[49]
+
+def test_complete_flow_network_has_every_arc():
+    edges = flow_network_edges(12, topology="complete", seed=0)
+    assert len(edges.src) == 12 * 11
+
+def test_flow_network_errors():
+    with pytest.raises(ValueError):
+        flow_network_edges(1)
+    with pytest.raises(ValueError):
+        flow_network_edges(10, topology="star")
+
+def test_task_networks_are_acyclic():
+    network = random_task_network(500, seed=5)
+    assert network.num_tasks == 500
+    assert ((network.duration >= 1) & (network.duration <= 10)).all()
+    cpm_network(network)
@@ -0,0 +1,44 @@
+import networkx as nx
+import numpy as np
+
+import algorithms
+from graph_arrays import CompactGraph, build_csr, edge_arrays
+
+def test_build_csr_groups_edges_by_tail():
+    indptr, indices, data, order = build_csr(4, [2, 0, 0, 3, 1], [1, 2, 1, 3, 0], [5, 6, 7, 8, 9])
+    assert indptr.tolist() == [0, 2, 3, 4, 4]
+    assert indices.tolist() == [2, 1, 0, 1]
+    assert data.tolist() == [6, 7, 9, 5]
+    assert order.tolist() == [1, 2, 4, 0]
+
+def test_symmetric_csr_stores_both_directions():
+    indptr, indices, _, _ = build_csr(3, [0, 1], [1, 2], symmetric=True)
+    assert np.diff(indptr).tolist() == [1, 2, 1]
+    assert sorted(indices[indptr[1]:indptr[2]].tolist()) == [0, 2]
+
+def test_compact_graph_round_trip():
+    graph = algorithms.generate_labeled_weighted_graph(30, 0.2, seed=6)
+    compact = CompactGraph.from_networkx(graph)
+    assert compact.number_of_nodes() == 30
+    assert compact.number_of_edges() == graph.number_of_edges()
+    assert compact.size(weight="weight") == graph.size(weight="weight")
+    assert compact.nodes() == list(graph.nodes())
+    back = compact.to_networkx()
+    assert list(back.nodes()) == list(graph.nodes())
+    assert {frozenset(e): w for *e, w in back.edges(data="weight")} == \
+        {frozenset(e): w for *e, w in graph.edges(data="weight")}
+
+def test_directed_compact_graph_reverse_index():
+    graph = algorithms.generate_random_weighted_digraph(20, 0.2, seed=1)
+    compact = CompactGraph.from_networkx(graph)
+    indptr, indices, edge_ids = compact.reverse()
+    for v in range(20):
+        preds = sorted(indices[indptr[v]:indptr[v + 1]].tolist())
+        assert preds == sorted(u for u in graph.predecessors(v) if u != v)
+    assert np.array_equal(compact.dst[edge_ids], np.repeat(np.arange(20), np.diff(indptr)))
+
+def test_edge_arrays_default_weight():
+    graph = nx.path_graph(4)
+    nodes, src, dst, data = edge_arrays(graph, "weight")
+    assert nodes == [0, 1, 2, 3]
+    assert data.tolist() == [1, 1, 1]
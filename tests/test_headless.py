@@ -0,0 +1,20 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def _loaded_after(statement):
+    code = f"{statement}; import sys; print(' '.join(sorted(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(out.stdout.split())
+
+def test_algorithms_import_without_tk_or_report_dependencies():
+    loaded = _loaded_after("import algorithms")
+    for name in ("tkinter", "matplotlib", "pandas", "tabulate"):
+        assert name not in loaded
+
+def test_batch_import_without_tk():
+    loaded = _loaded_after("import batch, sweep")
+    assert "tkinter" not in loaded
+    assert "matplotlib" not in loaded
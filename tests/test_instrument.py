@@ -0,0 +1,78 @@
+import json
+import threading
+import time
+import tracemalloc
+
+from instrument import RunTrace, log_trace
+
+def test_stages_accumulate_and_summary_lists_everything():
+    trace = RunTrace("test")
+    for _ in range(2):
+        with trace.stage("résolution"):
+            time.sleep(0.01)
+    trace.count("pivots", 3)
+    trace.note("graine", 7)
+    assert trace.stages["résolution"] >= 0.02
+    assert trace.total() == trace.stages["résolution"]
+    summary = trace.summary()
+    assert "résolution" in summary and "pivots : 3" in summary and "graine : 7" in summary
+
+def test_capture_without_profile_records_nothing():
+    trace = RunTrace("test")
+    with trace.capture():
+        sum(range(1000))
+    assert trace.peak_bytes is None and trace.profile_rows is None
+
+def test_profiled_capture():
+    trace = RunTrace("test", profile=True)
+    with trace.capture():
+        data = [bytearray(1 << 20) for _ in range(4)]
+        del data
+    assert trace.peak_bytes >= 4 << 20
+    assert trace.profile_rows and "fonction" in trace.profile_text()
+    assert not tracemalloc.is_tracing()
+
+def test_overlapping_profiled_runs_share_tracemalloc():
+    traces = [RunTrace(f"run {k}", profile=True) for k in range(2)]
+    inside = threading.Barrier(2)
+
+    def run(trace):
+        with trace.capture():
+            block = bytearray(2 << 20)
+            inside.wait(5)
+            inside.wait(5)
+            del block
+
+    threads = [threading.Thread(target=run, args=(trace,)) for trace in traces]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(trace.peak_bytes >= 2 << 20 for trace in traces)
+    assert not tracemalloc.is_tracing()
+
+def test_tracing_started_elsewhere_stays_on():
+    tracemalloc.start()
+    try:
+        trace = RunTrace("test", profile=True)
+        with trace.capture():
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+def test_log_trace_appends_json_lines(tmp_path, monkeypatch):
+    path = tmp_path / "runs.jsonl"
+    trace = RunTrace("test")
+    with trace.stage("génération"):
+        pass
+    log_trace(trace, str(path))
+    monkeypatch.setenv("APPRO_RUN_LOG", str(path))
+    log_trace(trace)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["stages"].keys() == {"génération"}
+
+def test_log_trace_without_destination_does_nothing(monkeypatch):
+    monkeypatch.delenv("APPRO_RUN_LOG", raising=False)
+    log_trace(RunTrace("test"))
@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pytest
+
+from jobs import JobCancelled, JobScheduler
+
+def _poll_until(scheduler, done, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not done() and time.monotonic() < deadline:
+        scheduler.poll()
+        time.sleep(0.01)
+    assert done()
+
+@pytest.fixture
+def scheduler():
+    scheduler = JobScheduler(max_workers=2)
+    yield scheduler
+    scheduler.shutdown(wait=True)
+
+def test_results_and_progress_reach_the_callbacks(scheduler):
+    results, progress = [], []
+    released = threading.Event()
+
+    def work(job, x):
+        job.report("moitié")
+        released.wait(5)
+        return x * 2
+
+    scheduler.submit(work, 21, on_done=results.append, on_progress=progress.append)
+    _poll_until(scheduler, lambda: progress)
+    released.set()
+    _poll_until(scheduler, lambda: results)
+    assert results == [42] and progress == ["moitié"]
+    assert scheduler.poll() == 0
+
+def test_errors_reach_on_error(scheduler):
+    errors = []
+
+    def work(job):
+        raise ValueError("boom")
+
+    scheduler.submit(work, on_error=errors.append)
+    _poll_until(scheduler, lambda: errors)
+    assert isinstance(errors[0], ValueError)
+
+def test_cancelled_job_ends_with_job_cancelled(scheduler):
+    errors, started = [], threading.Event()
+
+    def work(job):
+        started.set()
+        while True:
+            job.check()
+            time.sleep(0.001)
+
+    job = scheduler.submit(work, on_error=errors.append)
+    assert started.wait(5)
+    job.cancel()
+    _poll_until(scheduler, lambda: errors)
+    assert isinstance(errors[0], JobCancelled)
+
+def test_shutdown_cancels_queued_jobs():
+    scheduler = JobScheduler(max_workers=1)
+    gate = threading.Event()
+    first = scheduler.submit(lambda job: gate.wait(5))
+    queued = scheduler.submit(lambda job: None)
+    scheduler.shutdown()
+    gate.set()
+    assert queued.future.cancelled()
+    first.future.result(timeout=5)
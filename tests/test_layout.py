@@ -0,0 +1,44 @@
+import networkx as nx
+import numpy as np
+
+from graph_arrays import CompactGraph
+from layout import LayoutCache, graph_fingerprint, spectral_positions
+
+def test_fingerprint_ignores_weights_only():
+    a = nx.path_graph(5)
+    b = nx.path_graph(5)
+    nx.set_edge_attributes(b, 3, "weight")
+    assert graph_fingerprint(a) == graph_fingerprint(b)
+    b.add_edge(0, 4)
+    assert graph_fingerprint(a) != graph_fingerprint(b)
+
+def test_second_layout_is_a_cache_hit():
+    cache = LayoutCache()
+    graph = nx.cycle_graph(20)
+    first = cache.layout(graph, dim=3)
+    second = cache.layout(graph, dim=3)
+    assert first.method == "spring" and second.method == "cache"
+    assert second.pos is first.pos
+    assert cache.cache_info()["hits"] == 1
+
+def test_small_edit_is_warm_started():
+    cache = LayoutCache()
+    graph = nx.grid_2d_graph(6, 6)
+    cache.layout(graph)
+    graph.remove_edge((0, 0), (0, 1))
+    assert cache.layout(graph).method == "warm"
+
+def test_large_graphs_get_a_spectral_layout():
+    cache = LayoutCache(large_threshold=100)
+    graph = CompactGraph.from_networkx(nx.grid_2d_graph(20, 20))
+    result = cache.layout(graph, dim=2)
+    assert result.method == "spectral"
+    coords = np.array(list(result.pos.values()))
+    assert coords.shape == (400, 2) and np.isfinite(coords).all()
+    assert np.abs(coords).max() <= 1.2 + 1e-9
+
+def test_spectral_positions_place_isolated_vertices_on_a_ring():
+    src, dst = np.arange(9), np.arange(1, 10)
+    coords = spectral_positions(15, src, dst, dim=2)
+    assert coords.shape == (15, 2)
+    assert np.allclose(np.linalg.norm(coords[10:], axis=1), 1.2)
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from loaders import load_compact_graph, load_edge_list, load_graph, load_task_network, load_transport
+from scheduling import cpm_network
+
+def test_text_edge_list_with_header_and_comments(tmp_path):
+    path = tmp_path / "edges.csv"
+    path.write_text("# a comment\nsrc,dst,weight\n0,1,2.5\n1,2,3\n% another\n2,0,1\n", encoding="utf-8")
+    edges = load_edge_list(str(path), chunk_rows=2)
+    assert edges.num_nodes == 3
+    assert edges.src.tolist() == [0, 1, 2] and edges.dst.tolist() == [1, 2, 0]
+    assert edges.weight.tolist() == [2.5, 3.0, 1.0]
+
+def test_whole_number_weights_become_integers(tmp_path):
+    path = tmp_path / "edges.txt"
+    path.write_text("0 1 4\n1 2 5\n", encoding="utf-8")
+    edges = load_edge_list(str(path))
+    assert edges.weight.dtype == np.int64 and edges.src.dtype == np.int64
+    assert load_graph(str(path))[1][2]["weight"] == 5
+
+def test_edge_list_without_weights(tmp_path):
+    path = tmp_path / "edges.tsv"
+    path.write_text("0\t3\n3\t1\n", encoding="utf-8")
+    edges = load_edge_list(str(path))
+    assert edges.weight is None and edges.num_nodes == 4
+    assert load_compact_graph(str(path)).number_of_edges() == 2
+
+def test_npy_edge_list_is_memory_mapped(tmp_path):
+    path = tmp_path / "edges.npy"
+    np.save(path, np.array([[0, 1, 7], [1, 4, 8]]))
+    edges = load_edge_list(str(path))
+    assert isinstance(edges.src, np.memmap) or isinstance(edges.src.base, np.memmap)
+    assert edges.num_nodes == 5 and edges.weight.tolist() == [7, 8]
+
+def test_npz_edge_list_keeps_num_nodes(tmp_path):
+    path = tmp_path / "edges.npz"
+    np.savez(path, src=[0, 1], dst=[1, 2], num_nodes=10)
+    assert load_edge_list(str(path)).num_nodes == 10
+
+@pytest.mark.parametrize("text, message", [
+    ("0 1 1\n-1 2 1\n", "négatif"),
+    ("0 1.5 1\n", "non entier"),
+    ("0 1 -3\n", "poids invalide"),
+])
+def test_invalid_edge_lists(tmp_path, text, message):
+    path = tmp_path / "edges.txt"
+    path.write_text(text, encoding="utf-8")
+    with pytest.raises(ValueError, match=message):
+        load_edge_list(str(path), non_negative=True)
+
+def test_transport_tableau_and_separate_files(tmp_path):
+    tableau = tmp_path / "tableau.csv"
+    tableau.write_text("4,6,10\n5,3,20\n12,18,0\n", encoding="utf-8")
+    problem = load_transport(str(tableau))
+    assert problem.costs.tolist() == [[4, 6], [5, 3]]
+    assert problem.supplies.tolist() == [10, 20] and problem.demands.tolist() == [12, 18]
+    assert problem.supplies.dtype == np.int64
+
+    np.save(tmp_path / "costs.npy", np.array([[1.0, 2.0], [3.0, 4.0]]))
+    np.save(tmp_path / "supplies.npy", np.array([5, 5]))
+    (tmp_path / "demands.txt").write_text("4\n6\n", encoding="utf-8")
+    problem = load_transport(str(tmp_path / "costs.npy"), str(tmp_path / "supplies.npy"),
+                             str(tmp_path / "demands.txt"))
+    assert problem.demands.tolist() == [4, 6]
+
+def test_unbalanced_transport_is_rejected(tmp_path):
+    path = tmp_path / "problem.npz"
+    np.savez(path, costs=np.ones((2, 2)), supplies=[5, 5], demands=[4, 4])
+    with pytest.raises(ValueError, match="non équilibré"):
+        load_transport(str(path))
+
+def test_task_network_from_precedences_and_durations(tmp_path):
+    (tmp_path / "prec.txt").write_text("0 1\n1 2\n0 2\n", encoding="utf-8")
+    (tmp_path / "durations.txt").write_text("2\n3\n1\n", encoding="utf-8")
+    network = load_task_network(str(tmp_path / "prec.txt"), str(tmp_path / "durations.txt"))
+    assert network.num_tasks == 3 and network.duration.tolist() == [2, 3, 1]
+    assert cpm_network(network).duration == 6
+    with pytest.raises(ValueError):
+        load_task_network(str(tmp_path / "prec.txt"))
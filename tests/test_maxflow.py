@@ -0,0 +1,46 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+import algorithms
+from generators import FLOW_TOPOLOGIES, flow_network_edges, to_networkx
+from maxflow import METHODS, ResidualGraph, max_flow
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("topology", FLOW_TOPOLOGIES)
+def test_max_flow_matches_networkx(method, topology):
+    for seed in range(3):
+        edges = flow_network_edges(40, max_capacity=15, topology=topology, seed=seed)
+        network = ResidualGraph(edges.num_nodes, edges.src, edges.dst, edges.weight)
+        result = max_flow(network, 0, edges.num_nodes - 1, method)
+        graph = to_networkx(edges, directed=True, attr="capacity")
+        assert result.value == nx.maximum_flow_value(graph, 0, edges.num_nodes - 1)
+
+@pytest.mark.parametrize("method", METHODS)
+def test_flow_is_feasible(method):
+    edges = flow_network_edges(60, topology="random", density=0.1, seed=9)
+    network = ResidualGraph(edges.num_nodes, edges.src, edges.dst, edges.weight)
+    result = max_flow(network, 0, 59, method)
+    flow = result.flow
+    assert ((flow >= 0) & (flow <= edges.weight)).all()
+    balance = np.bincount(edges.dst, flow, minlength=60) - np.bincount(edges.src, flow, minlength=60)
+    assert balance[59] == result.value
+    assert balance[0] == -result.value
+    assert not balance[1:59].any()
+
+def test_min_cut_capacity_equals_flow():
+    edges = flow_network_edges(50, topology="layered", seed=1)
+    capacity = np.zeros((50, 50), dtype=np.int64)
+    capacity[edges.src, edges.dst] = edges.weight
+    value, flow = algorithms.ford_fulkerson(capacity, 0, 49)
+    side = np.array(algorithms.find_min_cut(capacity, flow, 0))
+    assert side[0] and not side[49]
+    assert capacity[np.ix_(side, ~side)].sum() == value
+
+def test_disconnected_sink_and_errors():
+    network = ResidualGraph(3, [0], [1], [5])
+    assert max_flow(network, 0, 2).value == 0
+    with pytest.raises(ValueError):
+        max_flow(network, 0, 0)
+    with pytest.raises(ValueError):
+        max_flow(network, 0, 2, "simplex")
@@ -0,0 +1,43 @@
+import networkx as nx
+import pytest
+
+import algorithms
+from graph_arrays import CompactGraph
+from mst import ALGORITHMS, minimum_spanning_forest
+
+def _weight(graph):
+    return graph.size(weight="weight")
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_forest_weight_matches_networkx(algorithm):
+    for seed in range(5):
+        graph = algorithms.generate_labeled_weighted_graph(60, 0.1, seed=seed)
+        forest = algorithms.kruskal(graph, algorithm)
+        expected = nx.minimum_spanning_tree(graph)
+        assert _weight(forest) == _weight(expected)
+        assert forest.number_of_edges() == expected.number_of_edges()
+        assert nx.is_forest(forest)
+        assert all(graph.has_edge(u, v) for u, v in forest.edges())
+
+def test_kruskal_and_boruvka_pick_the_same_edges():
+    graph = algorithms.generate_labeled_weighted_graph(100, 0.05, seed=1)
+    kruskal = {frozenset(e) for e in minimum_spanning_forest(graph, "kruskal").edges()}
+    boruvka = {frozenset(e) for e in minimum_spanning_forest(graph, "boruvka").edges()}
+    assert kruskal == boruvka
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_long_path_has_no_recursion_limit(algorithm):
+    graph = nx.path_graph(20000)
+    nx.set_edge_attributes(graph, 1, "weight")
+    assert minimum_spanning_forest(graph, algorithm).number_of_edges() == 19999
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_compact_graph_input(algorithm):
+    graph = algorithms.generate_weighted_graph(80, 0.05, seed=2)
+    forest = minimum_spanning_forest(CompactGraph.from_networkx(graph), algorithm)
+    assert isinstance(forest, CompactGraph)
+    assert forest.size(weight="weight") == _weight(nx.minimum_spanning_tree(graph))
+
+def test_unknown_algorithm():
+    with pytest.raises(ValueError):
+        minimum_spanning_forest(nx.path_graph(3), "prim")
@@ -0,0 +1,82 @@
+import networkx as nx
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from generators import flow_network_edges
+from rendering import (
+    ALLOCATION_VIEWS, allocation_figure, flow_figure, gantt_figure, graph_figure_3d, highlighted_edges,
+    render_to_file,
+)
+
+def _pos(graph):
+    rng = np.random.default_rng(0)
+    return {node: rng.random(3) for node in graph.nodes()}
+
+def test_highlighted_edges():
+    graph = nx.path_graph(5)
+    assert highlighted_edges(graph, path=[1, 2, 3]) == {frozenset((1, 2)), frozenset((2, 3))}
+    assert highlighted_edges(graph, mst_edges=[(1, 0)]) == {frozenset((0, 1))}
+    digraph = nx.DiGraph([(0, 1), (1, 2)])
+    assert highlighted_edges(digraph, bellman_ford_paths={2: [0, 1, 2]}) == {(0, 1), (1, 2)}
+
+def _segment_counts(fig):
+    # 3D segments are projected, and only readable, once the figure is drawn
+    FigureCanvasAgg(fig).draw()
+    return sorted(len(c.get_segments()) for c in fig.axes[0].collections if hasattr(c, "get_segments"))
+
+def test_3d_figure_draws_one_collection_per_color():
+    graph = nx.cycle_graph(6)
+    fig = graph_figure_3d(graph, "test", path=[0, 1, 2], pos=_pos(graph))
+    # plain edges, highlighted edges and the path itself
+    assert _segment_counts(fig) == [2, 2, 4]
+
+def test_3d_figure_samples_plain_edges_above_the_threshold():
+    graph = nx.complete_graph(30)
+    mst = list(nx.minimum_spanning_tree(graph).edges())
+    fig = graph_figure_3d(graph, "test", mst_edges=mst, pos=_pos(graph), lod_threshold=50)
+    assert _segment_counts(fig) == [29, 50]
+    assert "79/435" in fig.axes[0].get_title()
+
+def test_gantt_keeps_every_critical_task_when_decimating():
+    n = 20000
+    start = np.arange(n, dtype=float)
+    critical = np.zeros(n, dtype=bool)
+    critical[1::37] = True
+    _, chart = gantt_figure(start, np.ones(n), critical, max_bars=1000)
+    assert chart.step > 1
+    assert len(chart.bars.get_paths()) <= 1000
+    assert len(chart.highlight.get_paths()) == critical.sum()
+
+def test_gantt_view_follows_the_zoom():
+    n = 1000
+    _, chart = gantt_figure(np.arange(n), np.ones(n), np.ones(n, dtype=bool), max_bars=100)
+    chart.ax.set_ylim(109.5, 99.5)
+    assert chart.rows_in_view().tolist() == list(range(100, 110))
+    assert chart.step == 1
+    assert len(chart.highlight.get_paths()) == 10
+
+@pytest.mark.parametrize("view", ALLOCATION_VIEWS)
+def test_allocation_views(view):
+    allocation = np.zeros((300, 250), dtype=int)
+    allocation[np.arange(250), np.arange(250)] = 5
+    fig = allocation_figure(allocation, view=view)
+    assert len(fig.axes) == 2  # the plot and its colorbar
+    if view in ("auto", "raster"):
+        assert fig.axes[0].images[0].get_array().shape == (150, 125)
+    with pytest.raises(ValueError):
+        allocation_figure(allocation, view="pie")
+
+def test_flow_figure_draws_into_a_given_figure():
+    edges = flow_network_edges(8, seed=0)
+    pos = {v: (np.cos(v), np.sin(v)) for v in range(8)}
+    fig = Figure()
+    assert flow_figure(edges, pos, np.ones(len(edges.src), dtype=int), figure=fig) is fig
+
+@pytest.mark.parametrize("suffix", ["png", "svg"])
+def test_render_to_file(tmp_path, suffix):
+    path = tmp_path / f"gantt.{suffix}"
+    render_to_file(lambda fig: gantt_figure([0, 1, 2], [1, 2, 1], [True, False, True], figure=fig), str(path),
+                   figsize=(4, 3))
+    assert path.stat().st_size > 0
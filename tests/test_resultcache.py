@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+import pytest
+
+from instrument import RunTrace
+from resultcache import ResultCache, result_key
+
+def test_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = result_key("kruskal", {"n": 10}, seed=1)
+    assert cache.get(key) is None
+    value = {"weight": 12, "edges": np.arange(5)}
+    assert cache.put(key, value)
+    restored = cache.get(key)
+    assert restored["weight"] == 12 and np.array_equal(restored["edges"], value["edges"])
+    assert cache.cache_info()["hits"] == 1 and cache.cache_info()["misses"] == 1
+
+def test_keys(tmp_path):
+    assert result_key("kruskal", {"n": 10}) is None
+    key = result_key("kruskal", {"n": 10}, seed=1)
+    assert key == result_key("kruskal", {"n": 10}, seed=1)
+    assert key != result_key("kruskal", {"n": 10}, seed=2)
+    assert key != result_key("kruskal", {"n": 11}, seed=1)
+    path = tmp_path / "edges.txt"
+    path.write_text("0 1 1\n", encoding="utf-8")
+    by_file = result_key("kruskal", {}, inputs=str(path))
+    path.write_text("0 1 2\n", encoding="utf-8")
+    os.utime(path, ns=(0, 10**18))
+    assert result_key("kruskal", {}, inputs=str(path)) != by_file
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    # room for three entries of about 1 kB
+    cache = ResultCache(str(tmp_path), max_bytes=3500)
+    keys = [result_key("test", {}, seed=k) for k in range(3)]
+    for k, key in enumerate(keys):
+        cache.put(key, bytes(1000))
+        # distinct mtimes, oldest first; key 0 is then used again
+        os.utime(cache._path(key), ns=(k * 10**9, k * 10**9))
+    cache.get(keys[0])
+    cache.put(result_key("test", {}, seed=9), bytes(1000))
+    assert cache.evictions == 1
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert not cache.put(result_key("test", {}, seed=10), bytes(4000))
+
+def test_lookup_or_run_restores_counters(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = result_key("test", {}, seed=0)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        trace.count("pivots", 4)
+        return "résultat"
+
+    trace = RunTrace("first")
+    assert cache.lookup_or_run(trace, key, compute) == "résultat"
+    assert trace.info["cache"] == "enregistré"
+    trace = RunTrace("second")
+    assert cache.lookup_or_run(trace, key, compute) == "résultat"
+    assert trace.info["cache"] == "succès" and trace.counters == {"pivots": 4}
+    assert len(calls) == 1
+    cache.lookup_or_run(RunTrace("unseeded"), None, compute)
+    assert len(calls) == 2
+
+def test_clear(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = result_key("test", {}, seed=0)
+    cache.put(key, 1)
+    cache.clear()
+    assert cache.get(key) is None
+
+def test_from_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("APPRO_CACHE_DIR", str(tmp_path))
+    assert ResultCache.from_env().directory == str(tmp_path)
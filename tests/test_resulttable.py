@@ -0,0 +1,31 @@
+import csv
+
+import numpy as np
+import pytest
+
+pytest.importorskip("tkinter")
+
+from resulttable import LazyColumn, matching_rows, write_csv  # noqa: E402
+
+def test_lazy_column_computes_cells_on_demand():
+    calls = []
+    column = LazyColumn(1000000, lambda row: calls.append(row) or row * 2)
+    assert len(column) == 1000000
+    assert column[21] == 42
+    assert calls == [21]
+
+def test_matching_rows_over_arrays_and_lazy_columns():
+    columns = [np.arange(12), np.array(["Paris", "lyon", "Lille"] * 4), LazyColumn(12, lambda row: f"T{row}")]
+    assert matching_rows(columns, "LI").tolist() == [2, 5, 8, 11]
+    assert matching_rows(columns, "11").tolist() == [11]
+    assert matching_rows(columns, "t3").tolist() == [3]
+
+def test_write_csv_all_rows_or_a_selection(tmp_path):
+    path = tmp_path / "out.csv"
+    columns = [np.arange(5), np.array([1.0, 2.5, 3.0, 4.0, 5.0])]
+    write_csv(str(path), ["a", "b"], columns, chunk=2)
+    with open(path, newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [["a", "b"], ["0", "1"], ["1", "2.5"], ["2", "3"], ["3", "4"], ["4", "5"]]
+    write_csv(str(path), ["a", "b"], columns, rows=[4, 1])
+    with open(path, newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f))[1:] == [["4", "5"], ["1", "2.5"]]
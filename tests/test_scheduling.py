@@ -0,0 +1,46 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+import algorithms
+from scheduling import cpm
+
+# A(3) -> C(2), B(4) -> C, B -> D(1), C -> E(3), D -> E
+DURATION = [3, 4, 2, 1, 3]
+SRC = [0, 1, 1, 2, 3]
+DST = [2, 2, 3, 4, 4]
+
+def test_known_network():
+    schedule = cpm(DURATION, SRC, DST)
+    assert schedule.duration == 9
+    assert schedule.earliest_start.tolist() == [0, 0, 4, 4, 6]
+    assert schedule.earliest_finish.tolist() == [3, 4, 6, 5, 9]
+    assert schedule.latest_start.tolist() == [1, 0, 4, 5, 6]
+    assert schedule.latest_finish.tolist() == [4, 4, 6, 6, 9]
+    assert schedule.total_float.tolist() == [1, 0, 0, 1, 0]
+    assert schedule.free_float.tolist() == [1, 0, 0, 1, 0]
+    assert schedule.critical.tolist() == [False, True, True, False, True]
+    assert schedule.critical_path == [1, 2, 4]
+    assert schedule.levels == 3
+
+def test_random_network_against_longest_path():
+    network = algorithms.generer_taches(300, seed=4)
+    schedule = algorithms.appliquer_methode_potentiel(network)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(network.num_tasks))
+    graph.add_weighted_edges_from(zip(network.src.tolist(), network.dst.tolist(),
+                                      network.duration[network.src].tolist()))
+    expected = nx.dag_longest_path_length(graph) if graph.number_of_edges() else 0
+    ends = [schedule.earliest_finish[v] for v in range(network.num_tasks)]
+    assert schedule.duration == max(ends) >= expected
+    position = np.empty(network.num_tasks, dtype=int)
+    position[schedule.order] = np.arange(network.num_tasks)
+    assert (position[network.src] < position[network.dst]).all()
+    assert (schedule.earliest_start[network.dst] >= schedule.earliest_finish[network.src]).all()
+    assert (schedule.total_float >= 0).all() and (schedule.free_float >= 0).all()
+    path = schedule.critical_path
+    assert schedule.earliest_start[path[0]] == 0 and schedule.earliest_finish[path[-1]] == schedule.duration
+
+def test_cycle_is_rejected():
+    with pytest.raises(ValueError):
+        cpm([1, 1, 1], [0, 1, 2], [1, 2, 0])
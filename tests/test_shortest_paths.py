@@ -0,0 +1,99 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+import algorithms
+from graph_arrays import CompactGraph
+from shortest_paths import SOLVERS, ShortestPathService, shortest_path_tree
+
+def _cycle_weight(graph, cycle):
+    return sum(graph[u][v]["weight"] for u, v in zip(cycle, cycle[1:]))
+
+@pytest.mark.parametrize("method", SOLVERS)
+def test_distances_and_paths_match_networkx(method):
+    for seed in range(5):
+        graph = algorithms.generate_random_weighted_digraph(40, 0.1, min_weight=0, max_weight=10, seed=seed)
+        tree = shortest_path_tree(graph, 0, method)
+        assert tree.negative_cycle is None
+        expected = nx.single_source_bellman_ford_path_length(graph, 0)
+        assert tree.distances() == expected
+        for target, path in tree.paths().items():
+            assert path[0] == 0 and path[-1] == target
+            assert nx.path_weight(graph, path, "weight") == expected[target]
+
+@pytest.mark.parametrize("method", SOLVERS)
+def test_negative_weights_without_cycle(method):
+    # a DAG with negative arcs has no negative cycle
+    graph = nx.DiGraph()
+    rng = np.random.default_rng(1)
+    for u in range(30):
+        for v in range(u + 1, 30):
+            if rng.random() < 0.2:
+                graph.add_edge(u, v, weight=int(rng.integers(-10, 10)))
+    graph.add_nodes_from(range(30))
+    tree = shortest_path_tree(graph, 0, method)
+    assert tree.distances() == nx.single_source_bellman_ford_path_length(graph, 0)
+
+@pytest.mark.parametrize("method", SOLVERS)
+def test_negative_cycle_is_returned(method):
+    found = 0
+    for seed in range(20):
+        graph = algorithms.generate_random_weighted_digraph(25, 0.15, seed=seed)
+        tree = shortest_path_tree(graph, 0, method)
+        if nx.negative_edge_cycle(graph.subgraph(nx.descendants(graph, 0) | {0}).copy()):
+            cycle = tree.cycle_labels()
+            assert cycle is not None and cycle[0] == cycle[-1]
+            assert _cycle_weight(graph, cycle) < 0
+            found += 1
+        else:
+            assert tree.negative_cycle is None
+    assert found
+
+def test_bellman_ford_wrapper_returns_the_cycle():
+    graph = nx.DiGraph()
+    graph.add_weighted_edges_from([(0, 1, 1), (1, 2, -3), (2, 1, 1), (2, 3, 1)])
+    paths, cycle = algorithms.bellman_ford(graph, 0)
+    assert paths is None
+    assert cycle[0] == cycle[-1] and set(cycle) == {1, 2}
+    graph[1][2]["weight"] = 3
+    paths, distances = algorithms.bellman_ford(graph, 0, "spfa")
+    assert paths[3] == [0, 1, 2, 3] and distances[3] == 5
+
+def test_service_queries_match_networkx():
+    graph = algorithms.generate_weighted_graph(80, 0.08, seed=3)
+    service = ShortestPathService(graph)
+    for source, target in [(0, 5), (0, 17), (3, 40), (79, 2)]:
+        distance, path = service.query(source, target)
+        if not nx.has_path(graph, source, target):
+            assert (distance, path) == (None, None)
+            continue
+        assert distance == nx.dijkstra_path_length(graph, source, target)
+        assert nx.path_weight(graph, path, "weight") == distance
+        assert service.bidirectional(source, target)[0] == distance
+        assert algorithms.dijkstra(graph, source, target)[-1] == target
+
+def test_service_caches_trees_per_source():
+    graph = algorithms.generate_weighted_graph(50, 0.2, seed=0)
+    service = ShortestPathService(graph, max_trees=2)
+    results = service.query_batch([(0, 1), (1, 2), (0, 3), (2, 4), (0, 4)])
+    # grouped by source: one tree each for 0, 1 and 2, and 0 was evicted
+    info = service.cache_info()
+    assert info["misses"] == 3 and info["trees"] == 2 and info["evictions"] == 1
+    service.query(2, 0)
+    assert service.cache_info()["hits"] == info["hits"] + 1
+    assert results[2] == service.query(0, 3)
+    assert service.cache_info()["misses"] == 4
+
+def test_service_rejects_negative_weights_and_unknown_vertices():
+    graph = nx.Graph()
+    graph.add_edge(0, 1, weight=-1)
+    with pytest.raises(ValueError):
+        ShortestPathService(graph)
+    with pytest.raises(ValueError):
+        ShortestPathService(nx.path_graph(3)).query(0, 9)
+
+def test_compact_graph_gives_the_same_results():
+    graph = algorithms.generate_random_weighted_digraph(40, 0.1, min_weight=0, seed=8)
+    compact = CompactGraph.from_networkx(graph)
+    assert shortest_path_tree(compact, 0).distances() == shortest_path_tree(graph, 0).distances()
+    assert ShortestPathService(compact).query(0, 7) == ShortestPathService(graph).query(0, 7)
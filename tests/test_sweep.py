@@ -0,0 +1,70 @@
+import json
+import math
+
+import numpy as np
+import pytest
+
+from sweep import P2Quantile, RunningStats, parse_values, run_sweep, sweep_points
+
+def test_running_stats_match_numpy():
+    values = np.random.default_rng(0).normal(10, 3, size=5000)
+    stats = RunningStats()
+    for x in values:
+        stats.add(x)
+    summary = stats.summary()
+    assert summary["count"] == 5000
+    assert summary["mean"] == pytest.approx(values.mean())
+    assert summary["std"] == pytest.approx(values.std(ddof=1))
+    assert summary["min"] == values.min() and summary["max"] == values.max()
+    for name, p in (("q10", 0.1), ("q50", 0.5), ("q90", 0.9)):
+        assert summary[name] == pytest.approx(np.quantile(values, p), abs=0.15)
+
+def test_p2_with_few_values_is_exact():
+    estimator = P2Quantile(0.5)
+    assert math.isnan(estimator.value())
+    for x in (3, 1, 2):
+        estimator.add(x)
+    assert estimator.value() == 2
+
+def test_empty_summary_is_valid_json():
+    summary = RunningStats().summary()
+    assert summary["count"] == 0
+    assert all(value is None for name, value in summary.items() if name != "count")
+    json.loads(json.dumps(summary, allow_nan=False))
+
+def test_parse_values():
+    assert parse_values("1,2,3", int) == [1, 2, 3]
+    assert parse_values("50:200:50", int) == [50, 100, 150, 200]
+    assert parse_values("0.1:0.3:0.1, 0.5") == [0.1, 0.2, 0.3, 0.5]
+
+def test_sweep_points():
+    points = sweep_points("ford_fulkerson", [10, 20], [0.1], [5, 50])
+    assert points == [(10, 0.1, {"max_capacity": 5}), (10, 0.1, {"max_capacity": 50}),
+                      (20, 0.1, {"max_capacity": 5}), (20, 0.1, {"max_capacity": 50})]
+
+def test_run_sweep():
+    seen = []
+    results = run_sweep("kruskal", sweep_points("kruskal", [15, 30], [0.3]), 4, workers=2,
+                        progress=lambda done, total: seen.append((done, total)))
+    assert seen[-1] == (8, 8)
+    assert [point["size"] for point in results] == [15, 30]
+    for point in results:
+        assert point["values"]["count"] == 4 and point["errors"] == 0
+        assert point["metric"] == "weight"
+    # the samples are seeded: the statistics do not depend on the worker count
+    again = run_sweep("kruskal", sweep_points("kruskal", [15, 30], [0.3]), 4, workers=1)
+    assert [point["values"] for point in again] == [point["values"] for point in results]
+
+def test_cancelled_sweep_raises():
+    class Stop(Exception):
+        pass
+
+    def progress(done, total):
+        raise Stop
+
+    with pytest.raises(Stop):
+        run_sweep("kruskal", sweep_points("kruskal", [20], [0.2]), 10, workers=2, progress=progress)
+
+def test_unknown_algorithm():
+    with pytest.raises(ValueError):
+        run_sweep("prim", [(10, 0.1, {})], 1)
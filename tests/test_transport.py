@@ -0,0 +1,74 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+import algorithms
+from transport import INITIAL_METHODS, basis_to_allocation, modi
+
+def _min_cost(couts, capacites, demandes):
+    graph = nx.DiGraph()
+    for i, s in enumerate(capacites):
+        graph.add_node(("u", i), demand=-int(s))
+    for j, d in enumerate(demandes):
+        graph.add_node(("m", j), demand=int(d))
+    for i in range(len(capacites)):
+        for j in range(len(demandes)):
+            graph.add_edge(("u", i), ("m", j), weight=int(couts[i, j]))
+    return nx.min_cost_flow_cost(graph)
+
+def _problems():
+    for seed in range(8):
+        yield algorithms.generate_data(5 + seed, 4 + 2 * seed, seed=seed)
+    # few distinct costs and small quantities: many ties and degenerate bases
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        m, n = rng.integers(2, 8, size=2)
+        capacites = rng.integers(1, 4, size=m)
+        demandes = np.bincount(rng.integers(0, n, size=capacites.sum()), minlength=n)
+        yield rng.integers(1, 4, size=(m, n)), capacites, demandes
+
+def _check_feasible(allocation, capacites, demandes):
+    assert (allocation >= 0).all()
+    assert np.array_equal(allocation.sum(axis=1), capacites)
+    assert np.array_equal(allocation.sum(axis=0), demandes)
+
+@pytest.mark.parametrize("method", INITIAL_METHODS)
+def test_initial_bases_are_feasible_spanning_trees(method):
+    for couts, capacites, demandes in _problems():
+        m, n = couts.shape
+        basis = INITIAL_METHODS[method](couts, capacites.copy(), demandes.copy())
+        assert len(basis.rows) == m + n - 1
+        _check_feasible(basis_to_allocation(basis), capacites, demandes)
+
+@pytest.mark.parametrize("method", INITIAL_METHODS)
+def test_modi_reaches_the_min_cost_flow_optimum(method):
+    for couts, capacites, demandes in _problems():
+        result = modi(couts, INITIAL_METHODS[method](couts, capacites, demandes))
+        _check_feasible(result.allocation, capacites, demandes)
+        assert result.cost == pytest.approx(_min_cost(couts, capacites, demandes))
+        assert result.cost == pytest.approx(algorithms.calculer_cout_total(couts, result.allocation))
+
+def test_stepping_stone_from_north_west_corner():
+    couts, capacites, demandes = algorithms.generate_data(6, 7, seed=11)
+    start = algorithms.nord_ouest(capacites.copy(), demandes.copy())
+    _check_feasible(start, capacites, demandes)
+    before = start.copy()
+    optimal = algorithms.stepping_stone(couts, start)
+    assert np.array_equal(start, before)
+    assert algorithms.calculer_cout_total(couts, optimal) == _min_cost(couts, capacites, demandes)
+
+def test_moindre_cout_is_no_worse_than_north_west():
+    couts, capacites, demandes = algorithms.generate_data(10, 10, seed=2)
+    north_west = algorithms.nord_ouest(capacites.copy(), demandes.copy())
+    least = algorithms.moindre_cout(couts, capacites.copy(), demandes.copy())
+    _check_feasible(least, capacites, demandes)
+    assert algorithms.calculer_cout_total(couts, least) <= algorithms.calculer_cout_total(couts, north_west)
+
+def test_max_pivots_and_progress():
+    couts, capacites, demandes = algorithms.generate_data(8, 8, seed=4)
+    start = algorithms.nord_ouest(capacites.copy(), demandes.copy())
+    seen = []
+    result = modi(couts, start, progress=lambda pivots, reduced: seen.append(reduced))
+    assert len(seen) == result.pivots
+    assert all(reduced < 0 for reduced in seen)
+    assert modi(couts, start, max_pivots=1).pivots <= 1
@@ -0,0 +1,359 @@
+# Transportation problem: MODI (u-v potentials) optimization.
+#
+# A basic solution is a spanning tree over the m row nodes and n column nodes
+# (row i is node i, column j is node m + j); each basic cell (i, j) is a tree
+# edge and there are always m + n - 1 of them, zero-valued ones included when
+# the solution is degenerate. Each iteration
+#   1. computes the potentials u, v with u_i + v_j = c_ij on the tree,
+#   2. computes every reduced cost c_ij - u_i - v_j in one NumPy step,
+#   3. lets the most negative cell enter (Bland's rule after a degenerate
+#      pivot, see modi), walks the tree path between its row and column to
+#      get the cycle, and pushes theta around it.
+# An iteration costs O(m + n) Python work plus one O(m * n) vectorized step,
+# instead of one exhaustive cycle search per empty cell.
+from collections import deque, namedtuple
+
+import numpy as np
+
+# rows, cols, values: the m + n - 1 basic cells and their quantities
+TransportBasis = namedtuple("TransportBasis", ["shape", "rows", "cols", "values"])
+
+# allocation: dense m x n result; pivots: number of basis changes
+ModiResult = namedtuple("ModiResult", ["allocation", "basis", "cost", "pivots"])
+
+class _DisjointSets:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        self.parent[ra] = rb
+        return True
+
+def basis_from_allocation(allocation):
+    """Spanning-tree basis of a basic feasible allocation.
+
+    Positive cells are taken as they are; when there are fewer than m + n - 1
+    of them (degenerate solution) zero cells are added to connect the tree.
+    """
+    allocation = np.asarray(allocation)
+    m, n = allocation.shape
+    rows, cols = np.nonzero(allocation > 0)
+    sets = _DisjointSets(m + n)
+    for i, j in zip(rows.tolist(), cols.tolist()):
+        if not sets.union(i, m + j):
+            raise ValueError("L'allocation contient un cycle : ce n'est pas une solution de base")
+    rows, cols = rows.tolist(), cols.tolist()
+    # join the remaining components through zero cells: every component is
+    # linked to the component of row 0 / column 0
+    anchor_row, anchor_col = 0, 0
+    for i in range(m):
+        if sets.union(i, m + anchor_col):
+            rows.append(i)
+            cols.append(anchor_col)
+    for j in range(n):
+        if sets.union(anchor_row, m + j):
+            rows.append(anchor_row)
+            cols.append(j)
+    values = allocation[rows, cols]
+    return TransportBasis((m, n), np.array(rows), np.array(cols), values)
+
+# Initial basic solutions. All three return a TransportBasis that modi can
+# start from directly. Every allocation exhausts a row or a column (exactly one
+# of them on ties, so the result always has m + n - 1 cells, degenerate zeros
+# included); each builder only keeps per-row / per-column state besides its
+# sorted cell order.
+def _allocate(i, j, supply, demand, rows_left, cols_left, cells):
+    q = min(supply[i], demand[j])
+    supply[i] -= q
+    demand[j] -= q
+    cells.append((i, j, q))
+    # on a tie only the row is closed, unless it is the last row; the column
+    # then gets a zero cell later, which keeps the basis a spanning tree
+    if supply[i] == 0 and (rows_left[0] > 1 or cols_left[0] == 1):
+        rows_left[0] -= 1
+        return "row"
+    cols_left[0] -= 1
+    return "col"
+
+def basis_to_allocation(basis):
+    allocation = np.zeros(basis.shape, dtype=np.asarray(basis.values).dtype)
+    np.add.at(allocation, (basis.rows, basis.cols), basis.values)
+    return allocation
+
+def _as_basis(shape, cells):
+    rows, cols, values = zip(*cells) if cells else ((), (), ())
+    return TransportBasis(shape, np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64),
+                          np.array(values))
+
+def least_cost_basis(couts, capacites, demandes):
+    """Least-cost method from one stable argsort of the cost matrix."""
+    couts = np.asarray(couts)
+    m, n = couts.shape
+    supply, demand = list(capacites), list(demandes)
+    row_open, col_open = [True] * m, [True] * n
+    rows_left, cols_left = [m], [n]
+    cells = []
+    for cell in np.argsort(couts, axis=None, kind="stable").tolist():
+        i, j = divmod(cell, n)
+        if not (row_open[i] and col_open[j]):
+            continue
+        if _allocate(i, j, supply, demand, rows_left, cols_left, cells) == "row":
+            row_open[i] = False
+        else:
+            col_open[j] = False
+        if rows_left[0] == 0 or cols_left[0] == 0:
+            break
+    return _as_basis((m, n), cells)
+
+class _SortedLines:
+    # each row (or column) of the cost matrix in increasing cost order, with
+    # pointers to its cheapest and to its most expensive still-open cell;
+    # pointers only move inwards
+    def __init__(self, couts, other_open):
+        self.order = np.argsort(couts, axis=1, kind="stable")
+        self.costs = np.take_along_axis(couts, self.order, axis=1)
+        self.start = [0] * len(couts)
+        self.end = [self.order.shape[1] - 1] * len(couts)
+        self.other_open = other_open
+
+    def two_cheapest(self, line):
+        order, other_open = self.order[line], self.other_open
+        k = self.start[line]
+        while k < len(order) and not other_open[order[k]]:
+            k += 1
+        self.start[line] = k
+        first = k
+        k += 1
+        while k < len(order) and not other_open[order[k]]:
+            k += 1
+        return first, k
+
+    def largest(self, line):
+        # most expensive open cell, through a backward-only pointer
+        order, other_open = self.order[line], self.other_open
+        k = self.end[line]
+        while k >= 0 and not other_open[order[k]]:
+            k -= 1
+        self.end[line] = k
+        return self.costs[line][k] if k >= 0 else 0.0
+
+    def penalty(self, line):
+        first, second = self.two_cheapest(line)
+        costs = self.costs[line]
+        if first >= len(costs):
+            return -1, -1
+        if second >= len(costs):
+            return costs[first], self.order[line][first]
+        return costs[second] - costs[first], self.order[line][first]
+
+def vogel_basis(couts, capacites, demandes):
+    """Vogel's approximation method (VAM).
+
+    The penalty of a line (difference between its two cheapest open cells)
+    is read from the line's sorted order through a forward-only pointer, so
+    a step costs O(m + n) plus pointer moves, O(m * n) moves in total.
+    """
+    couts = np.asarray(couts)
+    m, n = couts.shape
+    supply, demand = list(capacites), list(demandes)
+    row_open, col_open = [True] * m, [True] * n
+    row_lines = _SortedLines(couts, col_open)
+    col_lines = _SortedLines(couts.T, row_open)
+    row_pen = [row_lines.penalty(i) for i in range(m)]
+    col_pen = [col_lines.penalty(j) for j in range(n)]
+    rows_left, cols_left = [m], [n]
+    cells = []
+    while rows_left[0] and cols_left[0]:
+        i = max((i for i in range(m) if row_open[i]), key=lambda i: row_pen[i][0])
+        j = max((j for j in range(n) if col_open[j]), key=lambda j: col_pen[j][0])
+        if row_pen[i][0] >= col_pen[j][0]:
+            j = row_pen[i][1]
+        else:
+            i = col_pen[j][1]
+        closed = _allocate(i, j, supply, demand, rows_left, cols_left, cells)
+        if closed == "row":
+            row_open[i] = False
+            # the closed row may have been the cheapest of any column
+            col_pen = [col_lines.penalty(c) if col_open[c] else col_pen[c] for c in range(n)]
+        else:
+            col_open[j] = False
+            row_pen = [row_lines.penalty(r) if row_open[r] else row_pen[r] for r in range(m)]
+    return _as_basis((m, n), cells)
+
+def russell_basis(couts, capacites, demandes):
+    """Russell's approximation method.
+
+    Picks the open cell minimizing c_ij - u_i - v_j, with u_i / v_j the
+    largest open cost of the row / column, read from the sorted lines through
+    backward-only pointers. Every row keeps its best cell (smallest
+    c_ij - v_j); an allocation only rescans the rows whose best cell was
+    closed or whose best column lost its largest cost, so the working memory
+    is O(m + n) besides the sorted order.
+    """
+    couts = np.asarray(couts, dtype=float)
+    m, n = couts.shape
+    supply, demand = list(capacites), list(demandes)
+    row_open, col_open = [True] * m, [True] * n
+    row_lines = _SortedLines(couts, col_open)
+    col_lines = _SortedLines(couts.T, row_open)
+    u = np.array([row_lines.largest(i) for i in range(m)], dtype=float)
+    v = np.array([col_lines.largest(j) for j in range(n)], dtype=float)
+    rows_alive, cols_alive = np.ones(m, dtype=bool), np.ones(n, dtype=bool)
+    best = np.empty(m)
+    best_col = np.empty(m, dtype=np.int64)
+
+    def rescan(i):
+        reduced = np.where(cols_alive, couts[i] - v, np.inf)
+        best_col[i] = j = int(np.argmin(reduced))
+        best[i] = reduced[j]
+
+    for i in range(m):
+        rescan(i)
+    rows_left, cols_left = [m], [n]
+    cells = []
+    while rows_left[0] and cols_left[0]:
+        i = int(np.argmin(np.where(rows_alive, best - u, np.inf)))
+        j = int(best_col[i])
+        if _allocate(i, j, supply, demand, rows_left, cols_left, cells) == "row":
+            row_open[i] = rows_alive[i] = False
+            # columns whose largest cost was in row i: their reduced costs
+            # only grow, so only the rows whose best cell is there move
+            changed = np.nonzero(cols_alive & (couts[i] == v))[0]
+            for c in changed.tolist():
+                v[c] = col_lines.largest(c)
+            for r in np.nonzero(rows_alive & np.isin(best_col, changed))[0].tolist():
+                rescan(r)
+        else:
+            col_open[j] = cols_alive[j] = False
+            for r in np.nonzero(rows_alive & (couts[:, j] == u))[0].tolist():
+                u[r] = row_lines.largest(r)
+            for r in np.nonzero(rows_alive & (best_col == j))[0].tolist():
+                rescan(r)
+    return _as_basis((m, n), cells)
+
+INITIAL_METHODS = {
+    "least_cost": least_cost_basis,
+    "vogel": vogel_basis,
+    "russell": russell_basis,
+}
+
+def _tree_potentials(m, n, basic_cost, adjacency):
+    # BFS from row 0; parent/depth are kept to walk tree paths afterwards
+    size = m + n
+    potential = [0.0] * size
+    parent = [-1] * size
+    parent_cell = [-1] * size
+    depth = [-1] * size
+    depth[0] = 0
+    queue = deque([0])
+    while queue:
+        node = queue.popleft()
+        for other, cell in adjacency[node].items():
+            if depth[other] < 0:
+                depth[other] = depth[node] + 1
+                parent[other] = node
+                parent_cell[other] = cell
+                # u_i + v_j = c_ij
+                potential[other] = basic_cost[cell] - potential[node]
+                queue.append(other)
+    return potential, parent, parent_cell, depth
+
+def _tree_path(a, b, parent, parent_cell, depth):
+    # cells on the tree path from node a to node b, in order
+    head, tail = [], []
+    while depth[a] > depth[b]:
+        head.append(parent_cell[a])
+        a = parent[a]
+    while depth[b] > depth[a]:
+        tail.append(parent_cell[b])
+        b = parent[b]
+    while a != b:
+        head.append(parent_cell[a])
+        a = parent[a]
+        tail.append(parent_cell[b])
+        b = parent[b]
+    tail.reverse()
+    return head + tail
+
+def modi(couts, start, max_pivots=None, progress=None):
+    """Optimize a transportation solution with the MODI method.
+
+    start is a TransportBasis or a dense basic allocation (for example the
+    result of nord_ouest or moindre_cout). progress, when given, is called as
+    progress(pivots, most_negative_reduced_cost) before every pivot; raising
+    from it stops the optimization.
+
+    The entering cell is the one of most negative reduced cost, except after
+    a degenerate pivot (theta = 0): until the next pivot that moves some
+    quantity, Bland's rule picks the first improving cell in row-major
+    order instead. Ties for the leaving cell always go to the first cell in
+    row-major order, so degenerate bases cannot make the method cycle.
+    """
+    couts = np.asarray(couts, dtype=float)
+    if not isinstance(start, TransportBasis):
+        start = basis_from_allocation(start)
+    m, n = start.shape
+    rows = start.rows.tolist()
+    cols = start.cols.tolist()
+    values = np.asarray(start.values).tolist()
+    basic_cost = couts[start.rows, start.cols].tolist()
+    adjacency = [dict() for _ in range(m + n)]
+    for cell, (i, j) in enumerate(zip(rows, cols)):
+        adjacency[i][m + j] = cell
+        adjacency[m + j][i] = cell
+    tolerance = 1e-9 * max(1.0, float(np.abs(couts).max(initial=0)))
+
+    pivots = 0
+    degenerate = False
+    while max_pivots is None or pivots < max_pivots:
+        potential, parent, parent_cell, depth = _tree_potentials(m, n, basic_cost, adjacency)
+        u = np.array(potential[:m])
+        v = np.array(potential[m:])
+        reduced = couts - u[:, None] - v[None, :]
+        best = int(np.argmin(reduced))
+        if reduced.flat[best] >= -tolerance:
+            break
+        if progress is not None:
+            progress(pivots, float(reduced.flat[best]))
+        if degenerate:
+            # Bland's rule
+            best = int(np.flatnonzero(reduced < -tolerance)[0])
+        i, j = divmod(best, n)
+
+        # the path from row i to column j alternates -, +, -, ... and ends on
+        # a - cell; with the entering (+) cell it closes the cycle
+        path = _tree_path(i, m + j, parent, parent_cell, depth)
+        minus = path[0::2]
+        plus = path[1::2]
+        leaving = min(minus, key=lambda cell: (values[cell], rows[cell] * n + cols[cell]))
+        theta = values[leaving]
+        degenerate = theta == 0
+        for cell in minus:
+            values[cell] -= theta
+        for cell in plus:
+            values[cell] += theta
+
+        # the entering cell takes the slot of the leaving one
+        li, lj = rows[leaving], cols[leaving]
+        del adjacency[li][m + lj]
+        del adjacency[m + lj][li]
+        rows[leaving], cols[leaving], values[leaving] = i, j, theta
+        basic_cost[leaving] = float(couts[i, j])
+        adjacency[i][m + j] = leaving
+        adjacency[m + j][i] = leaving
+        pivots += 1
+
+    basis = TransportBasis((m, n), np.array(rows), np.array(cols), np.array(values, dtype=np.asarray(start.values).dtype))
+    allocation = basis_to_allocation(basis)
+    cost = float(np.dot(couts[basis.rows, basis.cols], basis.values))
+    return ModiResult(allocation, basis, cost, pivots)